@@ -7,6 +7,13 @@ from app.models.user import User
 from app.models.auction import Auction
 from app.models.bid import Bid
 from app.models.event_log import EventLog
+from app.models.price_stats import AuctionPriceStats
+from app.models.leaderboard import LeaderboardCounter
+from app.models.candles import AuctionCandles
+from app.models.sketch import BidSketch, PendingBidSketch
+from app.models.user_activity import UserActivity
+from app.models.outbid import PendingOutbid
+from app.models.ledger import LedgerEntry, OrganizerDailyRevenue
 
 config = context.config
 
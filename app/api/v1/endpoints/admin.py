@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 from typing import List
+from datetime import datetime
 from app.db.base import get_db
 from app.models.user import User, UserRole
 from app.models.auction import Auction, AuctionStatus
@@ -153,6 +154,7 @@ def get_event_logs(
     event_type: str = None,
     user_id: int = None,
     auction_id: int = None,
+    since: datetime | None = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -166,6 +168,8 @@ def get_event_logs(
         query = query.filter(EventLog.user_id == user_id)
     if auction_id:
         query = query.filter(EventLog.auction_id == auction_id)
+    if since:
+        query = query.filter(EventLog.created_at >= since)
 
     logs = query.order_by(desc(EventLog.created_at)).offset(skip).limit(limit).all()
 
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_
 from typing import List, Dict
-from datetime import datetime, timedelta
-from app.db.base import get_db
+from datetime import datetime, timedelta, date
+from app.db.base import get_read_db
 from app.models.user import User
 from app.models.auction import Auction, AuctionStatus
 from app.models.bid import Bid
+from app.models.price_stats import AuctionPriceStats
+from app.models.user_activity import UserActivity
 from app.core.deps import get_current_user
-import numpy as np
-from sklearn.linear_model import LinearRegression
+from app.services import price_model, leaderboards, bid_series, sketches, user_activity
+from app.services.stats_snapshot import global_stats
 
 router = APIRouter()
 
@@ -17,35 +19,32 @@ router = APIRouter()
 @router.get("/most-active-users")
 def get_most_active_users(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    window: str = Query("all", regex="^(hour|day|week|all)$"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    results = db.query(
-        User.id,
-        User.email,
-        User.full_name,
-        func.count(Bid.id).label("bid_count")
-    ).join(Bid, Bid.user_id == User.id)\
-     .group_by(User.id)\
-     .order_by(desc("bid_count"))\
-     .limit(limit)\
-     .all()
+    ranking = leaderboards.top_entities(db, leaderboards.USERS_BOARD, window, limit)
+    users = {
+        user.id: user
+        for user in db.query(User).filter(User.id.in_([user_id for user_id, _ in ranking])).all()
+    }
 
     return [
         {
-            "user_id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "bid_count": user.bid_count
+            "user_id": user_id,
+            "email": users[user_id].email,
+            "full_name": users[user_id].full_name,
+            "bid_count": bid_count
         }
-        for user in results
+        for user_id, bid_count in ranking
+        if user_id in users
     ]
 
 
 @router.get("/auction/{auction_id}/time-between-bids")
 def get_average_time_between_bids(
     auction_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
@@ -79,7 +78,7 @@ def get_average_time_between_bids(
 @router.get("/auction/{auction_id}/price-increase")
 def get_average_price_increase(
     auction_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
@@ -114,7 +113,8 @@ def get_average_price_increase(
 @router.get("/auction/{auction_id}/bid-timeline")
 def get_bid_timeline(
     auction_id: int,
-    db: Session = Depends(get_db),
+    max_points: int | None = Query(None, ge=3),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
@@ -124,8 +124,13 @@ def get_bid_timeline(
             detail="Auction not found"
         )
 
-    bids = db.query(Bid).filter(Bid.auction_id == auction_id)\
-           .order_by(Bid.created_at).all()
+    bids = db.query(Bid.created_at, Bid.amount, Bid.user_id)\
+             .filter(Bid.auction_id == auction_id)\
+             .order_by(Bid.created_at, Bid.id).all()
+
+    if max_points is not None and len(bids) > max_points:
+        seconds, amounts = bid_series.series_arrays(auction, bids)
+        bids = [bids[i] for i in bid_series.lttb_indices(seconds, amounts, max_points).tolist()]
 
     timeline = [
         {
@@ -142,40 +147,63 @@ def get_bid_timeline(
     }
 
 
+@router.get("/auction/{auction_id}/candles")
+def get_bid_candles(
+    auction_id: int,
+    bucket_seconds: int | None = Query(None, ge=1),
+    max_buckets: int = Query(bid_series.DEFAULT_MAX_BUCKETS, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    auction = db.query(Auction).filter(Auction.id == auction_id).first()
+    if not auction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Auction not found"
+        )
+
+    if bucket_seconds is None:
+        bucket_seconds = bid_series.choose_bucket_seconds(
+            bid_series.auction_span_seconds(auction), max_buckets
+        )
+
+    return {
+        "auction_id": auction_id,
+        "bucket_seconds": bucket_seconds,
+        "candles": bid_series.get_candles(db, auction, bucket_seconds)
+    }
+
+
 @router.get("/top-auctions")
 def get_top_auctions_by_activity(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    window: str = Query("all", regex="^(hour|day|week|all)$"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    results = db.query(
-        Auction.id,
-        Auction.title,
-        Auction.current_price,
-        Auction.status,
-        func.count(Bid.id).label("bid_count")
-    ).outerjoin(Bid, Bid.auction_id == Auction.id)\
-     .group_by(Auction.id)\
-     .order_by(desc("bid_count"))\
-     .limit(limit)\
-     .all()
+    ranking = leaderboards.top_entities(db, leaderboards.AUCTIONS_BOARD, window, limit)
+    auctions = {
+        auction.id: auction
+        for auction in db.query(Auction).filter(Auction.id.in_([auction_id for auction_id, _ in ranking])).all()
+    }
 
     return [
         {
-            "auction_id": auction.id,
-            "title": auction.title,
-            "current_price": float(auction.current_price),
-            "status": auction.status,
-            "bid_count": auction.bid_count
+            "auction_id": auction_id,
+            "title": auctions[auction_id].title,
+            "current_price": float(auctions[auction_id].current_price),
+            "status": auctions[auction_id].status,
+            "bid_count": bid_count
         }
-        for auction in results
+        for auction_id, bid_count in ranking
+        if auction_id in auctions
     ]
 
 
 @router.get("/auction/{auction_id}/predict-price")
 def predict_final_price(
     auction_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
@@ -192,69 +220,57 @@ def predict_final_price(
             "message": "Auction is already closed"
         }
 
-    bids = db.query(Bid).filter(Bid.auction_id == auction_id)\
-           .order_by(Bid.created_at).all()
+    stats = price_model.load_stats(db, auction)
 
-    if len(bids) < 3:
+    if stats.n < price_model.MIN_BIDS_FOR_PREDICTION:
         return {
             "predicted_price": float(auction.current_price),
             "confidence": "low",
             "message": "Not enough data for prediction"
         }
 
-    start_time = auction.start_time.timestamp()
-    X = np.array([(bid.created_at.timestamp() - start_time) / 3600 for bid in bids]).reshape(-1, 1)
-    y = np.array([float(bid.amount) for bid in bids])
-
-    model = LinearRegression()
-    model.fit(X, y)
-
-    time_to_end = (auction.end_time.timestamp() - start_time) / 3600
-    predicted_price = model.predict([[time_to_end]])[0]
-
-    predicted_price = max(predicted_price, float(auction.current_price))
+    predicted_price = price_model.predict_price(auction, stats)
 
     return {
         "predicted_price": round(predicted_price, 2),
         "current_price": float(auction.current_price),
-        "confidence": "medium" if len(bids) >= 5 else "low",
-        "bid_count": len(bids),
+        "confidence": price_model.confidence_for(stats.n),
+        "bid_count": stats.n,
         "time_remaining_hours": round((auction.end_time - datetime.utcnow()).total_seconds() / 3600, 2)
     }
 
 
-@router.get("/global-stats")
-def get_global_statistics(
-    db: Session = Depends(get_db),
+@router.get("/predict-prices")
+def predict_final_prices(
+    auction_ids: List[int] = Query(None),
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    total_auctions = db.query(func.count(Auction.id)).scalar()
-    active_auctions = db.query(func.count(Auction.id))\
-                        .filter(Auction.status == AuctionStatus.active).scalar()
-    closed_auctions = db.query(func.count(Auction.id))\
-                        .filter(Auction.status == AuctionStatus.closed).scalar()
+    query = db.query(Auction, AuctionPriceStats)\
+              .outerjoin(AuctionPriceStats, AuctionPriceStats.auction_id == Auction.id)\
+              .filter(Auction.status == AuctionStatus.active)
 
-    total_bids = db.query(func.count(Bid.id)).scalar()
-    total_users = db.query(func.count(User.id)).scalar()
+    if auction_ids:
+        query = query.filter(Auction.id.in_(auction_ids))
 
-    avg_bids_per_auction = db.query(func.avg(func.count(Bid.id)))\
-                             .join(Auction, Bid.auction_id == Auction.id)\
-                             .group_by(Auction.id).scalar() or 0
+    rows = query.order_by(Auction.id).limit(limit).all()
 
-    return {
-        "total_auctions": total_auctions,
-        "active_auctions": active_auctions,
-        "closed_auctions": closed_auctions,
-        "total_bids": total_bids,
-        "total_users": total_users,
-        "average_bids_per_auction": round(float(avg_bids_per_auction), 2)
-    }
+    return price_model.predict_many(db, rows)
+
+
+@router.get("/global-stats")
+def get_global_statistics(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    return global_stats.get(db)
 
 
 @router.get("/user/{user_id}/activity")
 def get_user_activity(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -264,24 +280,72 @@ def get_user_activity(
             detail="User not found"
         )
 
-    total_bids = db.query(func.count(Bid.id))\
-                   .filter(Bid.user_id == user_id).scalar()
-
-    won_auctions = db.query(func.count(Auction.id))\
-                     .filter(Auction.winner_id == user_id).scalar()
-
-    auctions_participated = db.query(func.count(func.distinct(Bid.auction_id)))\
-                              .filter(Bid.user_id == user_id).scalar()
+    activity = user_activity.fill_missing(db, {user_id: db.get(UserActivity, user_id)}, [user_id])
 
-    total_spent = db.query(func.sum(Auction.current_price))\
-                    .filter(Auction.winner_id == user_id,
-                           Auction.status == AuctionStatus.closed).scalar() or 0
+    _, gaps, _ = sketches.merged(db, sketches.USER_SCOPE, [str(user_id)])
 
     return {
         "user_id": user_id,
         "email": user.email,
-        "total_bids": total_bids,
-        "won_auctions": won_auctions,
-        "auctions_participated": auctions_participated,
-        "total_spent": float(total_spent)
+        **user_activity.to_dict(activity[user_id]),
+        "bid_gap_seconds": sketches.gap_percentiles(gaps)
+    }
+
+
+@router.get("/users/activity")
+def get_users_activity(
+    user_ids: List[int] = Query(..., max_length=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    rows = db.query(User.id, User.email, UserActivity)\
+             .outerjoin(UserActivity, UserActivity.user_id == User.id)\
+             .filter(User.id.in_(user_ids))\
+             .all()
+
+    emails = {row.id: row.email for row in rows}
+    activity = user_activity.fill_missing(db, {row.id: row.UserActivity for row in rows}, list(emails))
+
+    return [
+        {
+            "user_id": user_id,
+            "email": emails[user_id],
+            **user_activity.to_dict(activity[user_id])
+        }
+        for user_id in sorted(emails)
+    ]
+
+
+@router.get("/bid-sketch")
+def get_bid_sketch(
+    auction_id: int | None = None,
+    category: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    if auction_id is not None:
+        scope, keys = sketches.AUCTION_SCOPE, [str(auction_id)]
+    elif category is not None:
+        scope, keys = sketches.CATEGORY_SCOPE, [category]
+    elif start_date is not None:
+        end_date = end_date or datetime.utcnow().date()
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_date must not be before start_date"
+            )
+        if (end_date - start_date).days > 366:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Date range cannot exceed 366 days"
+            )
+        scope, keys = sketches.DAY_SCOPE, sketches.day_keys(start_date, end_date)
+    else:
+        scope, keys = sketches.GLOBAL_SCOPE, [sketches.GLOBAL_KEY]
+
+    return {
+        "scope": scope,
+        **sketches.summary(db, scope, keys)
     }
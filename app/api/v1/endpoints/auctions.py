@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, asc
 from typing import List
 from datetime import datetime
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.schemas.auction import AuctionCreate, AuctionResponse, AuctionUpdate, AuctionListResponse
 from app.models.auction import Auction, AuctionStatus
 from app.models.user import User, UserRole
 from app.models.event_log import EventLog
 from app.core.deps import get_current_user, require_role
+from app.services.stats_snapshot import global_stats
+from app.services import bid_series, user_activity, closing_fanout, event_bus
 
 router = APIRouter()
 
@@ -56,6 +58,7 @@ def create_auction(
     )
     db.add(event_log)
     db.commit()
+    global_stats.mark_dirty()
 
     return auction
 
@@ -73,7 +76,7 @@ def list_auctions(
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     query = db.query(Auction)
 
@@ -113,7 +116,7 @@ def list_auctions(
 
 
 @router.get("/{auction_id}", response_model=AuctionResponse)
-def get_auction(auction_id: int, db: Session = Depends(get_db)):
+def get_auction(auction_id: int, db: Session = Depends(get_read_db)):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
     if not auction:
         raise HTTPException(
@@ -214,6 +217,7 @@ def delete_auction(
 
     db.delete(auction)
     db.commit()
+    global_stats.mark_dirty()
 
     return None
 
@@ -221,6 +225,7 @@ def delete_auction(
 @router.post("/{auction_id}/close", response_model=AuctionResponse)
 def close_auction(
     auction_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role([UserRole.organizer, UserRole.admin]))
 ):
@@ -267,6 +272,9 @@ def close_auction(
         auction.winner_id = None
 
     auction.updated_at = datetime.utcnow()
+    user_activity.record_win(db, auction)
+    bid_series.store_candles(db, auction)
+    closing_fanout.queue_notifications(db, [auction])
     db.commit()
     db.refresh(auction)
 
@@ -281,6 +289,10 @@ def close_auction(
     )
     db.add(event_log)
     db.commit()
+    global_stats.mark_dirty()
+    background_tasks.add_task(event_bus.emit, [event_bus.auction_message(auction.id, closing_fanout.closed_event(auction))])
+    if auction.winner_id is not None:
+        background_tasks.add_task(closing_fanout.push_won, auction.id, auction.winner_id, closing_fanout.won_event(auction))
 
     return auction
 
@@ -327,6 +339,7 @@ def get_auction_winner(
 def get_auction_event_logs(
     auction_id: int,
     event_type: str = None,
+    since: datetime | None = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -343,6 +356,8 @@ def get_auction_event_logs(
 
     if event_type:
         query = query.filter(EventLog.event_type == event_type)
+    if since:
+        query = query.filter(EventLog.created_at >= since)
 
     logs = query.order_by(desc(EventLog.created_at)).offset(skip).limit(limit).all()
 
@@ -5,6 +5,7 @@ from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.models.user import User
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.core.deps import get_current_user
+from app.services.stats_snapshot import global_stats
 
 router = APIRouter()
 
@@ -27,6 +28,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    global_stats.mark_dirty()
     return user
 
 
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List
 from datetime import datetime, timedelta
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.schemas.bid import BidCreate, BidResponse
 from app.models.bid import Bid
 from app.models.auction import Auction, AuctionStatus
@@ -11,6 +11,8 @@ from app.models.user import User
 from app.models.event_log import EventLog
 from app.core.deps import get_current_user
 from app.services.websocket_manager import manager
+from app.services import price_model, leaderboards, sketches, user_activity, outbid_coalescer
+from app.services.stats_snapshot import global_stats
 import asyncio
 
 router = APIRouter()
@@ -82,12 +84,22 @@ async def place_bid(
             detail=f"Bid must be at least {minimum_bid}"
         )
 
+    outbid_user_id = outbid_coalescer.outbid_user(db, auction, current_user.id)
+    outbid_user_online = outbid_user_id is not None and manager.is_online(outbid_user_id)
+    if outbid_user_id is not None and not outbid_user_online:
+        outbid_coalescer.record_outbid(db, outbid_user_id, auction.id, bid_data.amount, now)
+
     bid = Bid(
         auction_id=auction.id,
         user_id=current_user.id,
-        amount=bid_data.amount
+        amount=bid_data.amount,
+        created_at=now
     )
     db.add(bid)
+    user_activity.record_bid(db, bid)
+    price_model.record_bid(db, auction, bid_data.amount, now)
+    leaderboards.record_bid(db, auction.id, current_user.id, now)
+    sketches.record_bid(db, auction, current_user.id, now)
 
     previous_price = auction.current_price
     auction.current_price = bid_data.amount
@@ -121,6 +133,7 @@ async def place_bid(
 
     db.commit()
     db.refresh(bid)
+    global_stats.mark_dirty()
 
     await broadcast_new_bid(auction.id, {
         "bid_id": bid.id,
@@ -132,6 +145,10 @@ async def place_bid(
         "created_at": bid.created_at.isoformat()
     })
 
+    if outbid_user_online and not await manager.send_to_user(outbid_user_id, outbid_coalescer.outbid_event(auction)):
+        outbid_coalescer.record_outbid(db, outbid_user_id, auction.id, bid_data.amount, now)
+        db.commit()
+
     return bid
 
 
@@ -140,7 +157,7 @@ def get_auction_bids(
     auction_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     auction = db.query(Auction).filter(Auction.id == auction_id).first()
     if not auction:
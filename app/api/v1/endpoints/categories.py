@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.db.base import get_db
+from app.db.base import get_read_db
 from app.models.auction import Auction
 
 router = APIRouter()
 
 
 @router.get("/")
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(db: Session = Depends(get_read_db)):
     categories = db.query(
         Auction.category,
         func.count(Auction.id).label("count")
@@ -0,0 +1,46 @@
+import secrets
+from fastapi import APIRouter, Header, HTTPException, status
+from app.core.config import settings
+from app.db.base import engine, pool_metrics, replica_engine, replica_pool_metrics
+
+router = APIRouter()
+
+
+def _check_token(authorization: str | None):
+    """
+    Metrics must stay readable while the pool is starved, so access is
+    checked against METRICS_TOKEN instead of looking the user up. Without a
+    configured token the endpoints stay closed.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Metrics token not configured"
+        )
+
+    if not authorization or not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(authorization: str | None = Header(None)):
+    """
+    Async so it is served on the event loop even when every threadpool
+    worker is blocked waiting for a connection.
+    """
+    _check_token(authorization)
+    return pool_metrics.snapshot(engine.pool)
+
+
+@router.get("/db-pool/replica")
+async def get_replica_pool_metrics(authorization: str | None = Header(None)):
+    _check_token(authorization)
+    if replica_engine is engine:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No read replica configured"
+        )
+    return replica_pool_metrics.snapshot(replica_engine.pool)
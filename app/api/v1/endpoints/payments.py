@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import date
 from app.db.base import get_db
-from app.schemas.payment import PaymentCreate, PaymentResponse
+from app.schemas.payment import (
+    PaymentCreate, PaymentResponse, RevenueSummary, DailyRevenueResponse, LedgerEntryResponse
+)
 from app.models.payment import Payment, PaymentStatus
 from app.models.auction import Auction, AuctionStatus
-from app.models.user import User
-from app.core.deps import get_current_user
+from app.models.ledger import LedgerEntry, LedgerEvent
+from app.models.user import User, UserRole
+from app.core.deps import get_current_user, require_role
 from app.services.payment_service import payment_service
+from app.services import ledger
 from decimal import Decimal
 
 router = APIRouter()
@@ -60,6 +66,16 @@ def create_payment_hold(
     )
 
     db.add(payment)
+    try:
+        db.flush()
+    except IntegrityError:
+        # uq_payments_auction_active: a concurrent hold for this auction won the race
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Active payment already exists for this auction"
+        )
+    ledger.record(db, LedgerEvent.hold, [payment])
     db.commit()
     db.refresh(payment)
 
@@ -72,6 +88,11 @@ def confirm_payment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    payment = payment_service.confirm_payment(db, payment_id, user_id=current_user.id)
+    if payment:
+        db.commit()
+        return payment
+
     payment = db.query(Payment).filter(Payment.id == payment_id).first()
     if not payment:
         raise HTTPException(
@@ -85,17 +106,10 @@ def confirm_payment(
             detail="Not authorized to confirm this payment"
         )
 
-    success = payment_service.confirm_payment(payment)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot confirm payment in current status"
-        )
-
-    db.commit()
-    db.refresh(payment)
-
-    return payment
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cannot confirm payment in current status"
+    )
 
 
 @router.post("/{payment_id}/refund", response_model=PaymentResponse)
@@ -104,6 +118,12 @@ def refund_payment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    is_admin = current_user.role.value in ["admin", "superadmin"]
+    payment = payment_service.refund_payment(db, payment_id, organizer_id=None if is_admin else current_user.id)
+    if payment:
+        db.commit()
+        return payment
+
     payment = db.query(Payment).filter(Payment.id == payment_id).first()
     if not payment:
         raise HTTPException(
@@ -112,23 +132,16 @@ def refund_payment(
         )
 
     auction = db.query(Auction).filter(Auction.id == payment.auction_id).first()
-    if auction.organizer_id != current_user.id and current_user.role.value not in ["admin", "superadmin"]:
+    if auction.organizer_id != current_user.id and not is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to refund this payment"
         )
 
-    success = payment_service.refund_payment(payment)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot refund payment in current status"
-        )
-
-    db.commit()
-    db.refresh(payment)
-
-    return payment
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cannot refund payment in current status"
+    )
 
 
 @router.get("/my-payments", response_model=List[PaymentResponse])
@@ -170,3 +183,58 @@ def get_auction_payment(
         )
 
     return payment
+
+
+def _organizer_scope(organizer_id: int | None, current_user: User) -> int:
+    if organizer_id is None or organizer_id == current_user.id:
+        return current_user.id
+
+    if current_user.role not in [UserRole.admin, UserRole.superadmin]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this organizer's revenue"
+        )
+    return organizer_id
+
+
+@router.get("/revenue", response_model=RevenueSummary)
+def get_revenue(
+    start: date | None = None,
+    end: date | None = None,
+    organizer_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role([UserRole.organizer, UserRole.admin, UserRole.superadmin]))
+):
+    """
+    Revenue and commission totals for an inclusive day range, the current month by default.
+    """
+    period_start, period_end = ledger.period(start, end)
+    return ledger.summary(db, _organizer_scope(organizer_id, current_user), period_start, period_end)
+
+
+@router.get("/revenue/daily", response_model=List[DailyRevenueResponse])
+def get_daily_revenue(
+    start: date | None = None,
+    end: date | None = None,
+    organizer_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role([UserRole.organizer, UserRole.admin, UserRole.superadmin]))
+):
+    period_start, period_end = ledger.period(start, end)
+    return ledger.daily(db, _organizer_scope(organizer_id, current_user), period_start, period_end)
+
+
+@router.get("/ledger", response_model=List[LedgerEntryResponse])
+def get_ledger(
+    skip: int = 0,
+    limit: int = 100,
+    organizer_id: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role([UserRole.organizer, UserRole.admin, UserRole.superadmin]))
+):
+    return db.query(LedgerEntry)\
+             .filter(LedgerEntry.organizer_id == _organizer_scope(organizer_id, current_user))\
+             .order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())\
+             .offset(skip)\
+             .limit(limit)\
+             .all()
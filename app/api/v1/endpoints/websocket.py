@@ -1,13 +1,22 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from sqlalchemy.orm import Session
-from app.db.base import get_db
+from app.db.base import SessionLocal, get_db
 from app.models.auction import Auction
+from app.models.user import User
 from app.services.websocket_manager import manager
 from app.core.security import decode_access_token
 
 router = APIRouter()
 
 
+def user_id_from_token(db: Session, token: str):
+    payload = decode_access_token(token) if token else None
+    if not payload or not payload.get("sub"):
+        return None
+    user = db.query(User.id).filter(User.email == payload.get("sub")).first()
+    return user.id if user else None
+
+
 @router.websocket("/auctions/{auction_id}")
 async def websocket_auction(
     websocket: WebSocket,
@@ -20,11 +29,7 @@ async def websocket_auction(
         await websocket.close(code=4004, reason="Auction not found")
         return
 
-    user_id = None
-    if token:
-        payload = decode_access_token(token)
-        if payload:
-            user_id = payload.get("user_id")
+    user_id = user_id_from_token(db, token)
 
     await manager.connect(websocket, auction_id, user_id)
 
@@ -41,3 +46,34 @@ async def websocket_auction(
     except WebSocketDisconnect:
         manager.disconnect(websocket, auction_id, user_id)
         await manager.broadcast_online_count(auction_id)
+
+
+@router.websocket("/notifications")
+async def websocket_notifications(
+    websocket: WebSocket,
+    token: str = Query(None)
+):
+    # The socket stays open for the whole session, so the lookup gets its
+    # own session instead of holding a pooled connection until disconnect.
+    db = SessionLocal()
+    try:
+        user_id = user_id_from_token(db, token)
+    finally:
+        db.close()
+    if not user_id:
+        await websocket.close(code=4001, reason="Not authenticated")
+        return
+
+    await manager.connect(websocket, user_id=user_id)
+
+    try:
+        await websocket.send_json({
+            "type": "connected",
+            "message": "Successfully connected to personal notifications"
+        })
+
+        while True:
+            _ = await websocket.receive_text()
+
+    except WebSocketDisconnect:
+        manager.disconnect(websocket, user_id=user_id)
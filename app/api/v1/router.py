@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, auctions, bids, payments, admin, analytics, categories, websocket
+from app.api.v1.endpoints import auth, auctions, bids, payments, admin, analytics, categories, websocket, metrics
 
 api_router = APIRouter()
 
@@ -11,3 +11,4 @@ api_router.include_router(payments.router, prefix="/payments", tags=["Payments"]
 api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
 api_router.include_router(categories.router, prefix="/categories", tags=["Categories"])
 api_router.include_router(websocket.router, prefix="/ws", tags=["WebSocket"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -4,7 +4,14 @@ from app.core.config import settings
 celery_app = Celery(
     "auction_tasks",
     broker=settings.CELERY_BROKER_URL,
-    backend=settings.CELERY_RESULT_BACKEND
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.services.auction_tasks",
+        "app.services.analytics_tasks",
+        "app.services.notification_tasks",
+        "app.services.partition_tasks",
+        "app.services.payment_tasks",
+    ]
 )
 
 celery_app.conf.update(
@@ -14,5 +21,3 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
 )
-
-celery_app.autodiscover_tasks(["app.services"])
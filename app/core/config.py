@@ -3,6 +3,15 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = True
+    DATABASE_REPLICA_URL: str = ""
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 10
+    METRICS_TOKEN: str = ""
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -15,6 +24,53 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = ""
     SMTP_PASSWORD: str = ""
     FROM_EMAIL: str = "noreply@auctions.com"
+    SMTP_TIMEOUT: int = 10
+    SMTP_POOL_SIZE: int = 10
+    SMTP_POOL_MAX_IDLE_SECONDS: int = 30
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+
+    EMAIL_DISPATCH_CONCURRENCY: int = 10
+    EMAIL_DOMAIN_RATE_PER_SECOND: float = 0
+    EMAIL_DOMAIN_RATE_LIMITS: dict[str, float] = {}
+
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 200
+    NOTIFICATION_OUTBOX_POLL_SECONDS: float = 10
+    OUTBID_DIGEST_WINDOW_SECONDS: int = 60
+    NOTIFICATION_FANOUT_CHUNK_SIZE: int = 1000
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_RETRY_BASE_SECONDS: int = 30
+    NOTIFICATION_RETRY_MAX_SECONDS: int = 3600
+    OUTBID_NOTIFICATION_CHANNEL: str = "email"
+
+    TELEGRAM_BOT_TOKEN: str = ""
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_CONCURRENCY: int = 10
+    TELEGRAM_TIMEOUT: float = 10
+    TELEGRAM_GLOBAL_RATE_PER_SECOND: float = 30
+    TELEGRAM_CHAT_RATE_PER_SECOND: float = 1
+
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    IDEMPOTENCY_TTL_SECONDS: float = 86400
+    IDEMPOTENCY_WAIT_SECONDS: float = 30
+
+    SETTLEMENT_CHUNK_SIZE: int = 5000
+    RECONCILIATION_CHUNK_SIZE: int = 100000
+
+    PARTITION_PREMAKE_MONTHS: int = 3
+    BIDS_RETENTION_MONTHS: int = 24
+    EVENT_LOGS_RETENTION_MONTHS: int = 6
+    PARTITION_ARCHIVE_DIR: str = "archive/partitions"
+
+    GLOBAL_STATS_MAX_AGE_SECONDS: int = 60
+    GLOBAL_STATS_MIN_REFRESH_SECONDS: int = 2
+
+    EVENTS_REDIS_URL: str = ""
+    EVENTS_CHANNEL: str = "auction-events"
+    EVENTS_REDIS_TIMEOUT: float = 5
+    EVENTS_RECONNECT_SECONDS: float = 5
+
+    BID_SKETCH_MERGE_SECONDS: float = 10
+    BID_SKETCH_MERGE_BATCH_SIZE: int = 5000
 
     class Config:
         env_file = ".env"
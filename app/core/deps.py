@@ -1,17 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.db.base import get_db
+from app.db.base import SessionLocal
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    """
+    Looks the user up in a session closed before the endpoint runs, so
+    replica-served reads do not hold a primary connection for the request.
+    """
     token = credentials.credentials
     payload = decode_access_token(token)
 
@@ -28,7 +28,12 @@ def get_current_user(
             detail="Could not validate credentials"
         )
 
-    user = db.query(User).filter(User.email == email).first()
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+    finally:
+        db.close()
+
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, Response
+from app.core.config import settings
+from app.core.security import bearer_subject
+
+IDEMPOTENT_ROUTES = [
+    re.compile(r"^/api/v1/payments/hold$"),
+    re.compile(r"^/api/v1/auctions/\d+/bids$"),
+]
+
+
+class CachedResponse:
+    def __init__(self, status_code: int, headers: dict, body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+
+class IdempotencyEntry:
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.response = None
+        self.done = asyncio.get_running_loop().create_future()
+
+
+class IdempotencyCache:
+    """
+    In-process LRU of responses keyed by (user, path, Idempotency-Key), with a TTL.
+    An entry exists from the moment the first request starts, so duplicates
+    that arrive while it is in flight can wait for its result.
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+
+    def lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.response is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def begin(self, key, fingerprint: str) -> IdempotencyEntry:
+        entry = IdempotencyEntry(fingerprint, time.monotonic() + self.ttl_seconds)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def complete(self, key, entry: IdempotencyEntry, response: CachedResponse):
+        entry.response = response
+        entry.expires_at = time.monotonic() + self.ttl_seconds
+        entry.done.set_result(True)
+
+    def abandon(self, key, entry: IdempotencyEntry):
+        """
+        Drop an entry whose request failed, so the next duplicate runs it again.
+        """
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set_result(False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+idempotency_cache = IdempotencyCache(
+    max_entries=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS
+)
+
+
+def _replay(response: CachedResponse) -> Response:
+    return Response(
+        content=response.body,
+        status_code=response.status_code,
+        headers={**response.headers, "Idempotent-Replayed": "true"}
+    )
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """
+    Replays the stored response for a repeated Idempotency-Key on the routes
+    in IDEMPOTENT_ROUTES without reaching the endpoint or the database.
+    Only 2xx responses are stored; after an error the key is released, so a
+    corrected retry with the same key is processed.
+    """
+
+    async def dispatch(self, request, call_next):
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if not idempotency_key or request.method != "POST" \
+                or not any(route.match(request.url.path) for route in IDEMPOTENT_ROUTES):
+            return await call_next(request)
+
+        subject = bearer_subject(request.headers.get("Authorization"))
+        if subject is None:
+            return await call_next(request)
+
+        key = (subject, request.url.path, idempotency_key)
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+        while True:
+            entry = idempotency_cache.lookup(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                return JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used with a different request"}
+                )
+            if entry.response is not None:
+                return _replay(entry.response)
+            try:
+                await asyncio.wait_for(asyncio.shield(entry.done), settings.IDEMPOTENCY_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                return JSONResponse(
+                    status_code=409,
+                    content={"detail": "A request with this Idempotency-Key is still in progress"}
+                )
+
+        entry = idempotency_cache.begin(key, fingerprint)
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        except BaseException:
+            idempotency_cache.abandon(key, entry)
+            raise
+
+        headers = {name: value for name, value in response.headers.items() if name.lower() != "content-length"}
+        if 200 <= response.status_code < 300:
+            idempotency_cache.complete(key, entry, CachedResponse(response.status_code, headers, body))
+        else:
+            idempotency_cache.abandon(key, entry)
+
+        return Response(content=body, status_code=response.status_code, headers=headers)
@@ -32,3 +32,13 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def bearer_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    The sub claim of a valid "Bearer <token>" header, without a database lookup.
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    payload = decode_access_token(authorization[len("Bearer "):])
+    return payload.get("sub") if payload else None
@@ -1,17 +1,74 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, instrument
+from app.db.replica import reads_from_primary
 
-engine = create_engine(settings.DATABASE_URL)
+
+def engine_options(database_url: str) -> dict:
+    """
+    Pool settings for create_engine. In-memory SQLite keeps its
+    single-connection pool, since a queue of connections would each see
+    a different empty database.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+pool_metrics = instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+    replica_pool_metrics = instrument(replica_engine)
+else:
+    replica_engine, replica_pool_metrics = engine, pool_metrics
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 Base = declarative_base()
 
 
+def dialect_insert(db):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only endpoints: the replica when one is configured,
+    the primary for users inside their read-your-writes window.
+    """
+    if replica_engine is engine or reads_from_primary(request):
+        db = SessionLocal()
+    else:
+        db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
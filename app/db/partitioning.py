@@ -0,0 +1,222 @@
+import csv
+import gzip
+import os
+import re
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import PrimaryKeyConstraint
+from app.core.config import settings
+
+DEFAULT_SUFFIX = "default"
+
+PARTITION_NAME = re.compile(r"^(?P<table>\w+)_(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def monthly_partitioning(column: str) -> dict:
+    """
+    Table kwargs for monthly range partitioning on PostgreSQL; other
+    dialects create a plain table.
+    """
+    return {"postgresql_partition_by": f"RANGE ({column})", "info": {"partition_key": column}}
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _primary_key_with_partition_key(constraint, compiler, **kw):
+    """
+    PostgreSQL requires the partition key in every unique constraint of a
+    partitioned table, so it is appended to the primary key there. The ORM
+    keeps identifying rows by id alone.
+    """
+    ddl = compiler.visit_primary_key_constraint(constraint, **kw)
+    key = constraint.table.info.get("partition_key") if constraint.table is not None else None
+    if not key or key in constraint.columns.keys() or not ddl:
+        return ddl
+    head, tail = ddl.split(")", 1)
+    return f"{head}, {compiler.preparer.quote(key)}){tail}"
+
+
+def month_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str):
+    match = PARTITION_NAME.match(name)
+    if not match or match.group("table") != table:
+        return None
+    return datetime(int(match.group("year")), int(match.group("month")), 1)
+
+
+def partition_ddl(table: str, month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def default_partition(table: str) -> str:
+    return f"{table}_{DEFAULT_SUFFIX}"
+
+
+def split_default_ddl(table: str, key: str, month: datetime) -> list:
+    """
+    Statements that move one month of rows out of the default partition into
+    a new monthly partition. PostgreSQL refuses to create a partition whose
+    range matches rows already in the default, so the rows are moved into a
+    plain table first, which is then attached. The default stays locked
+    against inserts until the transaction ends, so no row can land in it
+    between the move and the attach.
+    """
+    name = partition_name(table, month)
+    lower, upper = f"{month:%Y-%m-%d}", f"{add_months(month, 1):%Y-%m-%d}"
+    return [
+        f"LOCK TABLE {default_partition(table)} IN SHARE MODE",
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {default_partition(table)} "
+        f"WHERE {key} >= '{lower}' AND {key} < '{upper}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')",
+    ]
+
+
+def partitioned_tables(metadata) -> list:
+    return [table for table in metadata.sorted_tables if "partition_key" in table.info]
+
+
+def _exists(connection, name: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+def default_months(connection, table) -> set:
+    """
+    Months that have rows in the table's default partition.
+    """
+    default = default_partition(table.name)
+    if not _exists(connection, default):
+        return set()
+    key = table.info["partition_key"]
+    return set(connection.execute(text(f"SELECT DISTINCT date_trunc('month', {key}) FROM {default}")).scalars())
+
+
+def ensure_partitions(connection, tables, now: datetime = None, months_ahead: int = None) -> list:
+    """
+    Create the partitions for the current month and months_ahead future
+    months of every table that does not have them yet. Months with rows
+    stranded in the default partition get a partition of their own too,
+    with those rows moved into it, so they age out like any other month.
+    No-op outside PostgreSQL. Returns the names created.
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for table in tables:
+        stranded = default_months(connection, table)
+        months = stranded | {add_months(current, offset) for offset in range(months_ahead + 1)}
+        for month in sorted(months):
+            name = partition_name(table.name, month)
+            if _exists(connection, name):
+                continue
+            if month in stranded:
+                for statement in split_default_ddl(table.name, table.info["partition_key"], month):
+                    connection.execute(text(statement))
+            else:
+                connection.execute(text(partition_ddl(table.name, month)))
+            created.append(name)
+    return created
+
+
+def create_initial_partitions(table, connection, **kw):
+    """
+    after_create listener: the default partition catches rows outside the
+    premade months, e.g. backfilled history, until ensure_partitions moves
+    them into monthly partitions.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {default_partition(table.name)} PARTITION OF {table.name} DEFAULT"
+    ))
+    ensure_partitions(connection, [table])
+
+
+def attached_partitions(connection, table: str) -> list:
+    return connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table ORDER BY child.relname"
+    ), {"table": table}).scalars().all()
+
+
+def expired_partitions(table: str, names, retention_months: int, now: datetime = None) -> list:
+    """
+    Monthly partitions entirely older than the retention window, which
+    always keeps the current month plus retention_months full months.
+    """
+    cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(table, name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def export_table(connection, name: str, path: str, chunk_size: int = 10000) -> int:
+    """
+    Stream a table into a gzip-compressed CSV with a header row, through
+    a server-side cursor. Written to a temporary file and renamed so a
+    failed export never leaves a truncated archive. Returns the row count.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    result = connection.execution_options(yield_per=chunk_size).execute(text(f"SELECT * FROM {name}"))
+
+    rows = 0
+    partial = f"{path}.partial"
+    with gzip.open(partial, "wt", newline="") as archive:
+        writer = csv.writer(archive)
+        writer.writerow(result.keys())
+        for partition in result.partitions():
+            writer.writerows(partition)
+            rows += len(partition)
+    os.replace(partial, path)
+    return rows
+
+
+def archive_partitions(engine, tables: dict, directory: str = None, now: datetime = None) -> list:
+    """
+    Export, detach and drop every expired partition of the given
+    {table: retention_months}. The export runs while the partition is still
+    attached, so a failure leaves it in place for the next run; detach and
+    drop then happen in one transaction. Returns (partition, rows, path).
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    directory = directory or settings.PARTITION_ARCHIVE_DIR
+    archived = []
+    for table, retention_months in tables.items():
+        with engine.connect() as connection:
+            names = expired_partitions(table, attached_partitions(connection, table), retention_months, now)
+
+        for name in names:
+            path = os.path.join(directory, f"{name}.csv.gz")
+            with engine.connect() as connection:
+                rows = export_table(connection, name, path)
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                connection.execute(text(f"DROP TABLE {name}"))
+            archived.append((name, rows, path))
+    return archived
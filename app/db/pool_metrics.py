@@ -0,0 +1,142 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+COUNTERS = ["connects", "checkouts", "checkins", "invalidations", "closes", "timeouts"]
+
+
+class PoolMetrics:
+    """
+    Counters and a checkout wait-time histogram for one engine's pool.
+    Pool events fire on whichever thread uses the pool, hence the lock.
+    """
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {name: 0 for name in COUNTERS}
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+            self.peak_checked_out = 0
+
+    def increment(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+            self.bucket_counts[index] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.counters["timeouts"] += 1
+
+    def observe_checked_out(self, checked_out: int):
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def snapshot(self, pool) -> dict:
+        """
+        Current pool gauges plus the counters and cumulative histogram.
+        """
+        gauges = {}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            gauges[name] = method() if callable(method) else None
+
+        with self._lock:
+            cumulative, histogram = 0, {}
+            for bound, count in zip(self.buckets, self.bucket_counts):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            histogram["+Inf"] = self.wait_count
+
+            return {
+                "pool": pool.__class__.__name__,
+                "size": gauges["size"],
+                "checked_in": gauges["checkedin"],
+                "checked_out": gauges["checkedout"],
+                "overflow": gauges["overflow"],
+                "timeout": pool.timeout() if callable(getattr(pool, "timeout", None)) else None,
+                "peak_checked_out": self.peak_checked_out,
+                **self.counters,
+                "wait_seconds": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum, 6),
+                    "max": round(self.wait_max, 6),
+                    "buckets": histogram
+                }
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout, including the time spent waiting
+    for a free connection, and counts checkouts that hit pool_timeout.
+    The pool events have no hook before a checkout starts, so this is the
+    one measurement they cannot provide.
+    """
+
+    metrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument(engine, metrics: PoolMetrics = None) -> PoolMetrics:
+    """
+    Attach pool event listeners to the engine and return its metrics.
+    """
+    metrics = metrics or PoolMetrics()
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+        checked_out = getattr(engine.pool, "checkedout", None)
+        if callable(checked_out):
+            metrics.observe_checked_out(checked_out())
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    @event.listens_for(engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        metrics.increment("closes")
+
+    return metrics
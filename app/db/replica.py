@@ -0,0 +1,96 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.core.security import bearer_subject
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RecentWriters:
+    """
+    Users who wrote within the read-your-writes window, by token subject.
+    Bounded LRU; sync endpoints run in the threadpool, hence the lock.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._deadlines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, subject: str, window_seconds: float):
+        with self._lock:
+            self._deadlines[subject] = time.monotonic() + window_seconds
+            self._deadlines.move_to_end(subject)
+            while len(self._deadlines) > self.max_entries:
+                self._deadlines.popitem(last=False)
+
+    def is_recent(self, subject: str) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(subject)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._deadlines[subject]
+                return False
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._deadlines.clear()
+
+
+recent_writers = RecentWriters()
+
+
+def _cookie_deadline(request) -> float:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return 0
+
+
+def reads_from_primary(request) -> bool:
+    """
+    Whether this request must see the primary: its user wrote within the
+    window, either through this process or, via the cookie, another one.
+    """
+    if settings.REPLICA_READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+
+    if _cookie_deadline(request) > time.time():
+        return True
+
+    subject = bearer_subject(request.headers.get("Authorization"))
+    return subject is not None and recent_writers.is_recent(subject)
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    After a successful write, route that user's reads to the primary for
+    REPLICA_READ_YOUR_WRITES_SECONDS so they never see replica lag on
+    their own changes.
+    """
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+
+        window = settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        if request.method in SAFE_METHODS or response.status_code >= 400 or window <= 0:
+            return response
+
+        subject = bearer_subject(request.headers.get("Authorization"))
+        if subject is not None:
+            recent_writers.mark(subject, window)
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            str(time.time() + window),
+            max_age=math.ceil(window),
+            httponly=True,
+            samesite="lax"
+        )
+        return response
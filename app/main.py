@@ -1,7 +1,12 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
+from app.core.idempotency import IdempotencyMiddleware
+from app.db.replica import ReadYourWritesMiddleware
 from app.db.base import Base, engine
+from app.core.config import settings
+from app.services import event_bus
 
 app = FastAPI(
     title="Auction API",
@@ -11,6 +16,9 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -27,6 +35,21 @@ def startup_event():
     Base.metadata.create_all(bind=engine)
 
 
+@app.on_event("startup")
+async def start_event_listener():
+    # Forwards events published by the Celery workers to this process's sockets.
+    app.state.event_listener = None
+    if settings.EVENTS_REDIS_URL:
+        app.state.event_listener = asyncio.create_task(event_bus.listen())
+
+
+@app.on_event("shutdown")
+async def stop_event_listener():
+    listener = getattr(app.state, "event_listener", None)
+    if listener is not None:
+        listener.cancel()
+
+
 @app.get("/")
 def root():
     return {
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.partitioning import monthly_partitioning, create_initial_partitions
 from datetime import datetime
 
 
@@ -11,7 +12,15 @@ class Bid(Base):
     auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     auction = relationship("Auction", back_populates="bids")
     user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_bids_auction_user", "auction_id", "user_id"),
+        monthly_partitioning("created_at"),
+    )
+
+
+event.listen(Bid.__table__, "after_create", create_initial_partitions)
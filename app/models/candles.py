@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from app.db.base import Base
+from datetime import datetime
+
+
+class AuctionCandles(Base):
+    __tablename__ = "auction_candles"
+
+    auction_id = Column(Integer, ForeignKey("auctions.id"), primary_key=True)
+    bucket_seconds = Column(Integer, primary_key=True)
+    candles = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, event
 from app.db.base import Base
+from app.db.partitioning import monthly_partitioning, create_initial_partitions
 from datetime import datetime
 
 
@@ -11,4 +12,11 @@ class EventLog(Base):
     user_id = Column(Integer, nullable=True)
     auction_id = Column(Integer, nullable=True)
     details = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        monthly_partitioning("created_at"),
+    )
+
+
+event.listen(EventLog.__table__, "after_create", create_initial_partitions)
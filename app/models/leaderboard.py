@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base import Base
+from datetime import datetime
+
+ALL_TIME_BUCKET = datetime(1970, 1, 1)
+
+
+class LeaderboardCounter(Base):
+    __tablename__ = "leaderboard_counters"
+
+    board = Column(String, primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    bid_count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_leaderboard_counters_board_bucket_count", "board", "bucket_start", "bid_count"),
+    )
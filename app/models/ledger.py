@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, Enum, ForeignKey, Index
+from app.db.base import Base
+from datetime import datetime
+import enum
+
+
+class LedgerEvent(str, enum.Enum):
+    hold = "hold"
+    confirm = "confirm"
+    refund = "refund"
+    release = "release"
+
+
+class LedgerEntry(Base):
+    """
+    Append-only record of money movements on payments. A refund of a payment
+    that was never confirmed is recorded as a release of the hold.
+    """
+    __tablename__ = "payment_ledger"
+
+    id = Column(Integer, primary_key=True)
+    payment_id = Column(Integer, ForeignKey("payments.id"), nullable=False)
+    auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False)
+    organizer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    event = Column(Enum(LedgerEvent), nullable=False)
+    amount = Column(Numeric(10, 2), nullable=False)
+    commission = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_payment_ledger_organizer_created", "organizer_id", "created_at"),
+        Index("ix_payment_ledger_payment_id", "payment_id"),
+    )
+
+
+class OrganizerDailyRevenue(Base):
+    __tablename__ = "organizer_daily_revenue"
+
+    organizer_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(DateTime, primary_key=True)
+    holds = Column(Integer, default=0, nullable=False)
+    held_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    payments = Column(Integer, default=0, nullable=False)
+    paid_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    paid_commission = Column(Numeric(14, 2), default=0, nullable=False)
+    refunds = Column(Integer, default=0, nullable=False)
+    refunded_amount = Column(Numeric(14, 2), default=0, nullable=False)
+    refunded_commission = Column(Numeric(14, 2), default=0, nullable=False)
+    releases = Column(Integer, default=0, nullable=False)
+    released_amount = Column(Numeric(14, 2), default=0, nullable=False)
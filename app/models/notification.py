@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean, Text, Index
 from app.db.base import Base
+from app.core.config import settings
 from datetime import datetime
+from uuid import uuid4
 import enum
 
 
@@ -30,4 +32,14 @@ class Notification(Base):
     message = Column(Text, nullable=False)
     sent = Column(Boolean, default=False)
     sent_at = Column(DateTime, nullable=True)
+    idempotency_key = Column(String, unique=True, nullable=False, default=lambda: uuid4().hex)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=lambda: settings.NOTIFICATION_MAX_ATTEMPTS, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=True)
+    last_error = Column(Text, nullable=True)
+    dead_lettered_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_notifications_next_attempt_at", "next_attempt_at"),
+    )
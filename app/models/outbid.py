@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Index
+from app.db.base import Base
+
+
+class PendingOutbid(Base):
+    __tablename__ = "pending_outbids"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    auction_id = Column(Integer, ForeignKey("auctions.id"), primary_key=True)
+    latest_amount = Column(Numeric(10, 2), nullable=False)
+    outbid_count = Column(Integer, default=1, nullable=False)
+    first_outbid_at = Column(DateTime, nullable=False)
+    last_outbid_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_pending_outbids_first_outbid_at", "first_outbid_at"),
+    )
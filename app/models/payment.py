@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Enum, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -13,6 +13,22 @@ class PaymentStatus(str, enum.Enum):
     failed = "failed"
 
 
+PAYMENT_TRANSITIONS = {
+    PaymentStatus.pending: {PaymentStatus.held, PaymentStatus.failed},
+    PaymentStatus.held: {PaymentStatus.paid, PaymentStatus.refunded, PaymentStatus.failed},
+    PaymentStatus.paid: {PaymentStatus.refunded},
+    PaymentStatus.refunded: set(),
+    PaymentStatus.failed: set(),
+}
+
+
+ACTIVE_PAYMENT_STATUSES = [PaymentStatus.held, PaymentStatus.paid]
+
+
+def allowed_sources(target: PaymentStatus) -> list[PaymentStatus]:
+    return [source for source, targets in PAYMENT_TRANSITIONS.items() if target in targets]
+
+
 class Payment(Base):
     __tablename__ = "payments"
 
@@ -25,9 +41,17 @@ class Payment(Base):
     status = Column(Enum(PaymentStatus), default=PaymentStatus.pending, nullable=False)
     payment_method = Column(String, nullable=True)
     transaction_id = Column(String, nullable=True, unique=True)
-    metadata = Column(JSON, nullable=True)
+    payment_metadata = Column("metadata", JSON, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     auction = relationship("Auction")
     user = relationship("User")
+
+    __table_args__ = (
+        Index(
+            "uq_payments_auction_active", "auction_id", unique=True,
+            postgresql_where=status.in_(ACTIVE_PAYMENT_STATUSES),
+            sqlite_where=status.in_(ACTIVE_PAYMENT_STATUSES)
+        ),
+    )
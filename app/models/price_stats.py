@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from app.db.base import Base
+from datetime import datetime
+
+
+class AuctionPriceStats(Base):
+    __tablename__ = "auction_price_stats"
+
+    auction_id = Column(Integer, ForeignKey("auctions.id"), primary_key=True)
+    n = Column(Integer, default=0, nullable=False)
+    sum_x = Column(Float, default=0.0, nullable=False)
+    sum_y = Column(Float, default=0.0, nullable=False)
+    sum_xy = Column(Float, default=0.0, nullable=False)
+    sum_xx = Column(Float, default=0.0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
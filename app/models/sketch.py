@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, JSON, Index
+from app.db.base import Base
+from datetime import datetime
+
+
+class BidSketch(Base):
+    __tablename__ = "bid_sketches"
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    distinct_hll = Column(LargeBinary, nullable=True)
+    gaps = Column(JSON, nullable=True)
+    bid_count = Column(Integer, default=0, nullable=False)
+    last_bid_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class PendingBidSketch(Base):
+    __tablename__ = "pending_bid_sketches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    auction_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    category = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_pending_bid_sketches_created_at", "created_at"),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from app.db.base import Base
+from datetime import datetime
+
+
+class UserActivity(Base):
+    __tablename__ = "user_activity"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_bids = Column(Integer, default=0, nullable=False)
+    won_auctions = Column(Integer, default=0, nullable=False)
+    auctions_participated = Column(Integer, default=0, nullable=False)
+    total_spent = Column(Numeric(12, 2), default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from decimal import Decimal
 from app.models.payment import PaymentStatus
+from app.models.ledger import LedgerEvent
 
 
 class PaymentCreate(BaseModel):
@@ -24,3 +25,46 @@ class PaymentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class RevenueTotals(BaseModel):
+    holds: int
+    held_amount: Decimal
+    payments: int
+    paid_amount: Decimal
+    paid_commission: Decimal
+    refunds: int
+    refunded_amount: Decimal
+    refunded_commission: Decimal
+    releases: int
+    released_amount: Decimal
+
+
+class RevenueSummary(RevenueTotals):
+    organizer_id: int
+    start: datetime
+    end: datetime
+    net_revenue: Decimal
+    net_commission: Decimal
+    payout: Decimal
+
+
+class DailyRevenueResponse(RevenueTotals):
+    day: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LedgerEntryResponse(BaseModel):
+    id: int
+    payment_id: int
+    auction_id: int
+    user_id: int
+    event: LedgerEvent
+    amount: Decimal
+    commission: Decimal
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,91 @@
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.services import leaderboards, sketches, user_activity
+
+
+@celery_app.task(name="rebuild_leaderboards")
+def rebuild_leaderboards():
+    db = SessionLocal()
+    try:
+        leaderboards.rebuild(db)
+        db.commit()
+        return "Rebuilt leaderboards"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="prune_leaderboards")
+def prune_leaderboards():
+    db = SessionLocal()
+    try:
+        pruned = leaderboards.prune(db)
+        db.commit()
+        return f"Pruned {pruned} leaderboard buckets"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="rebuild_bid_sketches")
+def rebuild_bid_sketches():
+    db = SessionLocal()
+    try:
+        sketches.rebuild(db)
+        db.commit()
+        return "Rebuilt bid sketches"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="merge_bid_sketches")
+def merge_bid_sketches(batch_size: int = None):
+    """
+    Fold bids staged by place_bid into the sketches, one committed batch at a time.
+    """
+    batch_size = batch_size or settings.BID_SKETCH_MERGE_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        merged = 0
+
+        while True:
+            count = sketches.merge_pending(db, batch_size)
+            db.commit()
+
+            merged += count
+            if count < batch_size:
+                break
+
+        return f"Merged {merged} bids into sketches"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="rebuild_user_activity")
+def rebuild_user_activity():
+    db = SessionLocal()
+    try:
+        user_activity.rebuild(db)
+        db.commit()
+        return "Rebuilt user activity counters"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
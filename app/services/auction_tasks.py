@@ -5,6 +5,7 @@ from app.db.base import SessionLocal
 from app.models.auction import Auction, AuctionStatus
 from app.models.bid import Bid
 from app.models.event_log import EventLog
+from app.services import bid_series, closing_fanout, event_bus, user_activity
 
 
 @celery_app.task(name="close_expired_auctions")
@@ -28,6 +29,9 @@ def close_expired_auctions():
             auction.status = AuctionStatus.closed
             if highest_bid:
                 auction.winner_id = highest_bid.user_id
+                user_activity.record_win(db, auction)
+
+            bid_series.store_candles(db, auction)
 
             event_log = EventLog(
                 event_type="auction_closed",
@@ -39,8 +43,12 @@ def close_expired_auctions():
             )
             db.add(event_log)
 
+        queued = closing_fanout.queue_notifications(db, expired_auctions)
+        events = closing_fanout.socket_events(expired_auctions)
+
         db.commit()
-        return f"Closed {len(expired_auctions)} auctions"
+        event_bus.publish(events)
+        return f"Closed {len(expired_auctions)} auctions, queued {queued} notifications"
 
     except Exception as e:
         db.rollback()
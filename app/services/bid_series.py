@@ -0,0 +1,134 @@
+from datetime import timedelta
+from app.models.bid import Bid
+from app.models.candles import AuctionCandles
+
+BUCKET_LADDER_SECONDS = [
+    1, 5, 15, 30,
+    60, 5 * 60, 15 * 60, 30 * 60,
+    3600, 4 * 3600, 12 * 3600,
+    86400, 7 * 86400,
+]
+
+DEFAULT_MAX_BUCKETS = 200
+
+
+def load_series(db, auction):
+    """
+    Return (seconds since auction start, amount) as float arrays, ordered by time.
+    """
+    rows = db.query(Bid.created_at, Bid.amount)\
+             .filter(Bid.auction_id == auction.id)\
+             .order_by(Bid.created_at, Bid.id)\
+             .all()
+    return series_arrays(auction, rows)
+
+
+def series_arrays(auction, rows):
+    import numpy as np
+
+    seconds = np.fromiter(
+        ((row.created_at - auction.start_time).total_seconds() for row in rows),
+        dtype=float, count=len(rows)
+    )
+    amounts = np.fromiter((float(row.amount) for row in rows), dtype=float, count=len(rows))
+    return seconds, amounts
+
+
+def choose_bucket_seconds(span_seconds: float, max_buckets: int = DEFAULT_MAX_BUCKETS) -> int:
+    for bucket in BUCKET_LADDER_SECONDS:
+        if span_seconds / bucket <= max_buckets:
+            return bucket
+    return BUCKET_LADDER_SECONDS[-1]
+
+
+def auction_span_seconds(auction) -> float:
+    return max((auction.end_time - auction.start_time).total_seconds(), 1.0)
+
+
+def build_candles(auction, seconds, amounts, bucket_seconds: int) -> list:
+    import numpy as np
+
+    if len(seconds) == 0:
+        return []
+
+    bucket_index = np.floor(seconds / bucket_seconds).astype(np.int64)
+    buckets, starts, counts = np.unique(bucket_index, return_index=True, return_counts=True)
+    ends = starts + counts - 1
+
+    opens = amounts[starts]
+    closes = amounts[ends]
+    highs = np.maximum.reduceat(amounts, starts)
+    lows = np.minimum.reduceat(amounts, starts)
+
+    return [
+        {
+            "start": (auction.start_time + timedelta(seconds=int(bucket) * bucket_seconds)).isoformat(),
+            "count": int(count),
+            "open": float(o),
+            "high": float(h),
+            "low": float(lo),
+            "close": float(c)
+        }
+        for bucket, count, o, h, lo, c in zip(
+            buckets.tolist(), counts.tolist(), opens, highs, lows, closes
+        )
+    ]
+
+
+def lttb_indices(x, y, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets: indices of the points that best preserve
+    the visual shape of (x, y) when reduced to `threshold` points.
+    """
+    import numpy as np
+
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    edges = (np.floor(np.arange(threshold - 1) * every) + 1).astype(np.int64)
+    edges[-1] = n - 1
+
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def get_candles(db, auction, bucket_seconds: int) -> list:
+    stored = db.get(AuctionCandles, (auction.id, bucket_seconds))
+    if stored is not None:
+        return stored.candles
+
+    seconds, amounts = load_series(db, auction)
+    return build_candles(auction, seconds, amounts, bucket_seconds)
+
+
+def store_candles(db, auction):
+    """
+    Persist the candles of a closed auction at the default bucket size,
+    so its chart is served with a single primary-key read.
+    """
+    bucket_seconds = choose_bucket_seconds(auction_span_seconds(auction))
+    seconds, amounts = load_series(db, auction)
+
+    db.merge(AuctionCandles(
+        auction_id=auction.id,
+        bucket_seconds=bucket_seconds,
+        candles=build_candles(auction, seconds, amounts, bucket_seconds)
+    ))
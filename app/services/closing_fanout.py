@@ -0,0 +1,131 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.bid import Bid
+from app.models.notification import Notification, NotificationType, NotificationChannel
+from app.models.user import User
+from app.services import event_bus
+from app.services.notification_service import notification_service
+from app.services.websocket_manager import manager
+
+
+def participants(db, auction_ids, chunk_size: int):
+    """
+    Distinct (auction_id, user) pairs for all given auctions in one query,
+    streamed in chunks of chunk_size rows.
+    """
+    query = select(Bid.auction_id, User.id, User.full_name)\
+              .join(User, User.id == Bid.user_id)\
+              .where(Bid.auction_id.in_(auction_ids))\
+              .distinct()\
+              .execution_options(yield_per=chunk_size)
+
+    yield from db.execute(query).partitions()
+
+
+def queue_notifications(db, auctions, chunk_size: int = None) -> int:
+    """
+    Queue closing notifications for a batch of closed auctions: won and
+    payment required for the winner, auction ended for everyone else who bid.
+    Returns the number of notifications queued.
+    """
+    auctions = {auction.id: auction for auction in auctions}
+    if not auctions:
+        return 0
+
+    queued = 0
+    for partition in participants(db, list(auctions), chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE):
+        by_auction = defaultdict(list)
+        for row in partition:
+            by_auction[row.auction_id].append(row)
+
+        for auction_id, users in by_auction.items():
+            auction = auctions[auction_id]
+            winners = [user for user in users if user.id == auction.winner_id]
+            losers = [user for user in users if user.id != auction.winner_id]
+
+            queued += notification_service.queue_bulk(db, NotificationType.auction_ended, auction, losers)
+            queued += notification_service.queue_bulk(db, NotificationType.won, auction, winners)
+            queued += notification_service.queue_bulk(db, NotificationType.payment_required, auction, winners)
+
+    return queued
+
+
+def closed_event(auction) -> dict:
+    return {
+        "type": "auction_closed",
+        "data": {
+            "auction_id": auction.id,
+            "winner_id": auction.winner_id,
+            "final_price": str(auction.current_price) if auction.winner_id else None
+        }
+    }
+
+
+def won_event(auction) -> dict:
+    return {
+        "type": "won",
+        "data": {
+            "auction_id": auction.id,
+            "title": auction.title,
+            "final_price": str(auction.current_price)
+        }
+    }
+
+
+def socket_events(auctions) -> list:
+    """
+    event_bus messages for closed auctions: auction_closed to each room and
+    won to each winner. The won email is queued as well, since the publisher
+    cannot tell whether the winner is online.
+    """
+    messages = []
+    for auction in auctions:
+        messages.append(event_bus.auction_message(auction.id, closed_event(auction)))
+        if auction.winner_id is not None:
+            messages.append(event_bus.user_message(auction.winner_id, won_event(auction)))
+    return messages
+
+
+async def push_won(auction_id: int, winner_id: int, event: dict) -> bool:
+    """
+    Background task run after the close commits. Best effort: the won event
+    goes to the winner's sockets in this process, and on delivery the won
+    email queued with the close is marked sent over WebSocket instead. When
+    no local socket takes it, the event is published for the other API
+    processes and the email stays queued.
+    """
+    delivered = bool(await manager.send_to_user(winner_id, event))
+    if delivered:
+        await run_in_threadpool(record_won_push, auction_id, winner_id)
+    else:
+        await run_in_threadpool(event_bus.publish, [event_bus.user_message(winner_id, event)])
+    return delivered
+
+
+def record_won_push(auction_id: int, winner_id: int) -> bool:
+    """
+    Mark the queued won notification as sent over WebSocket, unless the
+    outbox worker has already sent it. Returns whether the row was updated.
+    """
+    db = SessionLocal()
+    try:
+        updated = db.query(Notification).filter(
+            Notification.idempotency_key == f"{NotificationType.won.value}:{auction_id}:{winner_id}",
+            Notification.sent.is_(False)
+        ).update({
+            Notification.channel: NotificationChannel.websocket,
+            Notification.sent: True,
+            Notification.sent_at: datetime.utcnow(),
+            Notification.next_attempt_at: None
+        }, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from app.core.config import settings
+from app.services.rate_limiter import TokenBucketLimiter
+from app.services.smtp_pool import SMTPSessionPool
+
+logger = logging.getLogger(__name__)
+
+
+def build_mime_message(
+    from_email: str,
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: str = None,
+    message_id: str = None
+) -> str:
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = from_email
+    message["To"] = to_email
+    if message_id:
+        message["Message-ID"] = message_id
+
+    if text_content:
+        part1 = MIMEText(text_content, "plain")
+        message.attach(part1)
+
+    part2 = MIMEText(html_content, "html")
+    message.attach(part2)
+
+    return message.as_string()
+
+
+class OutgoingEmail:
+    def __init__(self, to_email: str, subject: str, html_content: str, reference=None, message_id: str = None):
+        self.to_email = to_email
+        self.subject = subject
+        self.html_content = html_content
+        self.reference = reference
+        self.message_id = message_id
+
+    @property
+    def domain(self) -> str:
+        return self.to_email.rsplit("@", 1)[-1].lower()
+
+
+class EmailDispatcher:
+    """
+    Sends a batch of emails concurrently over aiosmtplib.
+    At most `concurrency` SMTP sessions are in use at once; each worker takes
+    a session from the pool for the whole batch and returns it afterwards,
+    so sessions outlive the batch. Recipients are throttled per domain,
+    with buckets that live as long as the dispatcher's limiter.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        from_email: str,
+        username: str = "",
+        password: str = "",
+        concurrency: int = 10,
+        timeout: float = 10.0,
+        default_domain_rate: float = 0,
+        domain_rates: dict = None,
+        limiter: TokenBucketLimiter = None,
+        pool: SMTPSessionPool = None
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.from_email = from_email
+        self.username = username
+        self.password = password
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.default_domain_rate = default_domain_rate
+        self.domain_rates = domain_rates or {}
+        self.limiter = limiter or TokenBucketLimiter(default_domain_rate, domain_rates)
+        self.pool = pool or SMTPSessionPool(size=concurrency)
+        self.pool_key = (hostname, port, username)
+
+    async def _connect(self):
+        import aiosmtplib
+
+        credentials = bool(self.username and self.password)
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            timeout=self.timeout,
+            start_tls=credentials,
+            username=self.username if credentials else None,
+            password=self.password if credentials else None
+        )
+        await smtp.connect()
+        return smtp
+
+    async def _send(self, session, email: OutgoingEmail):
+        import aiosmtplib
+
+        message = build_mime_message(
+            self.from_email, email.to_email, email.subject, email.html_content, message_id=email.message_id
+        )
+        for attempt in range(2):
+            try:
+                if session is None or not session.is_connected or self.pool.is_spent(session):
+                    if session is not None:
+                        await session.close()
+                    session = await self.pool.acquire(self.pool_key, self._connect)
+                await session.smtp.sendmail(self.from_email, [email.to_email], message)
+                session.messages_sent += 1
+                return session, None
+            except aiosmtplib.SMTPServerDisconnected as e:
+                session = None
+                if attempt:
+                    return session, e
+            except (aiosmtplib.SMTPException, OSError) as e:
+                return session, e
+
+    async def _worker(self, queue: asyncio.Queue, limiter: TokenBucketLimiter, report: dict):
+        session = None
+        try:
+            while True:
+                try:
+                    email = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await limiter.acquire(email.domain)
+                session, error = await self._send(session, email)
+                if error is None:
+                    report["sent"].append(email.reference)
+                else:
+                    logger.warning("Failed to send email to %s: %s", email.to_email, error)
+                    report["failed"].append(email.reference)
+                    report["errors"][email.reference] = str(error)
+        finally:
+            if session is not None:
+                await self.pool.release(self.pool_key, session)
+
+    async def dispatch(self, emails) -> dict:
+        """
+        Send every email and return a batch report with the references of
+        sent and failed emails, the error per failed reference and the batch
+        throughput.
+        """
+        emails = list(emails)
+        queue = asyncio.Queue()
+        for email in emails:
+            queue.put_nowait(email)
+
+        self.limiter.prune()
+        report = {"sent": [], "failed": [], "errors": {}}
+        started = time.perf_counter()
+
+        workers = min(self.concurrency, len(emails))
+        await asyncio.gather(*(self._worker(queue, self.limiter, report) for _ in range(workers)))
+
+        seconds = time.perf_counter() - started
+        return {
+            **report,
+            "total": len(emails),
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(len(report["sent"]) / seconds, 1) if seconds > 0 else 0.0
+        }
+
+
+# Shared by every batch this worker process sends, so per-domain limits
+# hold across batches rather than restarting with a full bucket each time.
+domain_limiter = TokenBucketLimiter(settings.EMAIL_DOMAIN_RATE_PER_SECOND, settings.EMAIL_DOMAIN_RATE_LIMITS)
+
+# Likewise for SMTP sessions: notification_tasks runs every batch on one
+# event loop per process, so pooled sessions are reused across batches.
+session_pool = SMTPSessionPool(
+    size=settings.SMTP_POOL_SIZE,
+    max_idle_seconds=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+    max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+)
+
+
+def create_dispatcher() -> EmailDispatcher:
+    return EmailDispatcher(
+        hostname=settings.SMTP_SERVER,
+        port=settings.SMTP_PORT,
+        from_email=settings.FROM_EMAIL,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        concurrency=settings.EMAIL_DISPATCH_CONCURRENCY,
+        timeout=settings.SMTP_TIMEOUT,
+        default_domain_rate=settings.EMAIL_DOMAIN_RATE_PER_SECOND,
+        domain_rates=settings.EMAIL_DOMAIN_RATE_LIMITS,
+        limiter=domain_limiter,
+        pool=session_pool
+    )
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+AUCTION_TARGET = "auction"
+USER_TARGET = "user"
+
+
+def auction_message(auction_id: int, event: dict) -> dict:
+    return {"target": AUCTION_TARGET, "id": auction_id, "event": event}
+
+
+def user_message(user_id: int, event: dict) -> dict:
+    return {"target": USER_TARGET, "id": user_id, "event": event}
+
+
+def publish(messages) -> int:
+    """
+    Publish socket events from a process that holds no sockets, e.g. a Celery
+    worker, to every API process. Best effort: the events are live updates on
+    top of state that is already committed, so a Redis failure is logged and
+    not raised. No-op without EVENTS_REDIS_URL. Returns the number published.
+    """
+    messages = list(messages)
+    if not settings.EVENTS_REDIS_URL or not messages:
+        return 0
+
+    import redis
+
+    try:
+        client = redis.Redis.from_url(settings.EVENTS_REDIS_URL, socket_timeout=settings.EVENTS_REDIS_TIMEOUT)
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for message in messages:
+                    pipe.publish(settings.EVENTS_CHANNEL, json.dumps(message))
+                pipe.execute()
+        finally:
+            client.close()
+    except redis.RedisError as e:
+        logger.warning("Failed to publish %d socket events: %s", len(messages), e)
+        return 0
+    return len(messages)
+
+
+async def emit(messages) -> int:
+    """
+    Send socket events from an API process. With EVENTS_REDIS_URL they are
+    published, and reach this process's sockets through listen() like every
+    other process's; without it this is the only process, so they go straight
+    to the local sockets.
+    """
+    messages = list(messages)
+    if settings.EVENTS_REDIS_URL:
+        return await run_in_threadpool(publish, messages)
+    for message in messages:
+        await forward(message)
+    return len(messages)
+
+
+async def forward(message: dict):
+    """
+    Deliver one published event to the sockets this process holds.
+    """
+    if message.get("target") == AUCTION_TARGET:
+        await manager.broadcast(message["id"], message["event"])
+    elif message.get("target") == USER_TARGET:
+        await manager.send_to_user(message["id"], message["event"])
+    else:
+        logger.warning("Dropping socket event with unknown target: %r", message.get("target"))
+
+
+async def listen():
+    """
+    Subscribe to EVENTS_CHANNEL and forward every event to local sockets
+    until cancelled. Reconnects after a Redis failure; events published
+    while disconnected are lost, as with any pub/sub subscriber.
+    """
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+
+    while True:
+        client = aioredis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(settings.EVENTS_CHANNEL)
+                async for raw in pubsub.listen():
+                    if raw.get("type") != "message":
+                        continue
+                    try:
+                        await forward(json.loads(raw["data"]))
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.warning("Dropping malformed socket event: %s", e)
+        except (RedisError, OSError) as e:
+            logger.warning("Socket event subscription lost, retrying: %s", e)
+            await asyncio.sleep(settings.EVENTS_RECONNECT_SECONDS)
+        finally:
+            await client.aclose()
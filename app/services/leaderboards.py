@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, desc
+from app.db.base import dialect_insert
+from app.models.bid import Bid
+from app.models.leaderboard import LeaderboardCounter, ALL_TIME_BUCKET
+
+USERS_BOARD = "users"
+AUCTIONS_BOARD = "auctions"
+
+WINDOW_HOURS = {
+    "hour": 1,
+    "day": 24,
+    "week": 24 * 7,
+}
+
+
+def hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def increment(db, rows):
+    """
+    Add bid counts to (board, entity_id, bucket_start) rows in one upsert.
+    """
+    if not rows:
+        return
+
+    insert = dialect_insert(db)
+    stmt = insert(LeaderboardCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["board", "entity_id", "bucket_start"],
+        set_={"bid_count": LeaderboardCounter.bid_count + stmt.excluded.bid_count}
+    )
+    db.execute(stmt)
+
+
+def record_bid(db, auction_id: int, user_id: int, created_at: datetime):
+    bucket = hour_bucket(created_at)
+    increment(db, [
+        {"board": USERS_BOARD, "entity_id": user_id, "bucket_start": bucket, "bid_count": 1},
+        {"board": USERS_BOARD, "entity_id": user_id, "bucket_start": ALL_TIME_BUCKET, "bid_count": 1},
+        {"board": AUCTIONS_BOARD, "entity_id": auction_id, "bucket_start": bucket, "bid_count": 1},
+        {"board": AUCTIONS_BOARD, "entity_id": auction_id, "bucket_start": ALL_TIME_BUCKET, "bid_count": 1},
+    ])
+
+
+def window_start(window: str, now: datetime = None) -> datetime:
+    now = now or datetime.utcnow()
+    return hour_bucket(now) - timedelta(hours=WINDOW_HOURS[window] - 1)
+
+
+def top_entities(db, board: str, window: str, limit: int):
+    """
+    Return [(entity_id, bid_count)] ordered by bid count.
+    Windows are aligned to hour buckets: "day" is the current hour plus the 23 before it.
+    """
+    if window == "all":
+        return db.query(LeaderboardCounter.entity_id, LeaderboardCounter.bid_count)\
+                 .filter(LeaderboardCounter.board == board,
+                         LeaderboardCounter.bucket_start == ALL_TIME_BUCKET)\
+                 .order_by(desc(LeaderboardCounter.bid_count), LeaderboardCounter.entity_id)\
+                 .limit(limit)\
+                 .all()
+
+    total = func.sum(LeaderboardCounter.bid_count).label("bid_count")
+    return db.query(LeaderboardCounter.entity_id, total)\
+             .filter(LeaderboardCounter.board == board,
+                     LeaderboardCounter.bucket_start >= window_start(window))\
+             .group_by(LeaderboardCounter.entity_id)\
+             .order_by(desc(total), LeaderboardCounter.entity_id)\
+             .limit(limit)\
+             .all()
+
+
+def rebuild(db):
+    """
+    Recompute every counter from the bids table.
+    Hourly buckets are only rebuilt for the widest window (one week).
+    """
+    db.query(LeaderboardCounter).delete(synchronize_session=False)
+
+    for board, column in ((USERS_BOARD, Bid.user_id), (AUCTIONS_BOARD, Bid.auction_id)):
+        totals = db.query(column, func.count(Bid.id)).group_by(column).all()
+        increment(db, [
+            {"board": board, "entity_id": entity_id, "bucket_start": ALL_TIME_BUCKET, "bid_count": count}
+            for entity_id, count in totals
+        ])
+
+        since = window_start("week")
+        recent = db.query(column, Bid.created_at).filter(Bid.created_at >= since).all()
+        hourly = {}
+        for entity_id, created_at in recent:
+            key = (entity_id, hour_bucket(created_at))
+            hourly[key] = hourly.get(key, 0) + 1
+        increment(db, [
+            {"board": board, "entity_id": entity_id, "bucket_start": bucket, "bid_count": count}
+            for (entity_id, bucket), count in hourly.items()
+        ])
+
+
+def prune(db, now: datetime = None) -> int:
+    cutoff = window_start("week", now)
+    return db.query(LeaderboardCounter).filter(
+        LeaderboardCounter.bucket_start < cutoff,
+        LeaderboardCounter.bucket_start != ALL_TIME_BUCKET
+    ).delete(synchronize_session=False)
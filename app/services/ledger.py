@@ -0,0 +1,131 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import insert, func, type_coerce
+from app.db.base import dialect_insert
+from app.models.auction import Auction
+from app.models.ledger import LedgerEntry, LedgerEvent, OrganizerDailyRevenue
+
+ROLLUP_FIELDS = [
+    "holds", "held_amount",
+    "payments", "paid_amount", "paid_commission",
+    "refunds", "refunded_amount", "refunded_commission",
+    "releases", "released_amount",
+]
+
+
+def day_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def refund_event(payment) -> LedgerEvent:
+    """
+    A refund only takes back revenue when the payment had been confirmed;
+    otherwise it just releases the hold.
+    """
+    confirmed = (payment.payment_metadata or {}).get("confirmed")
+    return LedgerEvent.refund if confirmed else LedgerEvent.release
+
+
+def _deltas(event: LedgerEvent, amount: Decimal, commission: Decimal) -> dict:
+    if event == LedgerEvent.hold:
+        return {"holds": 1, "held_amount": amount}
+    if event == LedgerEvent.confirm:
+        return {"payments": 1, "paid_amount": amount, "paid_commission": commission}
+    if event == LedgerEvent.refund:
+        return {"refunds": 1, "refunded_amount": amount, "refunded_commission": commission}
+    return {"releases": 1, "released_amount": amount}
+
+
+def record(db, event: LedgerEvent, payments, at: datetime = None):
+    """
+    Append a ledger entry per payment and fold them into the organizers'
+    daily rollups with one upsert. payments only need id, auction_id,
+    user_id, amount and commission. The caller commits.
+    """
+    payments = list(payments)
+    if not payments:
+        return
+
+    at = at or datetime.utcnow()
+    organizers = dict(db.query(Auction.id, Auction.organizer_id)
+                        .filter(Auction.id.in_({payment.auction_id for payment in payments}))
+                        .all())
+
+    db.execute(insert(LedgerEntry), [
+        {
+            "payment_id": payment.id,
+            "auction_id": payment.auction_id,
+            "organizer_id": organizers[payment.auction_id],
+            "user_id": payment.user_id,
+            "event": event,
+            "amount": payment.amount,
+            "commission": payment.commission or Decimal("0.00"),
+            "created_at": at
+        }
+        for payment in payments
+    ])
+
+    rollups = {}
+    for payment in payments:
+        organizer_id = organizers[payment.auction_id]
+        row = rollups.setdefault(organizer_id, {
+            "organizer_id": organizer_id,
+            "day": day_bucket(at),
+            **{field: 0 for field in ROLLUP_FIELDS}
+        })
+        for field, delta in _deltas(event, payment.amount, payment.commission or Decimal("0.00")).items():
+            row[field] += delta
+
+    insert_stmt = dialect_insert(db)
+    stmt = insert_stmt(OrganizerDailyRevenue).values(list(rollups.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["organizer_id", "day"],
+        set_={field: getattr(OrganizerDailyRevenue, field) + stmt.excluded[field] for field in ROLLUP_FIELDS}
+    )
+    db.execute(stmt)
+
+
+def summary(db, organizer_id: int, start: datetime, end: datetime) -> dict:
+    """
+    Totals for the organizer's days in [start, end), read from the rollup's
+    primary key range in one query.
+    """
+    columns = [getattr(OrganizerDailyRevenue, field) for field in ROLLUP_FIELDS]
+    row = db.query(*(type_coerce(func.coalesce(func.sum(column), 0), column.type).label(column.key) for column in columns))\
+            .filter(OrganizerDailyRevenue.organizer_id == organizer_id,
+                    OrganizerDailyRevenue.day >= start,
+                    OrganizerDailyRevenue.day < end)\
+            .one()
+
+    totals = {field: getattr(row, field) for field in ROLLUP_FIELDS}
+    revenue = totals["paid_amount"] - totals["refunded_amount"]
+    commission = totals["paid_commission"] - totals["refunded_commission"]
+    return {
+        "organizer_id": organizer_id,
+        "start": start,
+        "end": end,
+        **totals,
+        "net_revenue": revenue,
+        "net_commission": commission,
+        "payout": revenue - commission
+    }
+
+
+def daily(db, organizer_id: int, start: datetime, end: datetime):
+    return db.query(OrganizerDailyRevenue)\
+             .filter(OrganizerDailyRevenue.organizer_id == organizer_id,
+                     OrganizerDailyRevenue.day >= start,
+                     OrganizerDailyRevenue.day < end)\
+             .order_by(OrganizerDailyRevenue.day)\
+             .all()
+
+
+def period(start: date = None, end: date = None):
+    """
+    Turn an inclusive day range into [start, end) datetimes, defaulting to
+    the current month to date.
+    """
+    today = datetime.utcnow().date()
+    start = start or today.replace(day=1)
+    end = end or today
+    return datetime.combine(start, time.min), datetime.combine(end, time.min) + timedelta(days=1)
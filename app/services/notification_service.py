@@ -1,52 +1,23 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from jinja2 import Template
-from app.models.notification import Notification, NotificationType, NotificationChannel
-from app.core.config import settings
 from datetime import datetime
+from uuid import uuid4
+from app.db.base import dialect_insert
+from app.models.notification import Notification, NotificationType, NotificationChannel
+from app.services.templates import render, render_many
 
 
-class EmailService:
-    def __init__(self):
-        self.smtp_server = getattr(settings, 'SMTP_SERVER', 'localhost')
-        self.smtp_port = getattr(settings, 'SMTP_PORT', 1025)
-        self.smtp_username = getattr(settings, 'SMTP_USERNAME', '')
-        self.smtp_password = getattr(settings, 'SMTP_PASSWORD', '')
-        self.from_email = getattr(settings, 'FROM_EMAIL', 'noreply@auctions.com')
-
-    def send_email(self, to_email: str, subject: str, html_content: str, text_content: str = None):
-        try:
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.from_email
-            message["To"] = to_email
-
-            if text_content:
-                part1 = MIMEText(text_content, "plain")
-                message.attach(part1)
-
-            part2 = MIMEText(html_content, "html")
-            message.attach(part2)
-
-            if self.smtp_username and self.smtp_password:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, to_email, message.as_string())
-            else:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.sendmail(self.from_email, to_email, message.as_string())
-
-            return True
-        except Exception as e:
-            print(f"Failed to send email: {e}")
-            return False
+SUBJECTS = {
+    NotificationType.outbid: "You've been outbid on {auction.title}",
+    NotificationType.won: "Congratulations! You won {auction.title}",
+    NotificationType.auction_ended: "Auction ended: {auction.title}",
+    NotificationType.payment_required: "Payment required for {auction.title}",
+}
 
 
 class NotificationService:
-    def __init__(self):
-        self.email_service = EmailService()
+    """
+    Writes notifications to the outbox as pending rows in the caller's
+    transaction; the deliver_notifications task sends them after commit.
+    """
 
     def create_notification(
         self,
@@ -67,112 +38,100 @@ class NotificationService:
             message=message
         )
         db.add(notification)
-        db.commit()
-        db.refresh(notification)
         return notification
 
-    def send_outbid_notification(self, db, user, auction, new_bid_amount):
-        subject = f"You've been outbid on {auction.title}"
-        message = f"""
-        <html>
-        <body>
-            <h2>You've been outbid!</h2>
-            <p>Unfortunately, someone has placed a higher bid on the auction you were winning.</p>
-            <p><strong>Auction:</strong> {auction.title}</p>
-            <p><strong>New highest bid:</strong> ${new_bid_amount}</p>
-            <p><strong>Your next minimum bid:</strong> ${new_bid_amount + auction.bid_step}</p>
-            <p>Don't miss out! Place a new bid now.</p>
-        </body>
-        </html>
+    def create_notifications(self, db, notifications: list[dict]) -> int:
+        """
+        Bulk-insert pending notifications given as column dicts in one statement.
+        Rows whose idempotency_key already exists are skipped and not counted.
         """
+        if not notifications:
+            return 0
+        now = datetime.utcnow()
+        insert = dialect_insert(db)
+        statement = insert(Notification)\
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])\
+            .returning(Notification.id)
+        inserted = db.execute(statement, [
+            {
+                "auction_id": None,
+                "subject": None,
+                **row,
+                "idempotency_key": row.get("idempotency_key") or uuid4().hex,
+                "sent": False,
+                "next_attempt_at": now,
+                "created_at": now
+            }
+            for row in notifications
+        ]).all()
+        return len(inserted)
+
+    def send_outbid_notification(self, db, user, auction, new_bid_amount):
+        subject = SUBJECTS[NotificationType.outbid].format(auction=auction)
+        message = render("outbid.html", user=user, auction=auction, new_bid_amount=new_bid_amount)
 
         notification = self.create_notification(
             db, user.id, NotificationType.outbid, NotificationChannel.email,
             subject, message, auction.id
         )
 
-        if self.email_service.send_email(user.email, subject, message):
-            notification.sent = True
-            notification.sent_at = datetime.utcnow()
-            db.commit()
-
         return notification
 
     def send_won_notification(self, db, user, auction):
-        subject = f"Congratulations! You won {auction.title}"
-        message = f"""
-        <html>
-        <body>
-            <h2>Congratulations!</h2>
-            <p>You have won the auction!</p>
-            <p><strong>Auction:</strong> {auction.title}</p>
-            <p><strong>Winning bid:</strong> ${auction.current_price}</p>
-            <p>Please proceed with payment to complete your purchase.</p>
-        </body>
-        </html>
-        """
+        subject = SUBJECTS[NotificationType.won].format(auction=auction)
+        message = render("won.html", user=user, auction=auction)
 
         notification = self.create_notification(
             db, user.id, NotificationType.won, NotificationChannel.email,
             subject, message, auction.id
         )
 
-        if self.email_service.send_email(user.email, subject, message):
-            notification.sent = True
-            notification.sent_at = datetime.utcnow()
-            db.commit()
-
         return notification
 
     def send_auction_ended_notification(self, db, user, auction):
-        subject = f"Auction ended: {auction.title}"
-        message = f"""
-        <html>
-        <body>
-            <h2>Auction Ended</h2>
-            <p>The auction you participated in has ended.</p>
-            <p><strong>Auction:</strong> {auction.title}</p>
-            <p><strong>Final price:</strong> ${auction.current_price}</p>
-        </body>
-        </html>
-        """
+        subject = SUBJECTS[NotificationType.auction_ended].format(auction=auction)
+        message = render("auction_ended.html", user=user, auction=auction)
 
         notification = self.create_notification(
             db, user.id, NotificationType.auction_ended, NotificationChannel.email,
             subject, message, auction.id
         )
 
-        if self.email_service.send_email(user.email, subject, message):
-            notification.sent = True
-            notification.sent_at = datetime.utcnow()
-            db.commit()
-
         return notification
 
-    def send_payment_required_notification(self, db, user, auction):
-        subject = f"Payment required for {auction.title}"
-        message = f"""
-        <html>
-        <body>
-            <h2>Payment Required</h2>
-            <p>Please complete your payment for the auction you won.</p>
-            <p><strong>Auction:</strong> {auction.title}</p>
-            <p><strong>Amount due:</strong> ${auction.current_price}</p>
-            <p>Please submit payment within 48 hours.</p>
-        </body>
-        </html>
+    def queue_bulk(self, db, notification_type: NotificationType, auction, users) -> int:
+        """
+        Fan-out of one notification type for an auction: one template render
+        per user with the auction as shared context, and a single bulk insert.
         """
+        users = list(users)
+        subject = SUBJECTS[notification_type].format(auction=auction)
+        messages = render_many(f"{notification_type.value}.html", {"auction": auction}, [{"user": user} for user in users])
+
+        return self.create_notifications(db, [
+            {
+                "user_id": user.id,
+                "auction_id": auction.id,
+                "notification_type": notification_type,
+                "channel": NotificationChannel.email,
+                "subject": subject,
+                "message": message,
+                "idempotency_key": f"{notification_type.value}:{auction.id}:{user.id}"
+            } for user, message in zip(users, messages)
+        ])
+
+    def send_auction_ended_notifications(self, db, users, auction) -> int:
+        return self.queue_bulk(db, NotificationType.auction_ended, auction, users)
+
+    def send_payment_required_notification(self, db, user, auction):
+        subject = SUBJECTS[NotificationType.payment_required].format(auction=auction)
+        message = render("payment_required.html", user=user, auction=auction)
 
         notification = self.create_notification(
             db, user.id, NotificationType.payment_required, NotificationChannel.email,
             subject, message, auction.id
         )
 
-        if self.email_service.send_email(user.email, subject, message):
-            notification.sent = True
-            notification.sent_at = datetime.utcnow()
-            db.commit()
-
         return notification
 
 
@@ -0,0 +1,181 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import case
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.notification import Notification, NotificationChannel
+from app.models.user import User
+from app.services.email_dispatcher import OutgoingEmail, create_dispatcher
+from app.services.telegram import TelegramMessage, create_telegram_sender
+from app.services import outbid_coalescer
+
+
+DELIVERY_CHANNELS = (NotificationChannel.email, NotificationChannel.telegram)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Exponential backoff after the given number of failed attempts.
+    """
+    seconds = settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.NOTIFICATION_RETRY_MAX_SECONDS))
+
+
+def message_id(idempotency_key: str) -> str:
+    return f"<{idempotency_key}@{settings.FROM_EMAIL.rsplit('@', 1)[-1]}>"
+
+
+def claim_due(db, batch_size: int, now: datetime) -> list:
+    """
+    Lock the next batch of notifications that are due for an attempt on a
+    channel with a delivery backend. Rows locked by another worker are
+    skipped rather than waited on.
+    """
+    return db.query(
+        Notification.id,
+        Notification.channel,
+        Notification.subject,
+        Notification.message,
+        Notification.idempotency_key,
+        Notification.attempts,
+        Notification.max_attempts,
+        User.email,
+        User.telegram_id
+    ).join(User, User.id == Notification.user_id)\
+     .filter(
+         Notification.next_attempt_at <= now,
+         Notification.channel.in_(DELIVERY_CHANNELS)
+     )\
+     .order_by(Notification.next_attempt_at)\
+     .limit(batch_size)\
+     .with_for_update(skip_locked=True, of=Notification)\
+     .all()
+
+
+def record_failures(db, rows, errors: dict, now: datetime):
+    """
+    Reschedule failed rows with backoff, or dead-letter them once they have
+    used up max_attempts. One UPDATE per distinct (attempts, dead) outcome.
+    """
+    groups = defaultdict(list)
+    for row in rows:
+        attempts = row.attempts + 1
+        groups[(attempts, attempts >= row.max_attempts)].append(row.id)
+
+    for (attempts, dead), ids in groups.items():
+        db.query(Notification).filter(Notification.id.in_(ids)).update({
+            Notification.attempts: attempts,
+            Notification.next_attempt_at: None if dead else now + retry_delay(attempts),
+            Notification.dead_lettered_at: now if dead else None,
+            Notification.last_error: case({i: errors.get(i) for i in ids}, value=Notification.id)
+        }, synchronize_session=False)
+
+
+async def dispatch(rows) -> dict:
+    """
+    Route rows to the backend for their channel and send the channels
+    concurrently. Returns one merged report.
+    """
+    by_channel = defaultdict(list)
+    for row in rows:
+        by_channel[row.channel].append(row)
+
+    jobs = []
+    if by_channel[NotificationChannel.email]:
+        jobs.append(create_dispatcher().dispatch(
+            OutgoingEmail(row.email, row.subject, row.message, reference=row.id, message_id=message_id(row.idempotency_key))
+            for row in by_channel[NotificationChannel.email]
+        ))
+    if by_channel[NotificationChannel.telegram]:
+        jobs.append(create_telegram_sender().dispatch(
+            TelegramMessage(row.telegram_id, row.message, reference=row.id)
+            for row in by_channel[NotificationChannel.telegram]
+        ))
+
+    report = {"sent": [], "failed": [], "errors": {}}
+    for channel_report in await asyncio.gather(*jobs):
+        report["sent"] += channel_report["sent"]
+        report["failed"] += channel_report["failed"]
+        report["errors"].update(channel_report["errors"])
+    return report
+
+
+_loop = None
+
+
+def run_async(coroutine):
+    """
+    Run on one event loop per worker process instead of a fresh loop per
+    batch, so pooled SMTP sessions stay usable from one batch to the next.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coroutine)
+
+
+def deliver_batch(db, rows, now: datetime = None) -> dict:
+    now = now or datetime.utcnow()
+    report = run_async(dispatch(rows))
+
+    if report["sent"]:
+        db.query(Notification).filter(Notification.id.in_(report["sent"])).update({
+            Notification.sent: True,
+            Notification.sent_at: now,
+            Notification.attempts: Notification.attempts + 1,
+            Notification.next_attempt_at: None,
+            Notification.last_error: None
+        }, synchronize_session=False)
+
+    failed = set(report["failed"])
+    record_failures(db, [row for row in rows if row.id in failed], report["errors"], now)
+    return report
+
+
+@celery_app.task(name="deliver_notifications")
+def deliver_notifications(batch_size: int = None):
+    """
+    Drain notifications that are due, batch by batch. Failed rows are
+    rescheduled into the future, so each row is attempted at most once per run.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        sent = failed = 0
+
+        while True:
+            rows = claim_due(db, batch_size, datetime.utcnow())
+            if not rows:
+                break
+            report = deliver_batch(db, rows)
+            db.commit()
+
+            sent += len(report["sent"])
+            failed += len(report["failed"])
+            if len(rows) < batch_size:
+                break
+
+        return f"Sent {sent} notifications, {failed} failed"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="flush_outbid_digests")
+def flush_outbid_digests():
+    db = SessionLocal()
+    try:
+        count = outbid_coalescer.flush(db)
+        db.commit()
+        return f"Queued {count} outbid digests"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
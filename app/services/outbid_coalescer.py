@@ -0,0 +1,162 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import func, tuple_
+from app.core.config import settings
+from app.db.base import dialect_insert
+from app.models.auction import Auction, AuctionStatus
+from app.models.bid import Bid
+from app.models.notification import NotificationType, NotificationChannel
+from app.models.outbid import PendingOutbid
+from app.models.user import User
+from app.services.notification_service import notification_service, SUBJECTS
+from app.services.templates import render
+
+
+def record_outbid(db, user_id: int, auction_id: int, amount, outbid_at: datetime):
+    """
+    Hold an outbid event for (user, auction). Repeated outbids only bump the
+    counter and the latest amount until the digest is flushed.
+    """
+    insert = dialect_insert(db)
+    stmt = insert(PendingOutbid).values(
+        user_id=user_id,
+        auction_id=auction_id,
+        latest_amount=amount,
+        outbid_count=1,
+        first_outbid_at=outbid_at,
+        last_outbid_at=outbid_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "auction_id"],
+        set_={
+            "latest_amount": stmt.excluded.latest_amount,
+            "outbid_count": PendingOutbid.outbid_count + 1,
+            "last_outbid_at": stmt.excluded.last_outbid_at
+        }
+    )
+    db.execute(stmt)
+
+
+def outbid_user(db, auction, bidder_id: int):
+    """
+    The current leader who is about to be outbid, or None if there is no
+    leader or the bidder already leads. Call before the new bid is added.
+    """
+    leader = db.query(Bid.user_id)\
+               .filter(Bid.auction_id == auction.id)\
+               .order_by(Bid.amount.desc(), Bid.id.desc())\
+               .first()
+
+    if leader and leader.user_id != bidder_id:
+        return leader.user_id
+    return None
+
+
+def outbid_event(auction) -> dict:
+    return {
+        "type": "outbid",
+        "data": {
+            "auction_id": auction.id,
+            "title": auction.title,
+            "current_price": str(auction.current_price),
+            "next_minimum_bid": str(auction.current_price + auction.bid_step)
+        }
+    }
+
+
+def _leading_pairs(db, pairs) -> set:
+    """
+    (user_id, auction_id) pairs where the user has since retaken the lead.
+    """
+    highest = db.query(Bid.user_id, Bid.auction_id, func.max(Bid.amount))\
+                .filter(tuple_(Bid.user_id, Bid.auction_id).in_(pairs))\
+                .group_by(Bid.user_id, Bid.auction_id)\
+                .all()
+    prices = dict(db.query(Auction.id, Auction.current_price)
+                    .filter(Auction.id.in_({auction_id for _, auction_id in pairs})).all())
+
+    return {(user_id, auction_id) for user_id, auction_id, amount in highest if amount >= prices[auction_id]}
+
+
+class DigestItem:
+    def __init__(self, auction, outbid_count: int):
+        self.auction = auction
+        self.outbid_count = outbid_count
+
+
+def channel_for(user) -> NotificationChannel:
+    """
+    Outbid alerts go to Telegram when configured and the user has linked a chat.
+    """
+    if settings.OUTBID_NOTIFICATION_CHANNEL == NotificationChannel.telegram.value and user.telegram_id:
+        return NotificationChannel.telegram
+    return NotificationChannel.email
+
+
+def _digest(user, items) -> dict:
+    channel = channel_for(user)
+    prefix = "telegram/" if channel == NotificationChannel.telegram else ""
+    extension = "txt" if channel == NotificationChannel.telegram else "html"
+
+    if len(items) == 1:
+        auction = items[0].auction
+        return {
+            "user_id": user.id,
+            "auction_id": auction.id,
+            "notification_type": NotificationType.outbid,
+            "channel": channel,
+            "subject": SUBJECTS[NotificationType.outbid].format(auction=auction),
+            "message": render(f"{prefix}outbid.{extension}", user=user, auction=auction, new_bid_amount=auction.current_price)
+        }
+
+    return {
+        "user_id": user.id,
+        "notification_type": NotificationType.outbid,
+        "channel": channel,
+        "subject": f"You've been outbid on {len(items)} auctions",
+        "message": render(f"{prefix}outbid_digest.{extension}", user=user, items=items)
+    }
+
+
+def flush(db, now: datetime = None, window_seconds: int = None) -> int:
+    """
+    Turn held outbids into one notification per user, for users whose oldest
+    held outbid is at least a window old. Auctions that have closed, or where
+    the user leads again, are dropped. Returns the number of notifications.
+    """
+    now = now or datetime.utcnow()
+    window = timedelta(seconds=window_seconds if window_seconds is not None else settings.OUTBID_DIGEST_WINDOW_SECONDS)
+
+    due_users = db.query(PendingOutbid.user_id)\
+                  .group_by(PendingOutbid.user_id)\
+                  .having(func.min(PendingOutbid.first_outbid_at) <= now - window)
+    rows = db.query(PendingOutbid, Auction, User)\
+             .join(Auction, Auction.id == PendingOutbid.auction_id)\
+             .join(User, User.id == PendingOutbid.user_id)\
+             .filter(PendingOutbid.user_id.in_(due_users))\
+             .order_by(PendingOutbid.user_id, PendingOutbid.last_outbid_at.desc())\
+             .with_for_update(skip_locked=True, of=PendingOutbid)\
+             .all()
+    if not rows:
+        return 0
+
+    pairs = [(pending.user_id, pending.auction_id) for pending, _, _ in rows]
+    leading = _leading_pairs(db, pairs)
+
+    digests = defaultdict(list)
+    users = {}
+    for pending, auction, user in rows:
+        if auction.status != AuctionStatus.active or (pending.user_id, pending.auction_id) in leading:
+            continue
+        users[user.id] = user
+        digests[user.id].append(DigestItem(auction, pending.outbid_count))
+
+    notification_service.create_notifications(db, [
+        _digest(users[user_id], items) for user_id, items in digests.items()
+    ])
+
+    db.query(PendingOutbid)\
+      .filter(tuple_(PendingOutbid.user_id, PendingOutbid.auction_id).in_(pairs))\
+      .delete(synchronize_session=False)
+
+    return len(digests)
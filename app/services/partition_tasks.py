@@ -0,0 +1,36 @@
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db import partitioning
+from app.models.bid import Bid
+from app.models.event_log import EventLog
+
+
+@celery_app.task(name="ensure_partitions")
+def ensure_partitions():
+    db = SessionLocal()
+    try:
+        created = partitioning.ensure_partitions(db.connection(), [Bid.__table__, EventLog.__table__])
+        db.commit()
+        return f"Created {len(created)} partitions"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+
+@celery_app.task(name="archive_partitions")
+def archive_partitions():
+    db = SessionLocal()
+    try:
+        archived = partitioning.archive_partitions(db.get_bind(), {
+            Bid.__tablename__: settings.BIDS_RETENTION_MONTHS,
+            EventLog.__tablename__: settings.EVENT_LOGS_RETENTION_MONTHS
+        })
+        rows = sum(count for _, count, _ in archived)
+        return f"Archived {len(archived)} partitions ({rows} rows)"
+
+    finally:
+        db.close()
@@ -1,6 +1,46 @@
+import json
 import uuid
+from datetime import datetime
 from decimal import Decimal
-from app.models.payment import Payment, PaymentStatus
+from sqlalchemy import update, select, func, cast, JSON
+from app.models.auction import Auction
+from app.db.base import dialect_insert
+from app.models.payment import Payment, PaymentStatus, allowed_sources, ACTIVE_PAYMENT_STATUSES
+from app.models.ledger import LedgerEvent
+from app.services import ledger
+
+
+def merged_metadata(db, patch: dict):
+    """
+    SQL expression that merges patch into the stored metadata, so the
+    transition UPDATE does not need to read the row first.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        current = func.coalesce(cast(Payment.payment_metadata, JSONB), cast("{}", JSONB))
+        return cast(current.op("||")(cast(json.dumps(patch), JSONB)), JSON)
+
+    return func.json_patch(func.coalesce(Payment.payment_metadata, "{}"), json.dumps(patch))
+
+
+def transition(db, payment_id: int, target: PaymentStatus, patch: dict = None, criteria=()):
+    """
+    Move a payment to target in one conditional UPDATE ... RETURNING.
+    The row only changes if its current status may transition to target
+    and any extra criteria hold; returns the updated Payment or None.
+    """
+    values = {"status": target, "updated_at": datetime.utcnow()}
+    if patch:
+        values["payment_metadata"] = merged_metadata(db, patch)
+
+    stmt = update(Payment)\
+        .where(Payment.id == payment_id, Payment.status.in_(allowed_sources(target)), *criteria)\
+        .values(**values)\
+        .returning(Payment)\
+        .execution_options(synchronize_session=False, populate_existing=True)
+
+    return db.execute(stmt).scalars().first()
 
 
 class MockPaymentService:
@@ -10,62 +50,89 @@ class MockPaymentService:
     """
 
     @staticmethod
-    def create_payment_hold(auction_id: int, user_id: int, amount: Decimal, commission: Decimal = Decimal("0.00")):
-        total_amount = amount + commission
-        transaction_id = f"mock_txn_{uuid.uuid4().hex[:16]}"
-
-        payment = Payment(
-            auction_id=auction_id,
-            user_id=user_id,
-            amount=amount,
-            commission=commission,
-            total_amount=total_amount,
-            status=PaymentStatus.held,
-            payment_method="mock_card",
-            transaction_id=transaction_id,
-            metadata={
+    def hold_values(auction_id: int, user_id: int, amount: Decimal, commission: Decimal = Decimal("0.00")) -> dict:
+        return {
+            "auction_id": auction_id,
+            "user_id": user_id,
+            "amount": amount,
+            "commission": commission,
+            "total_amount": amount + commission,
+            "status": PaymentStatus.held,
+            "payment_method": "mock_card",
+            "transaction_id": f"mock_txn_{uuid.uuid4().hex[:16]}",
+            "payment_metadata": {
                 "mock": True,
                 "card_last4": "4242",
                 "card_brand": "visa"
             }
-        )
+        }
 
-        return payment
+    @staticmethod
+    def create_payment_hold(auction_id: int, user_id: int, amount: Decimal, commission: Decimal = Decimal("0.00")):
+        return Payment(**MockPaymentService.hold_values(auction_id, user_id, amount, commission))
 
     @staticmethod
-    def confirm_payment(payment: Payment) -> bool:
-        if payment.status != PaymentStatus.held:
-            return False
+    def create_payment_holds(db, holds) -> int:
+        """
+        Bulk-insert held payments for (auction_id, user_id, amount, commission)
+        tuples in one statement and record them in the ledger. Auctions that
+        already have an active payment are skipped by the unique active-payment index.
+        """
+        holds = list(holds)
+        if not holds:
+            return 0
+
+        now = datetime.utcnow()
+        insert = dialect_insert(db)
+        stmt = insert(Payment).on_conflict_do_nothing(
+            index_elements=["auction_id"],
+            index_where=Payment.status.in_(ACTIVE_PAYMENT_STATUSES)
+        ).returning(Payment.id, Payment.auction_id, Payment.user_id, Payment.amount, Payment.commission)
+        created = db.execute(stmt, [
+            {**MockPaymentService.hold_values(*hold), "created_at": now, "updated_at": now} for hold in holds
+        ]).all()
+        ledger.record(db, LedgerEvent.hold, created, at=now)
+        return len(created)
 
-        payment.status = PaymentStatus.paid
-        payment.metadata = {
-            **payment.metadata,
+    @staticmethod
+    def confirm_payment(db, payment_id: int, user_id: int = None):
+        criteria = [Payment.user_id == user_id] if user_id is not None else []
+        payment = transition(db, payment_id, PaymentStatus.paid, {
             "confirmed": True,
             "confirmation_id": f"conf_{uuid.uuid4().hex[:12]}"
-        }
-        return True
+        }, criteria)
+        if payment:
+            ledger.record(db, LedgerEvent.confirm, [payment])
+        return payment
 
     @staticmethod
-    def refund_payment(payment: Payment) -> bool:
-        if payment.status not in [PaymentStatus.paid, PaymentStatus.held]:
-            return False
-
-        payment.status = PaymentStatus.refunded
-        payment.metadata = {
-            **payment.metadata,
+    def refund_payment(db, payment_id: int, organizer_id: int = None):
+        criteria = []
+        if organizer_id is not None:
+            criteria.append(Payment.auction_id.in_(select(Auction.id).where(Auction.organizer_id == organizer_id)))
+        payment = transition(db, payment_id, PaymentStatus.refunded, {
             "refunded": True,
             "refund_id": f"ref_{uuid.uuid4().hex[:12]}"
-        }
-        return True
+        }, criteria)
+        if payment:
+            ledger.record(db, ledger.refund_event(payment), [payment])
+        return payment
 
     @staticmethod
-    def simulate_payment_failure(payment: Payment) -> None:
-        payment.status = PaymentStatus.failed
-        payment.metadata = {
-            **payment.metadata,
+    def simulate_payment_failure(db, payment_id: int):
+        """
+        Fail a pending or held payment. Failing a hold releases it, so that
+        transition is recorded in the ledger in the same transaction.
+        """
+        patch = {
             "error": "Simulated payment failure",
             "error_code": "insufficient_funds"
         }
+        payment = transition(db, payment_id, PaymentStatus.failed, patch, [Payment.status == PaymentStatus.held])
+        if payment:
+            ledger.record(db, LedgerEvent.release, [payment])
+            return payment
+        return transition(db, payment_id, PaymentStatus.failed, patch)
 
 
 payment_service = MockPaymentService()
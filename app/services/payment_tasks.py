@@ -0,0 +1,17 @@
+from app.celery_app import celery_app
+from app.db.base import SessionLocal
+from app.services import settlement
+
+
+@celery_app.task(name="settle_closed_auctions")
+def settle_closed_auctions(chunk_size: int = None):
+    db = SessionLocal()
+    try:
+        report = settlement.settle(db, chunk_size)
+        return f"Created {report['holds_created']} payment holds in {report['chunks']} chunks"
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
@@ -0,0 +1,123 @@
+from datetime import datetime
+from app.models.bid import Bid
+from app.models.price_stats import AuctionPriceStats
+
+MIN_BIDS_FOR_PREDICTION = 3
+MEDIUM_CONFIDENCE_BIDS = 5
+
+
+def hours_since_start(auction, timestamp: datetime) -> float:
+    return (timestamp - auction.start_time).total_seconds() / 3600
+
+
+def record_bid(db, auction, amount, created_at: datetime):
+    """
+    Fold a new bid into the auction's running sums.
+    Must be called inside the transaction that holds the auction row lock.
+    """
+    x = hours_since_start(auction, created_at)
+    y = float(amount)
+
+    updated = db.query(AuctionPriceStats).filter(
+        AuctionPriceStats.auction_id == auction.id
+    ).update({
+        AuctionPriceStats.n: AuctionPriceStats.n + 1,
+        AuctionPriceStats.sum_x: AuctionPriceStats.sum_x + x,
+        AuctionPriceStats.sum_y: AuctionPriceStats.sum_y + y,
+        AuctionPriceStats.sum_xy: AuctionPriceStats.sum_xy + x * y,
+        AuctionPriceStats.sum_xx: AuctionPriceStats.sum_xx + x * x,
+        AuctionPriceStats.updated_at: datetime.utcnow()
+    }, synchronize_session=False)
+
+    if not updated:
+        db.flush()
+        db.add(compute_stats(db, auction))
+
+
+def compute_stats(db, auction) -> AuctionPriceStats:
+    import numpy as np
+
+    rows = db.query(Bid.created_at, Bid.amount).filter(Bid.auction_id == auction.id).all()
+
+    x = np.array([hours_since_start(auction, row.created_at) for row in rows], dtype=float)
+    y = np.array([float(row.amount) for row in rows], dtype=float)
+
+    return AuctionPriceStats(
+        auction_id=auction.id,
+        n=len(rows),
+        sum_x=float(x.sum()),
+        sum_y=float(y.sum()),
+        sum_xy=float((x * y).sum()),
+        sum_xx=float((x * x).sum())
+    )
+
+
+def load_stats(db, auction) -> AuctionPriceStats:
+    stats = db.get(AuctionPriceStats, auction.id)
+    if stats is None:
+        stats = compute_stats(db, auction)
+    return stats
+
+
+def fit_predict(n, sum_x, sum_y, sum_xy, sum_xx, target_x):
+    import numpy as np
+
+    n, sum_x, sum_y, sum_xy, sum_xx, target_x = (
+        np.asarray(v, dtype=float) for v in (n, sum_x, sum_y, sum_xy, sum_xx, target_x)
+    )
+
+    denom = n * sum_xx - sum_x ** 2
+    degenerate = denom <= 1e-12 * np.maximum(n * sum_xx, 1.0)
+    slope = np.where(degenerate, 0.0, (n * sum_xy - sum_x * sum_y) / np.where(degenerate, 1.0, denom))
+    intercept = (sum_y - slope * sum_x) / np.where(n > 0, n, 1.0)
+
+    return intercept + slope * target_x
+
+
+def confidence_for(bid_count: int) -> str:
+    return "medium" if bid_count >= MEDIUM_CONFIDENCE_BIDS else "low"
+
+
+def predict_price(auction, stats: AuctionPriceStats) -> float:
+    target_x = hours_since_start(auction, auction.end_time)
+    predicted = float(fit_predict(
+        stats.n, stats.sum_x, stats.sum_y, stats.sum_xy, stats.sum_xx, target_x
+    ))
+    return max(predicted, float(auction.current_price))
+
+
+def predict_many(db, rows):
+    """
+    Vectorized prediction for (auction, stats) pairs; stats may be None
+    for auctions whose running sums were never materialized.
+    """
+    import numpy as np
+
+    if not rows:
+        return []
+
+    stats = [s if s is not None else compute_stats(db, a) for a, s in rows]
+    auctions = [a for a, _ in rows]
+
+    n = np.array([s.n for s in stats], dtype=float)
+    predicted = fit_predict(
+        n,
+        [s.sum_x for s in stats],
+        [s.sum_y for s in stats],
+        [s.sum_xy for s in stats],
+        [s.sum_xx for s in stats],
+        [hours_since_start(a, a.end_time) for a in auctions]
+    )
+    current = np.array([float(a.current_price) for a in auctions])
+    predicted = np.where(n >= MIN_BIDS_FOR_PREDICTION, np.maximum(predicted, current), current)
+
+    return [
+        {
+            "auction_id": auction.id,
+            "predicted_price": round(float(price), 2),
+            "current_price": float(auction.current_price),
+            "confidence": confidence_for(s.n),
+            "bid_count": s.n
+        }
+        for auction, s, price in zip(auctions, stats, predicted)
+    ]
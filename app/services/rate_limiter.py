@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key. Each bucket holds `burst` tokens, one second of
+    refill by default, and never less than one token so rates below 1/s
+    still let a send through. Keys without an explicit rate use
+    default_rate; a rate <= 0 is unlimited.
+    """
+
+    def __init__(self, default_rate: float, rates: dict = None, burst: float = None):
+        self.default_rate = default_rate
+        self.rates = {str(key).lower(): rate for key, rate in (rates or {}).items()}
+        self.burst = burst
+        self._buckets = {}
+
+    def capacity(self, rate: float) -> float:
+        return max(1.0, rate if self.burst is None else self.burst)
+
+    def prune(self):
+        """
+        Drop buckets that have refilled completely; they behave the same as
+        a fresh bucket, so long-lived limiters do not grow without bound.
+        """
+        now = time.monotonic()
+        for key, (tokens, updated) in list(self._buckets.items()):
+            rate = self.rates.get(key, self.default_rate)
+            if tokens + (now - updated) * rate >= self.capacity(rate):
+                del self._buckets[key]
+
+    async def acquire(self, key):
+        key = str(key).lower()
+        rate = self.rates.get(key, self.default_rate)
+        if rate <= 0:
+            return
+
+        capacity = self.capacity(rate)
+        while True:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return
+            self._buckets[key] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / rate)
@@ -0,0 +1,227 @@
+import csv
+import heapq
+import json
+import mmap
+import os
+import tempfile
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from sqlalchemy import select
+from app.models.payment import Payment
+
+STATEMENT_FIELDS = {"transaction_id": "transaction_id", "amount": "amount", "status": "status"}
+
+STATUS_ALIASES = {
+    "authorized": "held",
+    "authorised": "held",
+    "captured": "paid",
+    "succeeded": "paid",
+    "settled": "paid",
+    "refunded": "refunded",
+    "reversed": "refunded",
+    "declined": "failed",
+    "failed": "failed",
+    "pending": "pending",
+}
+
+MISSING_IN_DB = "missing_in_db"
+MISSING_IN_STATEMENT = "missing_in_statement"
+AMOUNT_DIFFERS = "amount_differs"
+STATUS_DIFFERS = "status_differs"
+DUPLICATE_IN_STATEMENT = "duplicate_in_statement"
+
+MISMATCH_TYPES = (MISSING_IN_DB, MISSING_IN_STATEMENT, AMOUNT_DIFFERS, STATUS_DIFFERS, DUPLICATE_IN_STATEMENT)
+
+
+def statement_format(path: str) -> str:
+    return "ndjson" if path.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def normalize_status(value) -> str:
+    status = str(value or "").strip().lower()
+    return STATUS_ALIASES.get(status, status)
+
+
+def _lines(path: str):
+    """
+    Lines of the file as bytes, read through a memory map so the OS pages
+    the statement in and out instead of it being held in memory.
+    """
+    with open(path, "rb") as statement:
+        if os.fstat(statement.fileno()).st_size == 0:
+            return
+        with mmap.mmap(statement.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter(mapped.readline, b"")
+
+
+def read_statement(path: str, fmt: str = None, fields: dict = None):
+    """
+    Yield (transaction_id, amount, status, line) for every record of a CSV
+    (with header) or NDJSON statement, in file order.
+    """
+    fields = {**STATEMENT_FIELDS, **(fields or {})}
+    lines = (line.decode("utf-8-sig") for line in _lines(path))
+
+    if (fmt or statement_format(path)) == "ndjson":
+        rows = (json.loads(line) for line in lines if line.strip())
+        start = 1
+    else:
+        rows = csv.DictReader(lines)
+        start = 2
+
+    for line, row in enumerate(rows, start):
+        yield (
+            str(row[fields["transaction_id"]]).strip(),
+            str(row[fields["amount"]]).strip(),
+            normalize_status(row[fields["status"]]),
+            line
+        )
+
+
+def _read_run(run):
+    for line in run:
+        yield tuple(json.loads(line))
+
+
+def external_sort(records, chunk_size: int):
+    """
+    Sort records of any size with at most chunk_size of them in memory:
+    sorted runs are spilled to temporary files and lazily k-way merged.
+    Input that fits in one chunk never touches the disk.
+    """
+    with tempfile.TemporaryDirectory(prefix="reconcile-") as directory:
+        runs = []
+        while True:
+            chunk = sorted(islice(records, chunk_size))
+            if not chunk:
+                break
+            if not runs and len(chunk) < chunk_size:
+                yield from chunk
+                return
+            path = os.path.join(directory, f"run-{len(runs)}.ndjson")
+            with open(path, "w") as run:
+                run.writelines(json.dumps(record) + "\n" for record in chunk)
+            runs.append(path)
+
+        files = [open(path) for path in runs]
+        try:
+            yield from heapq.merge(*(_read_run(run) for run in files))
+        finally:
+            for run in files:
+                run.close()
+
+
+def payment_rows(db, chunk_size: int, start=None, end=None):
+    """
+    Payments with a transaction id in transaction id order, fetched through
+    a server-side cursor chunk_size rows at a time. PostgreSQL sorts with
+    the C collation so the order matches Python string comparison.
+    """
+    key = Payment.transaction_id
+    if db.get_bind().dialect.name == "postgresql":
+        key = key.collate("C")
+
+    query = select(Payment.id, Payment.transaction_id, Payment.total_amount, Payment.status)\
+        .where(Payment.transaction_id.isnot(None))
+    if start is not None:
+        query = query.where(Payment.created_at >= start)
+    if end is not None:
+        query = query.where(Payment.created_at < end)
+
+    yield from db.execute(query.order_by(key).execution_options(yield_per=chunk_size))
+
+
+def _amount(value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def _mismatch(kind: str, record=None, payment=None) -> dict:
+    return {
+        "type": kind,
+        "transaction_id": record[0] if record else payment.transaction_id,
+        "payment_id": payment.id if payment else None,
+        "statement_line": record[3] if record else None,
+        "statement_amount": record[1] if record else None,
+        "payment_amount": str(payment.total_amount) if payment else None,
+        "statement_status": record[2] if record else None,
+        "payment_status": payment.status.value if payment else None,
+    }
+
+
+def reconcile(statement, payments, counts: Counter = None):
+    """
+    Sort-merge join of a statement and payments, both ordered by transaction
+    id, yielding a mismatch dict for every difference. Memory stays constant
+    whatever the input sizes. counts, when given, is updated with totals.
+    """
+    counts = counts if counts is not None else Counter()
+    statement, payments = iter(statement), iter(payments)
+    record, payment = next(statement, None), next(payments, None)
+    previous = None
+
+    while record is not None or payment is not None:
+        if record is not None and previous is not None and record[0] < previous:
+            raise ValueError(f"Statement is not sorted by transaction_id at line {record[3]}")
+
+        if record is not None and record[0] == previous:
+            counts["statement_records"] += 1
+            counts[DUPLICATE_IN_STATEMENT] += 1
+            yield _mismatch(DUPLICATE_IN_STATEMENT, record)
+            record = next(statement, None)
+            continue
+
+        if payment is None or (record is not None and record[0] < payment.transaction_id):
+            counts["statement_records"] += 1
+            counts[MISSING_IN_DB] += 1
+            yield _mismatch(MISSING_IN_DB, record)
+            previous, record = record[0], next(statement, None)
+            continue
+
+        if record is None or payment.transaction_id < record[0]:
+            counts["payments"] += 1
+            counts[MISSING_IN_STATEMENT] += 1
+            yield _mismatch(MISSING_IN_STATEMENT, payment=payment)
+            payment = next(payments, None)
+            continue
+
+        counts["statement_records"] += 1
+        counts["payments"] += 1
+        matched = True
+        if _amount(record[1]) != payment.total_amount:
+            counts[AMOUNT_DIFFERS] += 1
+            matched = False
+            yield _mismatch(AMOUNT_DIFFERS, record, payment)
+        if record[2] != payment.status.value:
+            counts[STATUS_DIFFERS] += 1
+            matched = False
+            yield _mismatch(STATUS_DIFFERS, record, payment)
+        if matched:
+            counts["matched"] += 1
+
+        previous, record, payment = record[0], next(statement, None), next(payments, None)
+
+
+def run(db, path: str, output, fmt: str = None, chunk_size: int = 100000,
+        presorted: bool = False, start=None, end=None, fields: dict = None) -> dict:
+    """
+    Reconcile the statement at path against payments and write one NDJSON
+    line per mismatch to output. Returns the totals.
+    """
+    records = read_statement(path, fmt, fields)
+    if not presorted:
+        records = external_sort(records, chunk_size)
+
+    counts = Counter()
+    for mismatch in reconcile(records, payment_rows(db, chunk_size, start, end), counts):
+        output.write(json.dumps(mismatch) + "\n")
+
+    return {
+        "statement_records": counts["statement_records"],
+        "payments": counts["payments"],
+        "matched": counts["matched"],
+        **{kind: counts[kind] for kind in MISMATCH_TYPES}
+    }
@@ -0,0 +1,64 @@
+from sqlalchemy import func, select, exists, and_, type_coerce, Numeric
+from app.core.config import settings
+from app.models.auction import Auction, AuctionStatus
+from app.models.payment import Payment, PaymentStatus
+from app.services.payment_service import payment_service
+
+
+def unsettled_auctions(after_id: int, limit: int):
+    """
+    Closed auctions with a winner and no payment other than a failed one,
+    as an anti-join. A refunded auction stays settled.
+    Commission is computed in SQL from commission_rate.
+    """
+    commission = type_coerce(
+        func.round(Auction.current_price * func.coalesce(Auction.commission_rate, 0) / 100, 2), Numeric(10, 2)
+    )
+    has_payment = exists().where(and_(
+        Payment.auction_id == Auction.id,
+        Payment.status != PaymentStatus.failed
+    ))
+
+    return select(Auction.id, Auction.winner_id, Auction.current_price, commission.label("commission"))\
+        .where(
+            Auction.status == AuctionStatus.closed,
+            Auction.winner_id.isnot(None),
+            Auction.id > after_id,
+            ~has_payment
+        )\
+        .order_by(Auction.id)\
+        .limit(limit)
+
+
+def settle_chunk(db, after_id: int, chunk_size: int):
+    """
+    Create holds for the next chunk of unsettled auctions after after_id.
+    Returns (last auction id seen or None when done, holds created).
+    """
+    rows = db.execute(unsettled_auctions(after_id, chunk_size)).all()
+    if not rows:
+        return None, 0
+
+    created = payment_service.create_payment_holds(db, [
+        (row.id, row.winner_id, row.current_price, row.commission) for row in rows
+    ])
+    return rows[-1].id, created
+
+
+def settle(db, chunk_size: int = None, commit: bool = True) -> dict:
+    """
+    Walk every unsettled auction in id order, one chunk per transaction.
+    """
+    chunk_size = chunk_size or settings.SETTLEMENT_CHUNK_SIZE
+    after_id, created, chunks = 0, 0, 0
+
+    while True:
+        after_id, chunk_created = settle_chunk(db, after_id, chunk_size)
+        if after_id is None:
+            break
+        created += chunk_created
+        chunks += 1
+        if commit:
+            db.commit()
+
+    return {"holds_created": created, "chunks": chunks}
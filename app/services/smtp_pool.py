@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+
+class PooledSession:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def is_connected(self) -> bool:
+        return self.smtp.is_connected
+
+    async def close(self):
+        if not self.smtp.is_connected:
+            return
+        try:
+            await self.smtp.quit()
+        except Exception:
+            self.smtp.close()
+
+
+class SMTPSessionPool:
+    """
+    Long-lived aiosmtplib sessions shared by every dispatch on one event loop,
+    keyed by server and login. A session idle for longer than
+    max_idle_seconds is checked with NOOP before reuse; dead sessions and
+    sessions past max_messages_per_connection are replaced with fresh ones.
+    At most `size` idle sessions are kept per key.
+    """
+
+    def __init__(self, size: int = 4, max_idle_seconds: float = 30.0, max_messages_per_connection: int = 100):
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_messages_per_connection = max_messages_per_connection
+        self.connections_opened = 0
+        self._idle = {}
+        self._loop = None
+
+    def _bind_loop(self):
+        # Sessions belong to the loop that opened them; a new loop starts empty.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._idle = {}
+            self._loop = loop
+
+    def is_spent(self, session: PooledSession) -> bool:
+        return session.messages_sent >= self.max_messages_per_connection
+
+    async def _is_healthy(self, session: PooledSession) -> bool:
+        if not session.is_connected or self.is_spent(session):
+            return False
+        if time.monotonic() - session.last_used < self.max_idle_seconds:
+            return True
+        try:
+            code, _ = await session.smtp.noop()
+            return code == 250
+        except Exception:
+            return False
+
+    async def acquire(self, key, connect) -> PooledSession:
+        """
+        An idle session for key that passed its health check, or a new one
+        opened with the connect coroutine function.
+        """
+        self._bind_loop()
+        idle = self._idle.setdefault(key, [])
+        while idle:
+            session = idle.pop()
+            if await self._is_healthy(session):
+                return session
+            await session.close()
+
+        session = PooledSession(await connect())
+        self.connections_opened += 1
+        return session
+
+    async def release(self, key, session: PooledSession):
+        self._bind_loop()
+        idle = self._idle.setdefault(key, [])
+        if session.is_connected and not self.is_spent(session) and len(idle) < self.size:
+            session.last_used = time.monotonic()
+            idle.append(session)
+        else:
+            await session.close()
+
+    async def close(self):
+        self._bind_loop()
+        sessions = [session for idle in self._idle.values() for session in idle]
+        self._idle = {}
+        for session in sessions:
+            await session.close()
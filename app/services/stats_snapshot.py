@@ -0,0 +1,92 @@
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import func, case, select
+from app.core.config import settings
+from app.models.auction import Auction, AuctionStatus
+from app.models.bid import Bid
+from app.models.user import User
+from app.services import sketches
+
+
+def compute_global_stats(db) -> dict:
+    row = db.query(
+        func.count(Auction.id).label("total_auctions"),
+        func.coalesce(func.sum(case((Auction.status == AuctionStatus.active, 1), else_=0)), 0).label("active_auctions"),
+        func.coalesce(func.sum(case((Auction.status == AuctionStatus.closed, 1), else_=0)), 0).label("closed_auctions"),
+        select(func.count(Bid.id)).scalar_subquery().label("total_bids"),
+        select(func.count(User.id)).scalar_subquery().label("total_users")
+    ).one()
+
+    average_bids = row.total_bids / row.total_auctions if row.total_auctions else 0
+    bidders = sketches.summary(db, sketches.GLOBAL_SCOPE, [sketches.GLOBAL_KEY])
+
+    return {
+        "total_auctions": row.total_auctions,
+        "active_auctions": int(row.active_auctions),
+        "closed_auctions": int(row.closed_auctions),
+        "total_bids": row.total_bids,
+        "total_users": row.total_users,
+        "average_bids_per_auction": round(float(average_bids), 2),
+        "distinct_bidders": bidders["distinct_bidders"],
+        "bid_gap_seconds": bidders["bid_gap_seconds"]
+    }
+
+
+class GlobalStatsSnapshot:
+    """
+    Per-process snapshot of the global counters.
+    Rebuilt on read when older than max_age, or when a local write marked it
+    dirty and at least min_refresh seconds have passed since the last rebuild.
+    """
+
+    def __init__(self, max_age_seconds: float, min_refresh_seconds: float):
+        self.max_age_seconds = max_age_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self._data = None
+        self._refreshed_at = None
+        self._refreshed_monotonic = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+    def _is_fresh(self) -> bool:
+        if self._data is None:
+            return False
+        age = time.monotonic() - self._refreshed_monotonic
+        if age >= self.max_age_seconds:
+            return False
+        return not (self._dirty and age >= self.min_refresh_seconds)
+
+    def refresh(self, db) -> dict:
+        self._dirty = False
+        data = compute_global_stats(db)
+        self._data = data
+        self._refreshed_at = datetime.utcnow()
+        self._refreshed_monotonic = time.monotonic()
+        return data
+
+    def get(self, db) -> dict:
+        with self._lock:
+            if not self._is_fresh():
+                self.refresh(db)
+            # Taken under the lock, so a concurrent invalidate() cannot clear them mid-read
+            data, refreshed_at, refreshed_monotonic = self._data, self._refreshed_at, self._refreshed_monotonic
+
+        return {
+            **data,
+            "refreshed_at": refreshed_at.isoformat(),
+            "age_seconds": round(time.monotonic() - refreshed_monotonic, 2)
+        }
+
+
+global_stats = GlobalStatsSnapshot(
+    max_age_seconds=settings.GLOBAL_STATS_MAX_AGE_SECONDS,
+    min_refresh_seconds=settings.GLOBAL_STATS_MIN_REFRESH_SECONDS
+)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from app.core.config import settings
+from app.services.rate_limiter import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_KEY = "global"
+
+
+class TelegramMessage:
+    def __init__(self, chat_id: str, text: str, reference=None):
+        self.chat_id = chat_id
+        self.text = text
+        self.reference = reference
+
+
+class TelegramSender:
+    """
+    Sends a batch of Bot API messages over one pooled HTTP client.
+    Every send takes a token from the global bucket and from the chat's own
+    bucket; a 429 reply is retried once after the advertised retry_after.
+    The buckets live as long as the sender's limiters, not one batch.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = "https://api.telegram.org",
+        concurrency: int = 10,
+        timeout: float = 10.0,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        max_retry_after: float = 5,
+        limiters: tuple = None
+    ):
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.max_retry_after = max_retry_after
+        self.limiters = limiters or (TokenBucketLimiter(global_rate), TokenBucketLimiter(chat_rate))
+
+    async def _send(self, client, limiters, message: TelegramMessage):
+        import httpx
+
+        if not message.chat_id:
+            return "User has no telegram_id"
+
+        global_limiter, chat_limiter = limiters
+        for attempt in range(2):
+            await chat_limiter.acquire(message.chat_id)
+            await global_limiter.acquire(GLOBAL_KEY)
+            try:
+                response = await client.post(
+                    f"/bot{self.token}/sendMessage",
+                    json={"chat_id": message.chat_id, "text": message.text}
+                )
+                body = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                return str(e) or e.__class__.__name__
+
+            if body.get("ok"):
+                return None
+
+            retry_after = body.get("parameters", {}).get("retry_after")
+            if response.status_code == 429 and not attempt and retry_after is not None and retry_after <= self.max_retry_after:
+                await asyncio.sleep(retry_after)
+                continue
+            return f"{body.get('error_code', response.status_code)}: {body.get('description', 'request failed')}"
+
+    async def _worker(self, queue: asyncio.Queue, client, limiters, report: dict):
+        while True:
+            try:
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            error = await self._send(client, limiters, message)
+            if error is None:
+                report["sent"].append(message.reference)
+            else:
+                logger.warning("Failed to send Telegram message to %s: %s", message.chat_id, error)
+                report["failed"].append(message.reference)
+                report["errors"][message.reference] = error
+
+    async def dispatch(self, messages) -> dict:
+        """
+        Send every message and return the same report shape as EmailDispatcher.dispatch.
+        """
+        import httpx
+
+        messages = list(messages)
+        queue = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+
+        for limiter in self.limiters:
+            limiter.prune()
+        report = {"sent": [], "failed": [], "errors": {}}
+        started = time.perf_counter()
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.api_url, timeout=self.timeout, limits=limits) as client:
+            workers = min(self.concurrency, len(messages))
+            await asyncio.gather(*(self._worker(queue, client, self.limiters, report) for _ in range(workers)))
+
+        seconds = time.perf_counter() - started
+        return {
+            **report,
+            "total": len(messages),
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(len(report["sent"]) / seconds, 1) if seconds > 0 else 0.0
+        }
+
+
+# Shared by every batch this worker process sends, so the Bot API limits
+# hold across batches rather than restarting with a full bucket each time.
+limiters = (
+    TokenBucketLimiter(settings.TELEGRAM_GLOBAL_RATE_PER_SECOND),
+    TokenBucketLimiter(settings.TELEGRAM_CHAT_RATE_PER_SECOND)
+)
+
+
+def create_telegram_sender() -> TelegramSender:
+    return TelegramSender(
+        token=settings.TELEGRAM_BOT_TOKEN,
+        api_url=settings.TELEGRAM_API_URL,
+        concurrency=settings.TELEGRAM_CONCURRENCY,
+        timeout=settings.TELEGRAM_TIMEOUT,
+        global_rate=settings.TELEGRAM_GLOBAL_RATE_PER_SECOND,
+        chat_rate=settings.TELEGRAM_CHAT_RATE_PER_SECOND,
+        limiters=limiters
+    )
@@ -0,0 +1,25 @@
+import os
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "notifications")
+
+template_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=-1
+)
+
+
+def render(name: str, **context) -> str:
+    return template_env.get_template(name).render(context)
+
+
+def render_many(name: str, shared: dict, contexts) -> list[str]:
+    """
+    Render one template per recipient context. The template is compiled once
+    and the shared context is merged into each recipient's values.
+    """
+    template = template_env.get_template(name)
+    return [template.render({**shared, **context}) for context in contexts]
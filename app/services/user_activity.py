@@ -0,0 +1,140 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, case, select
+from app.db.base import dialect_insert
+from app.models.auction import Auction, AuctionStatus
+from app.models.bid import Bid
+from app.models.user_activity import UserActivity
+
+
+def compute_activity(db, user_ids=None) -> dict:
+    """
+    Aggregate activity from bids and auctions for the given users (all users if None).
+    Two grouped queries regardless of how many users are requested.
+    """
+    bids = db.query(
+        Bid.user_id,
+        func.count(Bid.id),
+        func.count(func.distinct(Bid.auction_id))
+    )
+    wins = db.query(
+        Auction.winner_id,
+        func.count(Auction.id),
+        func.coalesce(func.sum(case((Auction.status == AuctionStatus.closed, Auction.current_price), else_=0)), 0)
+    ).filter(Auction.winner_id.isnot(None))
+
+    if user_ids is not None:
+        bids = bids.filter(Bid.user_id.in_(user_ids))
+        wins = wins.filter(Auction.winner_id.in_(user_ids))
+
+    activity = {}
+    for user_id, total_bids, participated in bids.group_by(Bid.user_id).all():
+        activity[user_id] = UserActivity(
+            user_id=user_id,
+            total_bids=total_bids,
+            auctions_participated=participated,
+            won_auctions=0,
+            total_spent=Decimal("0")
+        )
+    for user_id, won, spent in wins.group_by(Auction.winner_id).all():
+        row = activity.setdefault(user_id, UserActivity(
+            user_id=user_id, total_bids=0, auctions_participated=0
+        ))
+        row.won_auctions = won
+        row.total_spent = Decimal(str(spent))
+
+    return activity
+
+
+def empty_activity(user_id: int) -> UserActivity:
+    return UserActivity(
+        user_id=user_id, total_bids=0, won_auctions=0,
+        auctions_participated=0, total_spent=Decimal("0")
+    )
+
+
+def _aggregates(user_id: int) -> dict:
+    """
+    Scalar subqueries for the user's counters from bids and auctions, the
+    same figures compute_activity returns.
+    """
+    bids = Bid.user_id == user_id
+    wins = Auction.winner_id == user_id
+    return {
+        "total_bids": select(func.count(Bid.id)).where(bids).scalar_subquery(),
+        "auctions_participated": select(func.count(func.distinct(Bid.auction_id))).where(bids).scalar_subquery(),
+        "won_auctions": select(func.count(Auction.id)).where(wins).scalar_subquery(),
+        "total_spent": select(
+            func.coalesce(func.sum(case((Auction.status == AuctionStatus.closed, Auction.current_price), else_=0)), 0)
+        ).where(wins).scalar_subquery(),
+    }
+
+
+def _increment(db, user_id: int, values: dict):
+    """
+    Apply deltas to the user's counters in one upsert. A missing row is
+    created from the already-flushed state, which includes the change being
+    recorded; an existing one, including a row a concurrent transaction just
+    inserted, gets the deltas added.
+    """
+    now = datetime.utcnow()
+    insert = dialect_insert(db)
+    stmt = insert(UserActivity).values(user_id=user_id, updated_at=now, **_aggregates(user_id))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            **{field: getattr(UserActivity, field) + delta for field, delta in values.items()},
+            "updated_at": now
+        }
+    ))
+
+
+def record_bid(db, bid: Bid):
+    db.flush()
+    first_bid = db.query(Bid.id).filter(
+        Bid.auction_id == bid.auction_id,
+        Bid.user_id == bid.user_id,
+        Bid.id != bid.id
+    ).first() is None
+
+    _increment(db, bid.user_id, {
+        "total_bids": 1,
+        "auctions_participated": 1 if first_bid else 0
+    })
+
+
+def record_win(db, auction):
+    if auction.winner_id is None:
+        return
+    db.flush()
+    _increment(db, auction.winner_id, {
+        "won_auctions": 1,
+        "total_spent": auction.current_price
+    })
+
+
+def fill_missing(db, activity: dict, user_ids) -> dict:
+    """
+    Users without a counters row (not yet backfilled) are aggregated on the fly.
+    """
+    missing = [user_id for user_id in user_ids if activity.get(user_id) is None]
+    if missing:
+        computed = compute_activity(db, missing)
+        for user_id in missing:
+            activity[user_id] = computed.get(user_id) or empty_activity(user_id)
+    return activity
+
+
+def rebuild(db):
+    db.query(UserActivity).delete(synchronize_session=False)
+    db.add_all(compute_activity(db).values())
+    db.flush()
+
+
+def to_dict(row: UserActivity) -> dict:
+    return {
+        "total_bids": row.total_bids,
+        "won_auctions": row.won_auctions,
+        "auctions_participated": row.auctions_participated,
+        "total_spent": float(row.total_spent)
+    }
@@ -7,23 +7,33 @@ import asyncio
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[int, List[WebSocket]] = {}
-        self.user_connections: Dict[int, Dict[int, WebSocket]] = {}
+        self.user_connections: Dict[int, Dict[int, List[WebSocket]]] = {}
+        self.user_sockets: Dict[int, List[WebSocket]] = {}
 
-    async def connect(self, websocket: WebSocket, auction_id: int, user_id: int = None):
+    async def connect(self, websocket: WebSocket, auction_id: int = None, user_id: int = None):
         await websocket.accept()
 
-        if auction_id not in self.active_connections:
-            self.active_connections[auction_id] = []
-        self.active_connections[auction_id].append(websocket)
+        if auction_id is not None:
+            if auction_id not in self.active_connections:
+                self.active_connections[auction_id] = []
+            self.active_connections[auction_id].append(websocket)
 
         if user_id:
-            if auction_id not in self.user_connections:
-                self.user_connections[auction_id] = {}
-            self.user_connections[auction_id][user_id] = websocket
+            self.user_sockets.setdefault(user_id, []).append(websocket)
+            if auction_id is not None:
+                self.user_connections.setdefault(auction_id, {}).setdefault(user_id, []).append(websocket)
 
-        await self.broadcast_online_count(auction_id)
+        if auction_id is not None:
+            await self.broadcast_online_count(auction_id)
 
-    def disconnect(self, websocket: WebSocket, auction_id: int, user_id: int = None):
+    def _forget_user_socket(self, websocket: WebSocket, user_id: int):
+        sockets = self.user_sockets.get(user_id)
+        if sockets and websocket in sockets:
+            sockets.remove(websocket)
+            if not sockets:
+                del self.user_sockets[user_id]
+
+    def disconnect(self, websocket: WebSocket, auction_id: int = None, user_id: int = None):
         if auction_id in self.active_connections:
             if websocket in self.active_connections[auction_id]:
                 self.active_connections[auction_id].remove(websocket)
@@ -31,13 +41,22 @@ class ConnectionManager:
             if not self.active_connections[auction_id]:
                 del self.active_connections[auction_id]
 
-        if user_id and auction_id in self.user_connections:
-            if user_id in self.user_connections[auction_id]:
-                del self.user_connections[auction_id][user_id]
-
-            if not self.user_connections[auction_id]:
+        if auction_id in self.user_connections:
+            room = self.user_connections[auction_id]
+            for room_user_id in [user_id] if user_id else list(room):
+                sockets = room.get(room_user_id)
+                if sockets and websocket in sockets:
+                    sockets.remove(websocket)
+                    user_id = room_user_id
+                    if not sockets:
+                        del room[room_user_id]
+
+            if not room:
                 del self.user_connections[auction_id]
 
+        if user_id:
+            self._forget_user_socket(websocket, user_id)
+
     async def broadcast(self, auction_id: int, message: dict):
         if auction_id in self.active_connections:
             disconnected = []
@@ -63,6 +82,23 @@ class ConnectionManager:
         except Exception:
             pass
 
+    def is_online(self, user_id: int) -> bool:
+        return bool(self.user_sockets.get(user_id))
+
+    async def send_to_user(self, user_id: int, message: dict) -> int:
+        """
+        Send to every open socket of the user. Returns how many sockets got it;
+        0 means the caller should fall back to another channel.
+        """
+        delivered = 0
+        for websocket in list(self.user_sockets.get(user_id, [])):
+            try:
+                await websocket.send_json(message)
+                delivered += 1
+            except Exception:
+                self._forget_user_socket(websocket, user_id)
+        return delivered
+
     def get_online_users(self, auction_id: int) -> int:
         return len(self.active_connections.get(auction_id, []))
 
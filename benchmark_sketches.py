@@ -0,0 +1,102 @@
+"""
+Bid analytics sketch benchmark.
+
+Loads synthetic bids into an in-memory SQLite table and answers the same
+two questions twice: exactly with COUNT(DISTINCT user_id) and an ordered
+percentile query, and from a HyperLogLog and a quantile sketch built over
+the same rows. Reports time, relative error and sketch size:
+
+    python benchmark_sketches.py --bids 500000 --bidders 200000
+"""
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+
+
+def load_bids(count: int, bidders: int, seed: int) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE bids (user_id INTEGER NOT NULL, gap_seconds REAL NOT NULL)")
+    conn.executemany(
+        "INSERT INTO bids (user_id, gap_seconds) VALUES (?, ?)",
+        ((rng.randrange(bidders), rng.expovariate(0.1)) for _ in range(count))
+    )
+    conn.commit()
+    return conn
+
+
+def exact(conn: sqlite3.Connection, q: float) -> tuple:
+    started = time.perf_counter()
+    distinct, count = conn.execute("SELECT COUNT(DISTINCT user_id), COUNT(*) FROM bids").fetchone()
+    percentile, = conn.execute(
+        "SELECT gap_seconds FROM bids ORDER BY gap_seconds LIMIT 1 OFFSET ?", (int(q * (count - 1)),)
+    ).fetchone()
+    return distinct, percentile, time.perf_counter() - started
+
+
+def sketched(conn: sqlite3.Connection, q: float) -> tuple:
+    from app.services.sketches import HyperLogLog, QuantileSketch
+
+    started = time.perf_counter()
+    hll, gaps = HyperLogLog(), QuantileSketch()
+    for user_id, gap in conn.execute("SELECT user_id, gap_seconds FROM bids"):
+        hll.add(user_id)
+        gaps.add(gap)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    distinct, percentile = hll.count(), gaps.quantile(q)
+    query_seconds = time.perf_counter() - started
+    return distinct, percentile, build_seconds, query_seconds, len(hll.to_bytes()), len(gaps.bins)
+
+
+def run(bids: int, bidders: int, q: float, seed: int) -> dict:
+    conn = load_bids(bids, bidders, seed)
+    try:
+        exact_distinct, exact_percentile, exact_seconds = exact(conn, q)
+        distinct, percentile, build_seconds, query_seconds, hll_bytes, bins = sketched(conn, q)
+    finally:
+        conn.close()
+
+    return {
+        "bids": bids,
+        "exact": {"distinct_bidders": exact_distinct, "percentile": round(exact_percentile, 3),
+                  "query_ms": round(exact_seconds * 1000, 2)},
+        "sketch": {"distinct_bidders": distinct, "percentile": round(percentile, 3),
+                   "build_ms": round(build_seconds * 1000, 2), "query_ms": round(query_seconds * 1000, 3),
+                   "hll_bytes": hll_bytes, "quantile_bins": bins},
+        "relative_error": {"distinct_bidders": round(abs(distinct - exact_distinct) / exact_distinct, 4),
+                           "percentile": round(abs(percentile - exact_percentile) / exact_percentile, 4)},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bid sketches against exact SQL aggregates")
+    parser.add_argument("--bids", type=int, default=200_000)
+    parser.add_argument("--bidders", type=int, default=200_000)
+    parser.add_argument("--quantile", type=float, default=0.99)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run(args.bids, args.bidders, args.quantile, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        exact_result, sketch, error = report["exact"], report["sketch"], report["relative_error"]
+        print(f"{report['bids']} bids, p{args.quantile * 100:g} of gaps between bids")
+        print(f"   exact: {exact_result['distinct_bidders']} bidders, p = {exact_result['percentile']}, "
+              f"{exact_result['query_ms']} ms per query")
+        print(f"  sketch: {sketch['distinct_bidders']} bidders, p = {sketch['percentile']}, "
+              f"{sketch['query_ms']} ms per query, {sketch['build_ms']} ms to build, "
+              f"{sketch['hll_bytes']} HLL bytes, {sketch['quantile_bins']} quantile bins")
+        print(f"   error: {error['distinct_bidders']:.2%} bidders, {error['percentile']:.2%} percentile")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
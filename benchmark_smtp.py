@@ -0,0 +1,101 @@
+"""
+SMTP delivery benchmark.
+
+Sends the same messages twice: once opening a new aiosmtplib connection
+per message, and once through EmailDispatcher with its pooled sessions,
+in several batches on one event loop the way the outbox worker does.
+Both sides use the same concurrency. The default local sink runs in this
+process and answers instantly, so it mostly measures its own overhead;
+point --host/--port at a real server (TLS, latency) to see the handshakes
+the pool saves:
+
+    python benchmark_smtp.py --messages 2000 --batches 10
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+MESSAGE = "Subject: Auction ended\r\n\r\nThe auction you participated in has ended."
+
+
+async def per_message(host: str, port: int, count: int, concurrency: int) -> float:
+    import aiosmtplib
+
+    pending = iter(range(count))
+
+    async def worker():
+        for i in pending:
+            smtp = aiosmtplib.SMTP(hostname=host, port=port)
+            await smtp.connect()
+            await smtp.sendmail("noreply@auctions.com", [f"user{i}@test.com"], MESSAGE)
+            await smtp.quit()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def pooled(host: str, port: int, count: int, batches: int, concurrency: int) -> tuple:
+    from app.services.email_dispatcher import EmailDispatcher, OutgoingEmail
+
+    dispatcher = EmailDispatcher(host, port, "noreply@auctions.com", concurrency=concurrency)
+    per_batch = max(1, count // batches)
+
+    started = time.perf_counter()
+    for batch in range(batches):
+        await dispatcher.dispatch(
+            OutgoingEmail(f"user{i}@test.com", "Auction ended", "<p>Ended</p>", reference=i)
+            for i in range(batch * per_batch, (batch + 1) * per_batch)
+        )
+    seconds = time.perf_counter() - started
+    await dispatcher.pool.close()
+    return seconds, per_batch * batches, dispatcher.pool.connections_opened
+
+
+def run(host: str, port: int, count: int, batches: int, concurrency: int) -> dict:
+    single_seconds = asyncio.run(per_message(host, port, count, concurrency))
+    pooled_seconds, pooled_count, connections = asyncio.run(pooled(host, port, count, batches, concurrency))
+    return {
+        "per_message": {"messages": count, "connections": count,
+                        "messages_per_second": round(count / single_seconds, 1)},
+        "pooled": {"messages": pooled_count, "connections": connections, "batches": batches,
+                   "messages_per_second": round(pooled_count / pooled_seconds, 1)},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-message SMTP delivery")
+    parser.add_argument("--host", default=None, help="SMTP server; a local sink is started when omitted")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    sink = None
+    host, port = args.host, args.port
+    if host is None:
+        from tests.smtp_sink import SMTPSink
+        sink = SMTPSink()
+        host, port = sink.host, sink.port
+
+    try:
+        report = run(host, port, args.messages, args.batches, args.concurrency)
+    finally:
+        if sink is not None:
+            sink.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, result in report.items():
+            print(f"{name:>12}: {result['messages_per_second']:>8} msg/s over "
+                  f"{result['connections']} connections ({result['messages']} messages)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
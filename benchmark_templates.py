@@ -0,0 +1,81 @@
+"""
+Notification template rendering benchmark.
+
+Renders the same fan-out twice: once compiling the template for every
+recipient, the way an environment without a template cache would, and
+once through render_many, which compiles each template once and merges
+the shared context per recipient:
+
+    python benchmark_templates.py --recipients 5000 --template won.html
+"""
+import argparse
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+
+def per_render(name: str, shared: dict, contexts: list) -> float:
+    from jinja2 import Environment
+    from app.services.templates import template_env
+
+    uncached = Environment(
+        loader=template_env.loader,
+        autoescape=template_env.autoescape,
+        undefined=template_env.undefined,
+        cache_size=0
+    )
+
+    started = time.perf_counter()
+    for context in contexts:
+        uncached.get_template(name).render({**shared, **context})
+    return time.perf_counter() - started
+
+
+def cached_batch(name: str, shared: dict, contexts: list) -> float:
+    from app.services.templates import render_many
+
+    started = time.perf_counter()
+    render_many(name, shared, contexts)
+    return time.perf_counter() - started
+
+
+def run(name: str, recipients: int, uncached_recipients: int) -> dict:
+    shared = {"auction": SimpleNamespace(id=1, title="Vintage Watch", current_price=250, bid_step=10)}
+    contexts = [
+        {"user": SimpleNamespace(full_name=f"User {i}"), "new_bid_amount": 260}
+        for i in range(recipients)
+    ]
+    uncached_contexts = contexts[:uncached_recipients]
+
+    uncached_seconds = per_render(name, shared, uncached_contexts)
+    cached_seconds = cached_batch(name, shared, contexts)
+    return {
+        "per_render": {"renders": len(uncached_contexts),
+                       "renders_per_second": round(len(uncached_contexts) / uncached_seconds, 1)},
+        "cached_batch": {"renders": len(contexts),
+                         "renders_per_second": round(len(contexts) / cached_seconds, 1)},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cached vs per-render template compilation")
+    parser.add_argument("--template", default="auction_ended.html")
+    parser.add_argument("--recipients", type=int, default=5000)
+    parser.add_argument("--uncached-recipients", type=int, default=500,
+                        help="Recipients for the compile-per-render pass, which is much slower")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run(args.template, args.recipients, min(args.uncached_recipients, args.recipients))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, result in report.items():
+            print(f"{name:>12}: {result['renders_per_second']:>10} renders/s ({result['renders']} renders)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
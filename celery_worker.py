@@ -1,4 +1,5 @@
 from app.celery_app import celery_app
+from app.core.config import settings
 from celery.schedules import crontab
 
 celery_app.conf.beat_schedule = {
@@ -10,6 +11,34 @@ celery_app.conf.beat_schedule = {
         'task': 'activate_scheduled_auctions',
         'schedule': crontab(minute='*/1'),
     },
+    'prune-leaderboards': {
+        'task': 'prune_leaderboards',
+        'schedule': crontab(minute=5),
+    },
+    'settle-closed-auctions': {
+        'task': 'settle_closed_auctions',
+        'schedule': crontab(minute='*/5'),
+    },
+    'ensure-partitions': {
+        'task': 'ensure_partitions',
+        'schedule': crontab(minute=0, hour=2),
+    },
+    'archive-partitions': {
+        'task': 'archive_partitions',
+        'schedule': crontab(minute=30, hour=3),
+    },
+    'merge-bid-sketches': {
+        'task': 'merge_bid_sketches',
+        'schedule': settings.BID_SKETCH_MERGE_SECONDS,
+    },
+    'deliver-notifications': {
+        'task': 'deliver_notifications',
+        'schedule': settings.NOTIFICATION_OUTBOX_POLL_SECONDS,
+    },
+    'flush-outbid-digests': {
+        'task': 'flush_outbid_digests',
+        'schedule': settings.NOTIFICATION_OUTBOX_POLL_SECONDS,
+    },
 }
 
 if __name__ == '__main__':
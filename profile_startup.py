@@ -0,0 +1,114 @@
+"""
+Cold-start profiler for the API process.
+
+Imports the ASGI app in a fresh interpreter with ``-X importtime`` and
+reports the slowest imports, total import time and RSS after boot.
+Exits non-zero when a budget is exceeded, so it can guard CI:
+
+    python profile_startup.py --max-import-ms 1500 --max-rss-mb 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["numpy", "pandas", "sklearn", "scipy"]
+
+BOOT_SCRIPT = """
+import json, sys
+import app.main
+
+rss_kb = 0
+try:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+
+print(json.dumps({"rss_kb": rss_kb, "modules": sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us)
+        })
+    return entries
+
+
+def profile_startup() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App failed to boot:\n{result.stderr}")
+
+    boot = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(result.stderr)
+    top_level = [entry for entry in imports if entry["depth"] == 0]
+
+    return {
+        "total_import_ms": round(sum(e["cumulative_us"] for e in top_level) / 1000, 1),
+        "rss_mb": round(boot["rss_kb"] / 1024, 1),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in boot["modules"]],
+        "imports": imports
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile API worker cold start")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    parser.add_argument("--allow-heavy", action="store_true",
+                        help="Do not fail when numpy/pandas/sklearn are imported at boot")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = profile_startup()
+    slowest = sorted(report["imports"], key=lambda e: e["cumulative_us"], reverse=True)[:args.top]
+
+    if args.json:
+        print(json.dumps({**report, "imports": slowest}, indent=2))
+    else:
+        print(f"Total import time: {report['total_import_ms']} ms")
+        print(f"RSS after boot:    {report['rss_mb']} MB")
+        print(f"Heavy modules:     {', '.join(report['heavy_modules_loaded']) or 'none'}")
+        print()
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for entry in slowest:
+            print(f"{entry['cumulative_us'] / 1000:>14.1f} {entry['self_us'] / 1000:>9.1f}  "
+                  f"{'  ' * entry['depth']}{entry['module']}")
+
+    failures = []
+    if args.max_import_ms is not None and report["total_import_ms"] > args.max_import_ms:
+        failures.append(f"import time {report['total_import_ms']} ms > {args.max_import_ms} ms")
+    if args.max_rss_mb is not None and report["rss_mb"] > args.max_rss_mb:
+        failures.append(f"RSS {report['rss_mb']} MB > {args.max_rss_mb} MB")
+    if not args.allow_heavy and report["heavy_modules_loaded"]:
+        failures.append(f"heavy modules imported at boot: {', '.join(report['heavy_modules_loaded'])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
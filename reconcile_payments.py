@@ -0,0 +1,66 @@
+"""
+Reconcile the payments table against a payment provider statement.
+
+Streams a CSV (with header) or NDJSON statement and sort-merge joins it
+with payments by transaction_id, holding at most --chunk-size statement
+records and database rows in memory. Mismatches (missing on either side,
+amount or status differences, duplicates) are written as NDJSON:
+
+    python reconcile_payments.py statement.csv --output mismatches.ndjson --since 2026-09-01
+
+Exits non-zero when any mismatch is found.
+"""
+import argparse
+import json
+import sys
+from datetime import date, datetime, time, timedelta
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.services import reconciliation
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile payments against a provider statement")
+    parser.add_argument("statement")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None,
+                        help="Statement format; guessed from the file extension by default")
+    parser.add_argument("--output", default="-", help="Mismatch report path, '-' for stdout")
+    parser.add_argument("--chunk-size", type=int, default=settings.RECONCILIATION_CHUNK_SIZE)
+    parser.add_argument("--presorted", action="store_true",
+                        help="Statement is already ordered by transaction_id; skip the external sort")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="Only compare payments created on or after this day")
+    parser.add_argument("--until", type=date.fromisoformat, default=None,
+                        help="Only compare payments created on or before this day")
+    parser.add_argument("--id-field", default="transaction_id")
+    parser.add_argument("--amount-field", default="amount")
+    parser.add_argument("--status-field", default="status")
+    args = parser.parse_args(argv)
+
+    start = datetime.combine(args.since, time.min) if args.since else None
+    end = datetime.combine(args.until, time.min) + timedelta(days=1) if args.until else None
+    fields = {"transaction_id": args.id_field, "amount": args.amount_field, "status": args.status_field}
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    db = SessionLocal()
+    try:
+        summary = reconciliation.run(
+            db, args.statement, output,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            presorted=args.presorted,
+            start=start,
+            end=end,
+            fields=fields
+        )
+    finally:
+        db.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(summary, indent=2), file=sys.stderr if output is sys.stdout else sys.stdout)
+    return 1 if any(summary[kind] for kind in reconciliation.MISMATCH_TYPES) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,12 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.base import Base, get_db
+from app.db.base import Base, get_db, get_read_db
+from app.core.idempotency import idempotency_cache
+from app.db.replica import recent_writers
 from app.core.security import create_access_token
 from app.models.user import User, UserRole
+from tests.smtp_sink import SMTPSink
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -25,7 +28,11 @@ def db():
 
 
 @pytest.fixture(scope="function")
-def client(db):
+def client(db, monkeypatch):
+    from app.api.v1.endpoints import websocket
+    from app.core import deps
+    from app.services import closing_fanout
+
     def override_get_db():
         try:
             yield db
@@ -33,8 +40,14 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    monkeypatch.setattr(deps, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(websocket, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(closing_fanout, "SessionLocal", TestingSessionLocal)
     yield TestClient(app)
     app.dependency_overrides.clear()
+    idempotency_cache.clear()
+    recent_writers.clear()
 
 
 @pytest.fixture
@@ -95,3 +108,145 @@ def organizer_token(organizer_user):
 @pytest.fixture
 def admin_token(admin_user):
     return create_access_token(data={"sub": admin_user.email, "role": admin_user.role})
+
+
+def _create_auction(db, organizer_user, title, hours_elapsed, duration_hours, **fields):
+    from datetime import datetime, timedelta
+    from app.models.auction import Auction, AuctionStatus
+
+    start_time = datetime.utcnow() - timedelta(hours=hours_elapsed)
+    values = {
+        "starting_price": 100.00,
+        "current_price": 100.00,
+        "bid_step": 1.00,
+        "start_time": start_time,
+        "end_time": start_time + timedelta(hours=duration_hours),
+        "status": AuctionStatus.active,
+        "organizer_id": organizer_user.id,
+    }
+    values.update(fields)
+    auction = Auction(title=title, **values)
+    db.add(auction)
+    db.commit()
+    db.refresh(auction)
+    return auction
+
+
+@pytest.fixture
+def active_auction(db, organizer_user):
+    """Factory for active auctions of organizer_user; by default started an hour ago with an hour left."""
+    def create(title="Test Auction", hours_elapsed=1, duration_hours=2, **fields):
+        return _create_auction(db, organizer_user, title, hours_elapsed, duration_hours, **fields)
+
+    return create
+
+
+@pytest.fixture
+def won_auction(db, organizer_user):
+    """Factory for auctions of organizer_user that closed an hour ago with winner at price."""
+    from app.models.auction import AuctionStatus
+
+    def create(winner, price=200.00, title="Won Auction", **fields):
+        values = {"bid_step": 10.00, "commission_rate": 5.00}
+        values.update(fields)
+        return _create_auction(db, organizer_user, title, 2, 1, current_price=price,
+                               status=AuctionStatus.closed, winner_id=winner.id, **values)
+
+    return create
+
+
+@pytest.fixture
+def place_bid(client):
+    """Place a bid through the API and assert it was accepted."""
+    def place(auction_id, amount, token):
+        response = client.post(
+            f"/api/v1/auctions/{auction_id}/bids",
+            json={"auction_id": auction_id, "amount": amount},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 201
+        return response
+
+    return place
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = SMTPSink()
+    yield sink
+    sink.stop()
+
+
+class FakeTelegramAPI:
+    """Local stand-in for the Telegram Bot API sendMessage method."""
+
+    def __init__(self, token="test-token"):
+        import json
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        api = self
+        self.token = token
+        self.messages = []
+        self.connections = 0
+        self.throttle_next = 0
+        self.lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with api.lock:
+                    api.connections += 1
+
+            def reply(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path != f"/bot{api.token}/sendMessage":
+                    self.reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+                    return
+                with api.lock:
+                    throttled = api.throttle_next > 0
+                    if throttled:
+                        api.throttle_next -= 1
+                    else:
+                        api.messages.append((str(payload["chat_id"]), payload["text"], time.monotonic()))
+                if throttled:
+                    self.reply(429, {
+                        "ok": False,
+                        "error_code": 429,
+                        "description": "Too Many Requests: retry after 1",
+                        "parameters": {"retry_after": 1}
+                    })
+                else:
+                    self.reply(200, {"ok": True, "result": {"message_id": len(api.messages)}})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        host, port = self.server.server_address
+        self.url = f"http://{host}:{port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def telegram_api():
+    api = FakeTelegramAPI()
+    yield api
+    api.stop()
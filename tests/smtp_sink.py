@@ -0,0 +1,64 @@
+"""Local SMTP sink shared by the tests and benchmark_smtp.py"""
+
+
+class SMTPSink:
+    """Minimal local SMTP server that accepts and counts every message."""
+
+    def __init__(self):
+        import socketserver
+        import threading
+
+        sink = self
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                with sink.lock:
+                    sink.connections += 1
+                self.reply("220 sink ready")
+                recipients = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode().strip().upper()
+                    if command.startswith("EHLO") or command.startswith("HELO"):
+                        self.reply("250 sink")
+                    elif command.startswith("RCPT"):
+                        recipients.append(line.decode().split(":", 1)[1].strip().strip("<>"))
+                        self.reply("250 OK")
+                    elif command == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        data = []
+                        while True:
+                            chunk = self.rfile.readline()
+                            if chunk in (b".\r\n", b""):
+                                break
+                            data.append(chunk)
+                        with sink.lock:
+                            sink.messages.append((recipients, b"".join(data).decode()))
+                        recipients = []
+                        self.reply("250 OK queued")
+                    elif command == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("250 OK")
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.host, self.port = self.server.server_address
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,431 @@
+"""Test analytics endpoints"""
+from datetime import datetime, timedelta
+import numpy as np
+
+ANALYTICS_AUCTION = {"hours_elapsed": 10, "duration_hours": 24, "bid_step": 10.00}
+
+
+def _insert_bids(db, auction, user, points):
+    from app.models.bid import Bid
+
+    for hours, amount in points:
+        db.add(Bid(
+            auction_id=auction.id,
+            user_id=user.id,
+            amount=amount,
+            created_at=auction.start_time + timedelta(hours=hours)
+        ))
+    auction.current_price = points[-1][1]
+    db.commit()
+
+
+def test_price_model_matches_least_squares():
+    from app.services.price_model import fit_predict
+
+    x = np.array([0.5, 1.0, 2.0, 3.5, 4.0])
+    y = np.array([110.0, 125.0, 150.0, 170.0, 190.0])
+    slope, intercept = np.polyfit(x, y, 1)
+
+    predicted = fit_predict(len(x), x.sum(), y.sum(), (x * y).sum(), (x * x).sum(), 24.0)
+
+    assert abs(float(predicted) - (intercept + slope * 24.0)) < 1e-6
+
+
+def test_price_model_degenerate_timestamps():
+    from app.services.price_model import fit_predict
+
+    predicted = fit_predict(3, 3.0, 330.0, 330.0, 3.0, 24.0)
+
+    assert float(predicted) == 110.0
+
+
+def test_predict_price_uses_running_sums(client, db, organizer_user, participant_user, participant_token,
+                                         active_auction):
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+
+    for amount in (110.00, 120.00, 130.00):
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        )
+        assert response.status_code == 201
+
+    from app.models.price_stats import AuctionPriceStats
+    stats = db.get(AuctionPriceStats, auction.id)
+    assert stats.n == 3
+    assert stats.sum_y == 360.0
+
+    response = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/predict-price",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bid_count"] == 3
+    assert data["predicted_price"] >= 130.00
+
+
+def test_predict_price_backfills_existing_bids(client, db, organizer_user, participant_user,
+                                               participant_token, active_auction):
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [(1, 110.00), (2, 120.00), (3, 130.00), (4, 140.00)])
+
+    response = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/predict-price",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bid_count"] == 4
+    assert data["predicted_price"] == 340.00
+
+
+def test_predict_prices_batch(client, db, organizer_user, participant_user, participant_token,
+                              active_auction):
+    rising = active_auction("Rising", **ANALYTICS_AUCTION)
+    _insert_bids(db, rising, participant_user, [(1, 110.00), (2, 120.00), (3, 130.00)])
+    quiet = active_auction("Quiet", **ANALYTICS_AUCTION)
+    _insert_bids(db, quiet, participant_user, [(1, 110.00)])
+
+    response = client.get(
+        "/api/v1/analytics/predict-prices",
+        params={"auction_ids": [rising.id, quiet.id]},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    predictions = {item["auction_id"]: item for item in response.json()}
+
+    assert predictions[rising.id]["predicted_price"] == 340.00
+    assert predictions[rising.id]["bid_count"] == 3
+    assert predictions[quiet.id]["predicted_price"] == 110.00
+    assert predictions[quiet.id]["confidence"] == "low"
+
+
+def test_global_stats_single_pass(client, db, organizer_user, participant_user, participant_token,
+                                  active_auction):
+    from app.models.auction import AuctionStatus
+    from app.services.stats_snapshot import global_stats
+
+    rising = active_auction("Rising", **ANALYTICS_AUCTION)
+    _insert_bids(db, rising, participant_user, [(1, 110.00), (2, 120.00), (3, 130.00)])
+    closed = active_auction("Closed", **ANALYTICS_AUCTION)
+    closed.status = AuctionStatus.closed
+    db.commit()
+    global_stats.invalidate()
+
+    response = client.get(
+        "/api/v1/analytics/global-stats",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_auctions"] == 2
+    assert data["active_auctions"] == 1
+    assert data["closed_auctions"] == 1
+    assert data["total_bids"] == 3
+    assert data["total_users"] == 2
+    assert data["average_bids_per_auction"] == 1.5
+    assert "refreshed_at" in data
+
+
+def test_global_stats_served_from_snapshot(client, db, organizer_user, participant_user, participant_token,
+                                           active_auction):
+    from app.services.stats_snapshot import global_stats
+
+    global_stats.invalidate()
+    first = client.get(
+        "/api/v1/analytics/global-stats",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+
+    active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    cached = client.get(
+        "/api/v1/analytics/global-stats",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert cached["total_auctions"] == first["total_auctions"]
+    assert cached["refreshed_at"] == first["refreshed_at"]
+
+    global_stats.invalidate()
+    refreshed = client.get(
+        "/api/v1/analytics/global-stats",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert refreshed["total_auctions"] == first["total_auctions"] + 1
+
+
+def test_leaderboards_updated_on_bid(client, db, organizer_user, participant_user, participant_token,
+                                     active_auction):
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+
+    for amount in (110.00, 120.00):
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        )
+        assert response.status_code == 201
+
+    for window in ("hour", "all"):
+        users = client.get(
+            "/api/v1/analytics/most-active-users",
+            params={"window": window},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        ).json()
+        assert users == [{
+            "user_id": participant_user.id,
+            "email": participant_user.email,
+            "full_name": participant_user.full_name,
+            "bid_count": 2
+        }]
+
+        auctions = client.get(
+            "/api/v1/analytics/top-auctions",
+            params={"window": window},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        ).json()
+        assert auctions[0]["auction_id"] == auction.id
+        assert auctions[0]["bid_count"] == 2
+
+
+def test_leaderboard_windows_after_rebuild(client, db, organizer_user, participant_user, participant_token,
+                                           active_auction):
+    from app.models.bid import Bid
+    from app.services import leaderboards
+
+    old = active_auction("Old", hours_elapsed=24 * 30, duration_hours=24, bid_step=10.00)
+    recent = active_auction("Recent", **ANALYTICS_AUCTION)
+    now = datetime.utcnow()
+    for i in range(3):
+        db.add(Bid(auction_id=old.id, user_id=participant_user.id, amount=110 + i * 10,
+                   created_at=now - timedelta(days=20)))
+    db.add(Bid(auction_id=recent.id, user_id=participant_user.id, amount=110,
+               created_at=now - timedelta(hours=3)))
+    db.commit()
+
+    leaderboards.rebuild(db)
+    db.commit()
+
+    def top(window):
+        return client.get(
+            "/api/v1/analytics/top-auctions",
+            params={"window": window},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        ).json()
+
+    assert [a["auction_id"] for a in top("all")] == [old.id, recent.id]
+    assert [a["auction_id"] for a in top("day")] == [recent.id]
+    assert top("hour") == []
+
+    response = client.get(
+        "/api/v1/analytics/top-auctions",
+        params={"window": "month"},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 422
+
+
+def test_choose_bucket_seconds():
+    from app.services.bid_series import choose_bucket_seconds
+
+    assert choose_bucket_seconds(24 * 3600, 200) == 15 * 60
+    assert choose_bucket_seconds(60, 200) == 1
+    assert choose_bucket_seconds(10 ** 9, 10) == 7 * 86400
+
+
+def test_bid_candles(client, db, organizer_user, participant_user, participant_token, active_auction):
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [
+        (0.1, 110.00), (0.5, 150.00), (0.9, 130.00),
+        (2.2, 160.00),
+    ])
+
+    response = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/candles",
+        params={"bucket_seconds": 3600},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bucket_seconds"] == 3600
+    assert data["candles"] == [
+        {"start": auction.start_time.isoformat(), "count": 3,
+         "open": 110.0, "high": 150.0, "low": 110.0, "close": 130.0},
+        {"start": (auction.start_time + timedelta(hours=2)).isoformat(), "count": 1,
+         "open": 160.0, "high": 160.0, "low": 160.0, "close": 160.0},
+    ]
+
+    auto = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/candles",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert auto["bucket_seconds"] == 15 * 60
+    assert sum(candle["count"] for candle in auto["candles"]) == 4
+
+
+def test_bid_candles_stored_on_close(client, db, organizer_user, participant_user,
+                                     organizer_token, participant_token, active_auction):
+    from app.models.candles import AuctionCandles
+
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [(1, 110.00), (2, 120.00)])
+
+    response = client.post(
+        f"/api/v1/auctions/{auction.id}/close",
+        headers={"Authorization": f"Bearer {organizer_token}"}
+    )
+    assert response.status_code == 200
+
+    stored = db.query(AuctionCandles).filter(AuctionCandles.auction_id == auction.id).one()
+    assert stored.bucket_seconds == 15 * 60
+    assert len(stored.candles) == 2
+
+    stored.candles = [{"start": "cached", "count": 0, "open": 0, "high": 0, "low": 0, "close": 0}]
+    db.commit()
+
+    data = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/candles",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert data["candles"][0]["start"] == "cached"
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    from app.services.bid_series import lttb_indices
+
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50.0) * 100
+    y[437] = 500.0
+
+    indices = lttb_indices(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 437 in indices
+    assert np.array_equal(lttb_indices(x[:10], y[:10], 50), np.arange(10))
+
+
+def test_lttb_large_series_picks_one_point_per_bucket():
+    from app.services.bid_series import lttb_indices
+
+    x = np.arange(100_000, dtype=float)
+    y = np.cumsum(np.random.default_rng(0).random(100_000))
+    y[54_321] += 10_000.0
+
+    indices = lttb_indices(x, y, 500)
+
+    every = (100_000 - 2) / (500 - 2)
+    edges = (np.floor(np.arange(499) * every) + 1).astype(np.int64)
+    edges[-1] = 99_999
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == 99_999
+    assert np.all(indices[1:-1] >= edges[:-1]) and np.all(indices[1:-1] < edges[1:])
+    assert 54_321 in indices
+
+
+def test_bid_timeline_max_points(client, db, organizer_user, participant_user, participant_token,
+                                 active_auction):
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [(i * 0.1, 110.00 + i * 10) for i in range(20)])
+
+    full = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/bid-timeline",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert len(full["timeline"]) == 20
+
+    reduced = client.get(
+        f"/api/v1/analytics/auction/{auction.id}/bid-timeline",
+        params={"max_points": 5},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert len(reduced["timeline"]) == 5
+    assert reduced["timeline"][0] == full["timeline"][0]
+    assert reduced["timeline"][-1] == full["timeline"][-1]
+
+
+def test_user_activity_counters(client, db, organizer_user, participant_user,
+                                organizer_token, participant_token, active_auction):
+    from app.models.user_activity import UserActivity
+
+    first = active_auction("First", **ANALYTICS_AUCTION)
+    second = active_auction("Second", **ANALYTICS_AUCTION)
+    for auction, amount in ((first, 110.00), (first, 120.00), (second, 110.00)):
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {participant_token}"}
+        )
+        assert response.status_code == 201
+
+    client.post(f"/api/v1/auctions/{first.id}/close", headers={"Authorization": f"Bearer {organizer_token}"})
+
+    row = db.get(UserActivity, participant_user.id)
+    assert (row.total_bids, row.auctions_participated, row.won_auctions) == (3, 2, 1)
+
+    data = client.get(
+        f"/api/v1/analytics/user/{participant_user.id}/activity",
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert data["total_bids"] == 3
+    assert data["auctions_participated"] == 2
+    assert data["won_auctions"] == 1
+    assert data["total_spent"] == 120.00
+
+
+def test_user_activity_row_starts_from_history(client, db, organizer_user, participant_user,
+                                               participant_token, active_auction, place_bid):
+    from sqlalchemy import event
+    from app.models.user_activity import UserActivity
+
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [(1, 110.00), (2, 120.00)])
+
+    statements = []
+    engine = db.get_bind()
+
+    def capture(conn, cursor, statement, *args):
+        if "user_activity" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        place_bid(auction.id, 130.00, participant_token)
+        place_bid(auction.id, 140.00, participant_token)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    db.expire_all()
+    row = db.get(UserActivity, participant_user.id)
+    assert (row.total_bids, row.auctions_participated) == (4, 1)
+    assert len(statements) == 2
+    assert all("ON CONFLICT" in statement for statement in statements)
+
+
+def test_users_activity_bulk(client, db, organizer_user, participant_user, participant_token, active_auction):
+    from app.services import user_activity
+
+    auction = active_auction("Analytics Auction", **ANALYTICS_AUCTION)
+    _insert_bids(db, auction, participant_user, [(1, 110.00), (2, 120.00)])
+
+    response = client.get(
+        "/api/v1/analytics/users/activity",
+        params={"user_ids": [participant_user.id, organizer_user.id, 9999]},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+    assert response.status_code == 200
+    data = {item["user_id"]: item for item in response.json()}
+    assert set(data) == {participant_user.id, organizer_user.id}
+    assert data[participant_user.id]["total_bids"] == 2
+    assert data[organizer_user.id]["total_bids"] == 0
+
+    user_activity.rebuild(db)
+    db.commit()
+    rebuilt = client.get(
+        "/api/v1/analytics/users/activity",
+        params={"user_ids": [participant_user.id]},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    ).json()
+    assert rebuilt[0]["auctions_participated"] == 1
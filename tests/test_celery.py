@@ -0,0 +1,27 @@
+"""Test Celery task registration"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_beat_schedule_tasks_are_registered():
+    # A fresh interpreter, so only what the worker itself imports is registered.
+    script = "\n".join([
+        "import json",
+        "from celery_worker import celery_app",
+        "celery_app.loader.import_default_modules()",
+        "print(json.dumps({",
+        "    'scheduled': [entry['task'] for entry in celery_app.conf.beat_schedule.values()],",
+        "    'registered': sorted(celery_app.tasks),",
+        "}))",
+    ])
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["scheduled"]
+    missing = set(report["scheduled"]) - set(report["registered"])
+    assert not missing, f"Beat schedules unregistered tasks: {sorted(missing)}"
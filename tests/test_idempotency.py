@@ -0,0 +1,179 @@
+"""Test Idempotency-Key handling"""
+import asyncio
+
+
+def test_repeated_bid_replays_without_database(client, db, organizer_user, participant_token, active_auction):
+    from sqlalchemy import event
+    from app.models.bid import Bid
+
+    auction = active_auction("Retry Lot", bid_step=10.00)
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "bid-1"}
+    payload = {"auction_id": auction.id, "amount": 120}
+
+    first = client.post(f"/api/v1/auctions/{auction.id}/bids", json=payload, headers=headers)
+
+    statements = []
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        second = client.post(f"/api/v1/auctions/{auction.id}/bids", json=payload, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert statements == []
+    assert db.query(Bid).count() == 1
+
+
+def test_key_reuse_with_different_body_is_rejected(client, db, organizer_user, participant_token,
+                                                   active_auction):
+    auction = active_auction("Retry Lot", bid_step=10.00)
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "bid-2"}
+
+    client.post(f"/api/v1/auctions/{auction.id}/bids", json={"auction_id": auction.id, "amount": 120}, headers=headers)
+    response = client.post(f"/api/v1/auctions/{auction.id}/bids",
+                           json={"auction_id": auction.id, "amount": 130}, headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_keys_are_scoped_per_user(client, db, organizer_user, participant_token, admin_token, active_auction):
+    from app.models.bid import Bid
+
+    auction = active_auction("Retry Lot", bid_step=10.00)
+    for token, amount in ((participant_token, 120), (admin_token, 130)):
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {token}", "Idempotency-Key": "same-key"}
+        )
+        assert response.status_code == 201
+
+    assert db.query(Bid).count() == 2
+
+
+def test_rejected_request_releases_key_for_corrected_retry(client, db, organizer_user, participant_token,
+                                                          active_auction):
+    from app.models.bid import Bid
+
+    auction = active_auction("Retry Lot", bid_step=10.00)
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "bid-3"}
+
+    rejected = client.post(f"/api/v1/auctions/{auction.id}/bids",
+                           json={"auction_id": auction.id, "amount": 101}, headers=headers)
+    corrected = client.post(f"/api/v1/auctions/{auction.id}/bids",
+                            json={"auction_id": auction.id, "amount": 120}, headers=headers)
+    replayed = client.post(f"/api/v1/auctions/{auction.id}/bids",
+                           json={"auction_id": auction.id, "amount": 120}, headers=headers)
+
+    assert rejected.status_code == 400
+    assert "Idempotent-Replayed" not in corrected.headers
+    assert corrected.status_code == replayed.status_code == 201
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert db.query(Bid).count() == 1
+
+
+def test_repeated_payment_hold(client, db, organizer_user, participant_user, participant_token,
+                               active_auction):
+    from app.models.auction import AuctionStatus
+    from app.models.payment import Payment
+
+    auction = active_auction("Retry Lot", bid_step=10.00)
+    auction.status = AuctionStatus.closed
+    auction.winner_id = participant_user.id
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "hold-1"}
+    responses = [client.post("/api/v1/payments/hold", json={"auction_id": auction.id}, headers=headers)
+                 for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert db.query(Payment).count() == 1
+
+
+def _slow_app(calls, status_codes):
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+    from app.core.idempotency import IdempotencyMiddleware
+
+    async def hold(request):
+        calls.append(await request.json())
+        await asyncio.sleep(0.2)
+        return JSONResponse({"call": len(calls)}, status_code=status_codes[len(calls) - 1])
+
+    app = Starlette(routes=[Route("/api/v1/payments/hold", hold, methods=["POST"])])
+    app.add_middleware(IdempotencyMiddleware)
+    return app
+
+
+def test_concurrent_duplicates_wait_for_first_result(participant_token):
+    import httpx
+    from app.core.idempotency import idempotency_cache
+
+    calls = []
+    app = _slow_app(calls, [201])
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "concurrent"}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/v1/payments/hold", json={"auction_id": 1}, headers=headers) for _ in range(5)
+            ))
+
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        idempotency_cache.clear()
+
+    assert len(calls) == 1
+    assert [response.json() for response in responses] == [{"call": 1}] * 5
+
+
+def test_server_errors_are_not_stored(participant_token):
+    import httpx
+    from app.core.idempotency import idempotency_cache
+
+    calls = []
+    app = _slow_app(calls, [500, 201])
+    headers = {"Authorization": f"Bearer {participant_token}", "Idempotency-Key": "retry-after-error"}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return [await client.post("/api/v1/payments/hold", json={"auction_id": 1}, headers=headers)
+                    for _ in range(3)]
+
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        idempotency_cache.clear()
+
+    assert [response.status_code for response in responses] == [500, 201, 201]
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used_and_expired():
+    import time
+    from app.core.idempotency import IdempotencyCache, CachedResponse
+
+    async def scenario():
+        cache = IdempotencyCache(max_entries=2, ttl_seconds=0.1)
+        for key in ("a", "b"):
+            cache.complete(key, cache.begin(key, "f"), CachedResponse(201, {}, b"{}"))
+        cache.lookup("a")
+        cache.complete("c", cache.begin("c", "f"), CachedResponse(201, {}, b"{}"))
+
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+
+        time.sleep(0.15)
+        assert cache.lookup("a") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,142 @@
+"""Test the payment ledger and organizer revenue rollups"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+def _post(client, url, token, **kwargs):
+    response = client.post(url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    assert response.status_code in (200, 201), response.text
+    return response.json()
+
+
+def _revenue(client, token, url="/api/v1/payments/revenue", **params):
+    response = client.get(url, params=params, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_hold_confirm_refund_update_ledger_and_rollup(client, db, organizer_user, participant_user,
+                                                      participant_token, organizer_token, won_auction):
+    auction = won_auction(participant_user)
+    payment = _post(client, "/api/v1/payments/hold", participant_token, json={"auction_id": auction.id})
+    _post(client, f"/api/v1/payments/{payment['id']}/confirm", participant_token)
+
+    revenue = _revenue(client, organizer_token)
+    assert revenue["holds"] == 1 and revenue["payments"] == 1
+    assert Decimal(revenue["paid_amount"]) == Decimal("200.00")
+    assert Decimal(revenue["net_commission"]) == Decimal("10.00")
+    assert Decimal(revenue["payout"]) == Decimal("190.00")
+
+    _post(client, f"/api/v1/payments/{payment['id']}/refund", organizer_token)
+    revenue = _revenue(client, organizer_token)
+    assert revenue["refunds"] == 1
+    assert Decimal(revenue["net_revenue"]) == Decimal("0.00")
+    assert Decimal(revenue["payout"]) == Decimal("0.00")
+
+    response = client.get("/api/v1/payments/ledger", headers={"Authorization": f"Bearer {organizer_token}"})
+    assert [entry["event"] for entry in response.json()] == ["refund", "confirm", "hold"]
+
+
+def test_refund_of_unconfirmed_hold_is_a_release(client, db, organizer_user, participant_user,
+                                                 participant_token, organizer_token, won_auction):
+    auction = won_auction(participant_user)
+    payment = _post(client, "/api/v1/payments/hold", participant_token, json={"auction_id": auction.id})
+    _post(client, f"/api/v1/payments/{payment['id']}/refund", organizer_token)
+
+    revenue = _revenue(client, organizer_token)
+    assert revenue["releases"] == 1 and revenue["refunds"] == 0
+    assert Decimal(revenue["released_amount"]) == Decimal("200.00")
+    assert Decimal(revenue["net_revenue"]) == Decimal("0.00")
+
+
+def test_failed_hold_is_released_in_the_ledger(client, db, organizer_user, participant_user,
+                                               participant_token, organizer_token, won_auction):
+    from app.models.ledger import LedgerEntry, LedgerEvent
+    from app.models.payment import Payment, PaymentStatus
+    from app.services.payment_service import payment_service
+
+    auction = won_auction(participant_user)
+    payment = _post(client, "/api/v1/payments/hold", participant_token, json={"auction_id": auction.id})
+    failed = payment_service.simulate_payment_failure(db, payment["id"])
+    db.commit()
+
+    assert failed.status == PaymentStatus.failed
+    assert [entry.event for entry in db.query(LedgerEntry).order_by(LedgerEntry.id)] == [
+        LedgerEvent.hold, LedgerEvent.release
+    ]
+    revenue = _revenue(client, organizer_token)
+    assert revenue["releases"] == 1
+    assert Decimal(revenue["released_amount"]) == Decimal("200.00")
+
+    pending = Payment(auction_id=auction.id, user_id=participant_user.id, amount=200, commission=10,
+                      total_amount=210, status=PaymentStatus.pending)
+    db.add(pending)
+    db.commit()
+    assert payment_service.simulate_payment_failure(db, pending.id).status == PaymentStatus.failed
+    assert db.query(LedgerEntry).count() == 2
+
+
+def test_settlement_rolls_up_per_organizer_day(db, organizer_user, participant_user, won_auction):
+    from app.models.ledger import LedgerEntry, OrganizerDailyRevenue
+    from app.services import settlement, ledger
+
+    for price in (100.00, 300.00):
+        won_auction(participant_user, price)
+    settlement.settle(db)
+
+    assert db.query(LedgerEntry).count() == 2
+    rollup = db.query(OrganizerDailyRevenue).one()
+    assert rollup.organizer_id == organizer_user.id
+    assert rollup.day == ledger.day_bucket(datetime.utcnow())
+    assert rollup.holds == 2
+    assert rollup.held_amount == Decimal("400.00")
+
+
+def test_revenue_is_one_indexed_read(client, db, organizer_user, participant_user, organizer_token):
+    from sqlalchemy import event
+    from app.models.ledger import OrganizerDailyRevenue
+    from app.services import ledger
+
+    today = ledger.day_bucket(datetime.utcnow())
+    db.add_all([
+        OrganizerDailyRevenue(organizer_id=organizer_user.id, day=today - timedelta(days=40),
+                              payments=1, paid_amount=Decimal("50.00"), paid_commission=Decimal("2.50")),
+        OrganizerDailyRevenue(organizer_id=organizer_user.id, day=today,
+                              payments=2, paid_amount=Decimal("80.00"), paid_commission=Decimal("4.00")),
+    ])
+    db.commit()
+
+    statements = []
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        if "organizer_daily_revenue" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        month = _revenue(client, organizer_token)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert month["payments"] == 2
+    assert Decimal(month["paid_amount"]) == Decimal("80.00")
+    assert len(statements) == 1
+
+    start = (today - timedelta(days=40)).date().isoformat()
+    assert _revenue(client, organizer_token, start=start)["payments"] == 3
+    daily = _revenue(client, organizer_token, "/api/v1/payments/revenue/daily", start=start)
+    assert [row["payments"] for row in daily] == [1, 2]
+
+
+def test_revenue_access(client, organizer_user, participant_token, organizer_token, admin_token):
+    headers = {"Authorization": f"Bearer {participant_token}"}
+    assert client.get("/api/v1/payments/revenue", headers=headers).status_code == 403
+
+    response = client.get("/api/v1/payments/revenue", params={"organizer_id": organizer_user.id + 100},
+                          headers={"Authorization": f"Bearer {organizer_token}"})
+    assert response.status_code == 403
+
+    revenue = _revenue(client, admin_token, organizer_id=organizer_user.id)
+    assert revenue["organizer_id"] == organizer_user.id
+    assert revenue["payments"] == 0
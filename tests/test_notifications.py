@@ -0,0 +1,455 @@
+"""Test notification delivery"""
+
+
+def _dispatcher(smtp_sink, **kwargs):
+    from app.services.email_dispatcher import EmailDispatcher
+    return EmailDispatcher(smtp_sink.host, smtp_sink.port, "noreply@auctions.com", **kwargs)
+
+
+def test_dispatcher_sends_batch_concurrently(smtp_sink):
+    import asyncio
+    from app.services.email_dispatcher import OutgoingEmail
+
+    emails = [OutgoingEmail(f"user{i}@test.com", "Auction ended", "<p>Ended</p>", reference=i) for i in range(200)]
+    report = asyncio.run(_dispatcher(smtp_sink, concurrency=8).dispatch(emails))
+
+    assert sorted(report["sent"]) == list(range(200))
+    assert report["failed"] == []
+    assert len(smtp_sink.messages) == 200
+    assert smtp_sink.connections <= 8
+
+
+def _emails(count, offset=0):
+    from app.services.email_dispatcher import OutgoingEmail
+    return [OutgoingEmail(f"user{i}@test.com", "Hi", "<p>Hi</p>", reference=offset + i) for i in range(count)]
+
+
+def test_pool_reuses_sessions_across_batches(smtp_sink):
+    import asyncio
+
+    dispatcher = _dispatcher(smtp_sink, concurrency=2)
+
+    async def scenario():
+        for batch in range(3):
+            await dispatcher.dispatch(_emails(10, offset=batch * 10))
+        await dispatcher.pool.close()
+
+    asyncio.run(scenario())
+
+    assert len(smtp_sink.messages) == 30
+    assert smtp_sink.connections <= 2
+    assert dispatcher.pool.connections_opened == smtp_sink.connections
+
+
+def test_pool_checks_idle_sessions_and_replaces_dead_ones(smtp_sink):
+    import asyncio
+    from app.services.smtp_pool import SMTPSessionPool
+
+    pool = SMTPSessionPool(max_idle_seconds=0)
+    dispatcher = _dispatcher(smtp_sink, concurrency=1, pool=pool)
+
+    async def scenario():
+        await dispatcher.dispatch(_emails(1))
+        [session] = pool._idle[dispatcher.pool_key]
+        noop = session.smtp.noop
+        calls = []
+
+        async def counting_noop():
+            calls.append(1)
+            return await noop()
+
+        session.smtp.noop = counting_noop
+        await dispatcher.dispatch(_emails(1, offset=1))
+        assert calls == [1]
+
+        pool._idle[dispatcher.pool_key][0].smtp.close()
+        report = await dispatcher.dispatch(_emails(1, offset=2))
+        assert report["sent"] == [2]
+        await pool.close()
+
+    asyncio.run(scenario())
+
+    assert len(smtp_sink.messages) == 3
+    assert smtp_sink.connections == 2
+
+
+def test_pool_recycles_after_message_cap(smtp_sink):
+    import asyncio
+    from app.services.smtp_pool import SMTPSessionPool
+
+    pool = SMTPSessionPool(max_messages_per_connection=3)
+    report = asyncio.run(_dispatcher(smtp_sink, concurrency=1, pool=pool).dispatch(_emails(7)))
+
+    assert sorted(report["sent"]) == list(range(7))
+    assert smtp_sink.connections == 3
+
+
+def test_dispatcher_throttles_per_domain(smtp_sink):
+    import asyncio
+    from app.services.email_dispatcher import OutgoingEmail
+
+    emails = [OutgoingEmail(f"user{i}@slow.com", "Hi", "<p>Hi</p>", reference=i) for i in range(15)]
+    emails += [OutgoingEmail(f"user{i}@fast.com", "Hi", "<p>Hi</p>", reference=100 + i) for i in range(15)]
+    dispatcher = _dispatcher(smtp_sink, concurrency=4, domain_rates={"slow.com": 10})
+
+    report = asyncio.run(dispatcher.dispatch(emails))
+
+    assert len(report["sent"]) == 30
+    assert report["seconds"] >= 0.45
+
+
+def test_limiter_allows_rates_below_one_per_second():
+    import asyncio
+    import time
+    from app.services.rate_limiter import TokenBucketLimiter
+
+    limiter = TokenBucketLimiter(0.5)
+    started = time.monotonic()
+    asyncio.run(asyncio.wait_for(limiter.acquire("x"), timeout=1))
+    assert time.monotonic() - started < 1
+
+    burst = TokenBucketLimiter(100, burst=0)
+    assert burst.capacity(100) == 1.0
+    assert burst.capacity(0.5) == 1.0
+
+
+def test_dispatcher_keeps_domain_limits_across_batches(smtp_sink):
+    import asyncio
+    from app.services.email_dispatcher import OutgoingEmail
+
+    dispatcher = _dispatcher(smtp_sink, domain_rates={"slow.com": 2})
+    seconds = 0
+    for batch in range(2):
+        emails = [OutgoingEmail(f"user{i}@slow.com", "Hi", "<p>Hi</p>", reference=(batch, i)) for i in range(2)]
+        seconds += asyncio.run(dispatcher.dispatch(emails))["seconds"]
+
+    assert len(smtp_sink.messages) == 4
+    assert seconds >= 0.9
+
+
+def _use_sink(monkeypatch, smtp_sink):
+    from app.core.config import settings
+    from app.services import notification_tasks
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "SMTP_SERVER", smtp_sink.host)
+    monkeypatch.setattr(settings, "SMTP_PORT", smtp_sink.port)
+    monkeypatch.setattr(notification_tasks, "SessionLocal", TestingSessionLocal)
+
+
+def test_outbox_bulk_insert_and_delivery(db, participant_user, admin_user, smtp_sink, monkeypatch):
+    from app.models.notification import Notification, NotificationType, NotificationChannel
+    from app.services import notification_tasks
+    from app.services.notification_service import NotificationService
+
+    _use_sink(monkeypatch, smtp_sink)
+
+    inserted = NotificationService().create_notifications(db, [
+        {
+            "user_id": user.id,
+            "notification_type": NotificationType.auction_ended,
+            "channel": NotificationChannel.email,
+            "subject": "Auction ended",
+            "message": "<p>Ended</p>"
+        } for user in (participant_user, admin_user) * 3
+    ])
+    db.commit()
+
+    assert inserted == 6
+    assert db.query(Notification).filter(Notification.sent == False).count() == 6
+
+    notification_tasks.deliver_notifications(batch_size=4)
+
+    db.expire_all()
+    assert db.query(Notification).filter(Notification.sent == False).count() == 0
+    assert len(smtp_sink.messages) == 6
+    assert smtp_sink.connections <= 4
+
+    notification_tasks.deliver_notifications()
+    assert len(smtp_sink.messages) == 6
+
+
+def _closed_port():
+    import socket
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_outbox_keeps_failed_rows_pending(db, participant_user, monkeypatch):
+    from datetime import datetime
+    from app.core.config import settings
+    from app.models.notification import Notification, NotificationType, NotificationChannel
+    from app.services import notification_tasks
+    from app.services.notification_service import NotificationService
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", _closed_port())
+    monkeypatch.setattr(notification_tasks, "SessionLocal", TestingSessionLocal)
+
+    NotificationService().create_notification(
+        db, participant_user.id, NotificationType.outbid, NotificationChannel.email, "Outbid", "<p>Outbid</p>"
+    )
+    db.commit()
+
+    assert notification_tasks.deliver_notifications() == "Sent 0 notifications, 1 failed"
+    assert notification_tasks.deliver_notifications() == "Sent 0 notifications, 0 failed"
+
+    db.expire_all()
+    notification = db.query(Notification).one()
+    assert notification.sent is False
+    assert notification.attempts == 1
+    assert notification.next_attempt_at > datetime.utcnow()
+    assert "Connect call failed" in notification.last_error
+
+
+def test_notification_service_writes_pending_rows_in_caller_transaction(db, participant_user, organizer_user):
+    from datetime import datetime, timedelta
+    from app.models.auction import Auction, AuctionStatus
+    from app.models.notification import Notification
+    from app.services.notification_service import NotificationService
+
+    auction = Auction(
+        title="Notify Auction",
+        starting_price=100.00,
+        current_price=150.00,
+        bid_step=10.00,
+        start_time=datetime.utcnow() - timedelta(hours=1),
+        end_time=datetime.utcnow() + timedelta(hours=1),
+        status=AuctionStatus.active,
+        organizer_id=organizer_user.id
+    )
+    db.add(auction)
+    db.commit()
+
+    NotificationService().send_outbid_notification(db, participant_user, auction, 150)
+    db.rollback()
+    assert db.query(Notification).count() == 0
+
+    notification = NotificationService().send_outbid_notification(db, participant_user, auction, 150)
+    db.commit()
+    assert notification.id is not None
+    assert notification.sent is False
+
+
+def test_auction_ended_fan_out_bulk_inserts(db, participant_user, admin_user, organizer_user):
+    from datetime import datetime, timedelta
+    from app.models.auction import Auction, AuctionStatus
+    from app.models.notification import Notification, NotificationType
+    from app.services.notification_service import NotificationService
+
+    auction = Auction(
+        title="Fan-out <Auction>",
+        starting_price=100.00,
+        current_price=150.00,
+        bid_step=10.00,
+        start_time=datetime.utcnow() - timedelta(hours=2),
+        end_time=datetime.utcnow() - timedelta(hours=1),
+        status=AuctionStatus.closed,
+        organizer_id=organizer_user.id
+    )
+    db.add(auction)
+    db.commit()
+
+    count = NotificationService().send_auction_ended_notifications(db, [participant_user, admin_user], auction)
+    db.commit()
+
+    rows = db.query(Notification).order_by(Notification.user_id).all()
+    assert count == 2
+    assert {row.user_id for row in rows} == {participant_user.id, admin_user.id}
+    assert all(row.notification_type == NotificationType.auction_ended for row in rows)
+    assert all("Fan-out &lt;Auction&gt;" in row.message for row in rows)
+
+
+def test_bidding_war_coalesces_outbids(client, db, organizer_user, participant_user, admin_user,
+                                       participant_token, admin_token, active_auction, place_bid):
+    from datetime import datetime, timedelta
+    from app.models.notification import Notification
+    from app.models.outbid import PendingOutbid
+    from app.services import outbid_coalescer
+
+    auction = active_auction("Bidding War")
+    for i in range(10):
+        place_bid(auction.id, 110 + i, participant_token if i % 2 == 0 else admin_token)
+
+    held = {row.user_id: row for row in db.query(PendingOutbid).all()}
+    assert held[participant_user.id].outbid_count == 5
+    assert held[admin_user.id].outbid_count == 4
+    assert db.query(Notification).count() == 0
+
+    assert outbid_coalescer.flush(db) == 0
+
+    queued = outbid_coalescer.flush(db, now=datetime.utcnow() + timedelta(minutes=5))
+    db.commit()
+
+    notifications = db.query(Notification).all()
+    assert queued == 1
+    assert [n.user_id for n in notifications] == [participant_user.id]
+    assert "$119" in notifications[0].message
+    assert db.query(PendingOutbid).count() == 0
+
+
+def test_outbids_merge_into_one_digest_per_user(client, db, organizer_user, participant_user, admin_user,
+                                                participant_token, admin_token, active_auction, place_bid):
+    from datetime import datetime, timedelta
+    from app.models.notification import Notification
+    from app.services import outbid_coalescer
+
+    auctions = [active_auction(f"Lot {i}") for i in range(3)]
+    for auction in auctions:
+        place_bid(auction.id, 110, participant_token)
+        place_bid(auction.id, 120, admin_token)
+
+    outbid_coalescer.flush(db, now=datetime.utcnow() + timedelta(minutes=5))
+    db.commit()
+
+    notification = db.query(Notification).one()
+    assert notification.user_id == participant_user.id
+    assert notification.subject == "You've been outbid on 3 auctions"
+    assert all(f"Lot {i}" in notification.message for i in range(3))
+
+
+def test_close_auction_fans_out_notifications(client, db, organizer_user, participant_user, admin_user,
+                                              organizer_token, participant_token, admin_token,
+                                              active_auction, place_bid):
+    from app.models.notification import Notification, NotificationType
+
+    auction = active_auction("Closing Lot")
+    place_bid(auction.id, 110, participant_token)
+    place_bid(auction.id, 120, admin_token)
+    place_bid(auction.id, 130, participant_token)
+
+    response = client.post(
+        f"/api/v1/auctions/{auction.id}/close",
+        headers={"Authorization": f"Bearer {organizer_token}"}
+    )
+    assert response.status_code == 200
+
+    sent = {(n.user_id, n.notification_type) for n in db.query(Notification).all()}
+    assert sent == {
+        (participant_user.id, NotificationType.won),
+        (participant_user.id, NotificationType.payment_required),
+        (admin_user.id, NotificationType.auction_ended),
+    }
+
+
+def test_closing_fan_out_uses_one_participant_query(db, organizer_user, participant_user, active_auction):
+    from datetime import datetime
+    from sqlalchemy import event, insert
+    from app.models.bid import Bid
+    from app.models.notification import Notification
+    from app.models.user import User, UserRole
+    from app.services import closing_fanout
+
+    auctions = [active_auction(f"Lot {i}") for i in range(3)]
+    db.execute(insert(User), [
+        {"email": f"bidder{i}@test.com", "hashed_password": "x", "role": UserRole.participant, "full_name": f"Bidder {i}"}
+        for i in range(600)
+    ])
+    user_ids = [user_id for (user_id,) in db.query(User.id).filter(User.email.like("bidder%")).all()]
+    db.execute(insert(Bid), [
+        {"auction_id": auction.id, "user_id": user_id, "amount": 100 + n, "created_at": datetime.utcnow()}
+        for n, user_id in enumerate(user_ids) for auction in auctions
+    ])
+    for auction in auctions:
+        auction.winner_id = user_ids[-1]
+    db.commit()
+    for auction in auctions:
+        db.refresh(auction)
+
+    selects = []
+    engine = db.get_bind()
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        queued = closing_fanout.queue_notifications(db, auctions, chunk_size=250)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
+    db.commit()
+
+    assert queued == 3 * 601
+    assert db.query(Notification).count() == 3 * 601
+    assert len(selects) == 1
+
+
+def test_close_expired_auctions_task_queues_notifications(db, organizer_user, participant_user, monkeypatch,
+                                                          active_auction):
+    from datetime import datetime, timedelta
+    from app.models.bid import Bid
+    from app.models.notification import Notification, NotificationType
+    from app.services import auction_tasks
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(auction_tasks, "SessionLocal", TestingSessionLocal)
+    auction = active_auction("Expired Lot")
+    auction.end_time = datetime.utcnow() - timedelta(minutes=1)
+    db.add(Bid(auction_id=auction.id, user_id=participant_user.id, amount=110))
+    db.commit()
+
+    assert auction_tasks.close_expired_auctions() == "Closed 1 auctions, queued 2 notifications"
+
+    types = {n.notification_type for n in db.query(Notification).filter(Notification.user_id == participant_user.id)}
+    assert types == {NotificationType.won, NotificationType.payment_required}
+
+
+def test_retries_back_off_then_dead_letter(db, participant_user, monkeypatch):
+    from datetime import datetime, timedelta
+    from app.core.config import settings
+    from app.models.notification import Notification, NotificationType, NotificationChannel
+    from app.services import notification_tasks
+    from app.services.notification_service import NotificationService
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", _closed_port())
+    monkeypatch.setattr(settings, "NOTIFICATION_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(notification_tasks, "SessionLocal", TestingSessionLocal)
+
+    NotificationService().create_notification(
+        db, participant_user.id, NotificationType.won, NotificationChannel.email, "Won", "<p>Won</p>"
+    )
+    db.commit()
+
+    delays = []
+    for _ in range(3):
+        before = datetime.utcnow()
+        notification_tasks.deliver_notifications()
+        db.expire_all()
+        notification = db.query(Notification).one()
+        if notification.next_attempt_at:
+            delays.append(round((notification.next_attempt_at - before).total_seconds() / 30))
+            notification.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+            db.commit()
+
+    assert delays == [1, 2]
+    assert notification.attempts == 3
+    assert notification.dead_lettered_at is not None
+    assert notification.next_attempt_at is None
+    assert notification_tasks.deliver_notifications() == "Sent 0 notifications, 0 failed"
+
+
+def test_idempotency_key_prevents_duplicates(db, participant_user, organizer_user, smtp_sink, monkeypatch,
+                                             active_auction):
+    from app.models.notification import Notification, NotificationType
+    from app.services import notification_tasks
+    from app.services.notification_service import NotificationService
+
+    _use_sink(monkeypatch, smtp_sink)
+    auction = active_auction("Idempotent Lot")
+    service = NotificationService()
+
+    assert service.queue_bulk(db, NotificationType.auction_ended, auction, [participant_user]) == 1
+    assert service.queue_bulk(db, NotificationType.auction_ended, auction, [participant_user]) == 0
+    db.commit()
+
+    notification = db.query(Notification).one()
+    notification_tasks.deliver_notifications()
+
+    assert len(smtp_sink.messages) == 1
+    assert f"Message-ID: <{notification.idempotency_key}@auctions.com>" in smtp_sink.messages[0][1]
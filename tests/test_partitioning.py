@@ -0,0 +1,122 @@
+"""Test monthly partitioning of bids and event_logs"""
+import csv
+import gzip
+from datetime import datetime, timedelta
+
+
+def test_postgres_ddl_is_partitioned():
+    from sqlalchemy.dialects import postgresql, sqlite
+    from sqlalchemy.schema import CreateTable
+    from app.models.bid import Bid
+    from app.models.event_log import EventLog
+
+    for table in (Bid.__table__, EventLog.__table__):
+        ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert "PARTITION BY RANGE (created_at)" in ddl
+        assert "PRIMARY KEY (id, created_at)" in ddl
+
+        ddl = str(CreateTable(table).compile(dialect=sqlite.dialect()))
+        assert "PARTITION" not in ddl
+        assert "PRIMARY KEY (id)" in ddl
+
+    assert [column.name for column in Bid.__mapper__.primary_key] == ["id"]
+
+
+def test_partition_names_and_bounds():
+    from app.db.partitioning import add_months, month_start, partition_ddl, partition_month
+
+    month = month_start(datetime(2026, 12, 17, 13, 5))
+    assert month == datetime(2026, 12, 1)
+    assert add_months(month, 1) == datetime(2027, 1, 1)
+    assert add_months(month, -12) == datetime(2025, 12, 1)
+
+    assert partition_ddl("bids", month) == (
+        "CREATE TABLE IF NOT EXISTS bids_2026_12 PARTITION OF bids "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+    assert partition_month("bids", "bids_2026_12") == month
+    assert partition_month("bids", "bids_default") is None
+    assert partition_month("bids", "event_logs_2026_12") is None
+
+
+def test_default_partition_rows_move_to_a_monthly_partition():
+    from app.db.partitioning import split_default_ddl
+
+    assert split_default_ddl("bids", "created_at", datetime(2025, 11, 1)) == [
+        "LOCK TABLE bids_default IN SHARE MODE",
+        "CREATE TABLE bids_2025_11 (LIKE bids INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        "WITH moved AS (DELETE FROM bids_default "
+        "WHERE created_at >= '2025-11-01' AND created_at < '2025-12-01' RETURNING *) "
+        "INSERT INTO bids_2025_11 SELECT * FROM moved",
+        "ALTER TABLE bids ATTACH PARTITION bids_2025_11 FOR VALUES FROM ('2025-11-01') TO ('2025-12-01')",
+    ]
+
+
+def test_expired_partitions_keep_retention_window():
+    from app.db.partitioning import expired_partitions
+
+    names = ["event_logs_2026_01", "event_logs_2026_03", "event_logs_2026_04",
+             "event_logs_2026_10", "event_logs_default", "bids_2020_01"]
+
+    expired = expired_partitions("event_logs", names, retention_months=6, now=datetime(2026, 10, 19))
+    assert expired == ["event_logs_2026_01", "event_logs_2026_03"]
+
+
+def test_export_table_writes_compressed_csv(db, organizer_user, participant_user, tmp_path):
+    from app.db.partitioning import export_table
+    from app.models.auction import Auction, AuctionStatus
+    from app.models.bid import Bid
+
+    auction = Auction(
+        title="Archived Lot",
+        starting_price=100.00,
+        current_price=120.00,
+        bid_step=10.00,
+        start_time=datetime.utcnow() - timedelta(days=2),
+        end_time=datetime.utcnow() - timedelta(days=1),
+        status=AuctionStatus.closed,
+        organizer_id=organizer_user.id
+    )
+    db.add(auction)
+    db.flush()
+    db.add_all([Bid(auction_id=auction.id, user_id=participant_user.id, amount=110 + i * 10) for i in range(3)])
+    db.commit()
+
+    path = tmp_path / "archive" / "bids_2026_10.csv.gz"
+    with db.get_bind().connect() as connection:
+        assert export_table(connection, "bids", str(path), chunk_size=2) == 3
+
+    with gzip.open(path, "rt", newline="") as archive:
+        rows = list(csv.reader(archive))
+    assert rows[0] == ["id", "auction_id", "user_id", "amount", "created_at"]
+    assert [row[3] for row in rows[1:]] == ["110", "120", "130"]
+    assert not (tmp_path / "archive" / "bids_2026_10.csv.gz.partial").exists()
+
+
+def test_partition_tasks_are_noops_outside_postgres(db, monkeypatch):
+    from app.services import partition_tasks
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(partition_tasks, "SessionLocal", TestingSessionLocal)
+
+    assert partition_tasks.ensure_partitions() == "Created 0 partitions"
+    assert partition_tasks.archive_partitions() == "Archived 0 partitions (0 rows)"
+
+
+def test_event_logs_since_filter(client, db, admin_token):
+    from app.models.event_log import EventLog
+
+    now = datetime.utcnow()
+    db.add_all([
+        EventLog(event_type="old_event", created_at=now - timedelta(days=90)),
+        EventLog(event_type="recent_event", created_at=now - timedelta(hours=1)),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/api/v1/event-logs",
+        params={"since": (now - timedelta(days=7)).isoformat()},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert [log["event_type"] for log in response.json()] == ["recent_event"]
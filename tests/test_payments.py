@@ -0,0 +1,192 @@
+"""Test payment state transitions"""
+
+
+def _hold(client, auction, token):
+    response = client.post(
+        "/api/v1/payments/hold",
+        json={"auction_id": auction.id},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_transition_table():
+    from app.models.payment import PaymentStatus, allowed_sources
+
+    assert allowed_sources(PaymentStatus.held) == [PaymentStatus.pending]
+    assert allowed_sources(PaymentStatus.paid) == [PaymentStatus.held]
+    assert set(allowed_sources(PaymentStatus.refunded)) == {PaymentStatus.held, PaymentStatus.paid}
+    assert set(allowed_sources(PaymentStatus.failed)) == {PaymentStatus.pending, PaymentStatus.held}
+
+
+def test_concurrent_hold_rejected_by_active_payment_index(client, db, organizer_user, participant_user,
+                                                          admin_user, participant_token, won_auction):
+    from app.models.payment import Payment, PaymentStatus
+
+    auction = won_auction(participant_user)
+    db.add(Payment(auction_id=auction.id, user_id=admin_user.id, amount=200, commission=10,
+                   total_amount=210, status=PaymentStatus.held))
+    db.commit()
+
+    response = client.post(
+        "/api/v1/payments/hold",
+        json={"auction_id": auction.id},
+        headers={"Authorization": f"Bearer {participant_token}"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Active payment already exists for this auction"
+    assert db.query(Payment).count() == 1
+
+
+def test_hold_confirm_refund_flow(client, db, organizer_user, participant_user, participant_token,
+                                  organizer_token, won_auction):
+    from app.models.payment import Payment
+
+    auction = won_auction(participant_user)
+    payment = _hold(client, auction, participant_token)
+    assert payment["status"] == "held"
+    assert float(payment["commission"]) == 10.0
+
+    response = client.post(f"/api/v1/payments/{payment['id']}/confirm",
+                           headers={"Authorization": f"Bearer {participant_token}"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "paid"
+
+    response = client.post(f"/api/v1/payments/{payment['id']}/refund",
+                           headers={"Authorization": f"Bearer {organizer_token}"})
+    assert response.status_code == 200
+    assert response.json()["status"] == "refunded"
+
+    db.expire_all()
+    metadata = db.query(Payment).one().payment_metadata
+    assert metadata["card_last4"] == "4242"
+    assert metadata["confirmed"] is True
+    assert metadata["refunded"] is True
+
+
+def test_repeated_confirm_is_rejected(client, db, organizer_user, participant_user, participant_token,
+                                      won_auction):
+    auction = won_auction(participant_user)
+    payment = _hold(client, auction, participant_token)
+    headers = {"Authorization": f"Bearer {participant_token}"}
+
+    first = client.post(f"/api/v1/payments/{payment['id']}/confirm", headers=headers)
+    second = client.post(f"/api/v1/payments/{payment['id']}/confirm", headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Cannot confirm payment in current status"
+
+
+def test_transition_errors(client, db, organizer_user, participant_user, participant_token, admin_token,
+                           won_auction):
+    auction = won_auction(participant_user)
+    payment = _hold(client, auction, participant_token)
+
+    response = client.post(f"/api/v1/payments/{payment['id']}/confirm",
+                           headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 403
+
+    response = client.post(f"/api/v1/payments/{payment['id']}/refund",
+                           headers={"Authorization": f"Bearer {participant_token}"})
+    assert response.status_code == 403
+
+    response = client.post("/api/v1/payments/9999/confirm",
+                           headers={"Authorization": f"Bearer {participant_token}"})
+    assert response.status_code == 404
+
+
+def test_transition_is_one_statement(db, organizer_user, participant_user, won_auction):
+    from sqlalchemy import event
+    from app.models.payment import PaymentStatus
+    from app.services.payment_service import payment_service
+
+    auction = won_auction(participant_user)
+    payment = payment_service.create_payment_hold(auction.id, participant_user.id, auction.current_price)
+    db.add(payment)
+    db.commit()
+    payment_id, organizer_id = payment.id, organizer_user.id
+
+    statements = []
+    engine = db.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        refunded = payment_service.refund_payment(db, payment_id, organizer_id=organizer_id)
+        repeated = payment_service.refund_payment(db, payment_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    payment_statements = [statement for statement in statements if "payments." in statement]
+    assert refunded.status == PaymentStatus.refunded
+    assert repeated is None
+    assert len(payment_statements) == 2
+    assert all(statement.lstrip().startswith("UPDATE") and "RETURNING" in statement for statement in payment_statements)
+
+
+def _closed_auctions(won_auction, winner, count):
+    return [won_auction(winner, 100.00 + i, f"Lot {i}").id for i in range(count)]
+
+
+def test_settlement_creates_holds_in_chunks(db, organizer_user, participant_user, won_auction):
+    from decimal import Decimal
+    from app.models.payment import Payment, PaymentStatus
+    from app.services import settlement
+    from app.services.payment_service import payment_service
+
+    auction_ids = _closed_auctions(won_auction, participant_user, 5)
+    db.add(payment_service.create_payment_hold(auction_ids[0], participant_user.id, Decimal("100.00")))
+    db.commit()
+
+    report = settlement.settle(db, chunk_size=2)
+    assert report == {"holds_created": 4, "chunks": 2}
+
+    payments = {payment.auction_id: payment for payment in db.query(Payment).all()}
+    assert sorted(payments) == auction_ids
+    assert all(payment.status == PaymentStatus.held for payment in payments.values())
+    last = payments[auction_ids[-1]]
+    assert last.amount == Decimal("104.00")
+    assert last.commission == Decimal("5.20")
+    assert last.total_amount == Decimal("109.20")
+
+    assert settlement.settle(db, chunk_size=2) == {"holds_created": 0, "chunks": 0}
+    assert db.query(Payment).count() == 5
+
+
+def test_settlement_replaces_failed_payment(db, organizer_user, participant_user, won_auction):
+    from decimal import Decimal
+    from app.models.payment import Payment, PaymentStatus
+    from app.services import settlement
+    from app.services.payment_service import payment_service
+
+    auction_ids = _closed_auctions(won_auction, participant_user, 1)
+    failed = payment_service.create_payment_hold(auction_ids[0], participant_user.id, Decimal("100.00"))
+    failed.status = PaymentStatus.failed
+    db.add(failed)
+    db.commit()
+
+    assert settlement.settle(db)["holds_created"] == 1
+    held = db.query(Payment).filter(Payment.status == PaymentStatus.held).one()
+    assert payment_service.create_payment_holds(db, [(auction_ids[0], participant_user.id, Decimal("1.00"), Decimal("0"))]) == 0
+
+    payment_service.refund_payment(db, held.id)
+    db.commit()
+    assert settlement.settle(db)["holds_created"] == 0
+    assert db.query(Payment).count() == 2
+
+
+def test_settle_closed_auctions_task(db, organizer_user, participant_user, monkeypatch, won_auction):
+    from app.models.payment import Payment
+    from app.services import payment_tasks
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(payment_tasks, "SessionLocal", TestingSessionLocal)
+    _closed_auctions(won_auction, participant_user, 3)
+
+    assert payment_tasks.settle_closed_auctions(chunk_size=2) == "Created 3 payment holds in 2 chunks"
+    assert db.query(Payment).count() == 3
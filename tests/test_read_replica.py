@@ -0,0 +1,151 @@
+"""Test read-replica routing with two SQLite files"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def replica(tmp_path, client, monkeypatch):
+    """
+    A second SQLite file standing in for the replica. Reads go through the
+    real get_read_db, so the primary is the test database and the replica
+    only has what the test copies into it.
+    """
+    from app.db import base
+    from app.db.base import Base, get_read_db
+    from app.main import app
+    from tests.conftest import TestingSessionLocal
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    ReplicaSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    monkeypatch.setattr(base, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(base, "ReplicaSessionLocal", ReplicaSession)
+    monkeypatch.setattr(base, "replica_engine", engine)
+    app.dependency_overrides.pop(get_read_db)
+
+    session = ReplicaSession()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _auction(organizer_id: int, **kwargs):
+    from app.models.auction import Auction, AuctionStatus
+
+    return Auction(**{
+        "id": 1,
+        "title": "Replicated Lot",
+        "starting_price": 100.00,
+        "current_price": 100.00,
+        "bid_step": 10.00,
+        "start_time": datetime.utcnow() - timedelta(hours=1),
+        "end_time": datetime.utcnow() + timedelta(hours=1),
+        "status": AuctionStatus.active,
+        "organizer_id": organizer_id,
+        **kwargs
+    })
+
+
+def _copy_users(replica, *users):
+    from app.models.user import User
+
+    for user in users:
+        replica.add(User(id=user.id, email=user.email, hashed_password=user.hashed_password,
+                         role=user.role, full_name=user.full_name))
+    replica.commit()
+
+
+def test_reads_go_to_replica(client, db, replica, organizer_user):
+    db.add(_auction(organizer_user.id, category="primary-only"))
+    db.commit()
+    _copy_users(replica, organizer_user)
+    replica.add(_auction(organizer_user.id, category="stale"))
+    replica.commit()
+
+    assert client.get("/api/v1/auctions/1").json()["category"] == "stale"
+    assert [c["name"] for c in client.get("/api/v1/categories/").json()] == ["stale"]
+    assert client.get("/api/v1/auctions/1/bids").status_code == 200
+
+
+def test_bidder_reads_own_write_from_primary(client, db, replica, organizer_user, participant_user,
+                                             participant_token):
+    from app.db.replica import recent_writers
+
+    db.add(_auction(organizer_user.id))
+    db.commit()
+    _copy_users(replica, organizer_user, participant_user)
+    replica.add(_auction(organizer_user.id))
+    replica.commit()
+
+    headers = {"Authorization": f"Bearer {participant_token}"}
+    response = client.post("/api/v1/auctions/1/bids", json={"auction_id": 1, "amount": 150.00}, headers=headers)
+    assert response.status_code == 201
+
+    assert float(client.get("/api/v1/auctions/1", headers=headers).json()["current_price"]) == 150.0
+    assert len(client.get("/api/v1/auctions/1/bids", headers=headers).json()) == 1
+
+    client.cookies.clear()
+    assert float(client.get("/api/v1/auctions/1").json()["current_price"]) == 100.0
+
+    recent_writers.clear()
+    assert float(client.get("/api/v1/auctions/1", headers=headers).json()["current_price"]) == 100.0
+
+
+def test_read_primary_cookie_covers_other_workers(client, db, replica, organizer_user, participant_user,
+                                                  participant_token):
+    from app.db.replica import READ_PRIMARY_COOKIE, recent_writers
+
+    db.add(_auction(organizer_user.id))
+    db.commit()
+    _copy_users(replica, organizer_user, participant_user)
+    replica.add(_auction(organizer_user.id))
+    replica.commit()
+
+    headers = {"Authorization": f"Bearer {participant_token}"}
+    response = client.post("/api/v1/auctions/1/bids", json={"auction_id": 1, "amount": 150.00}, headers=headers)
+    assert READ_PRIMARY_COOKIE in response.cookies
+
+    recent_writers.clear()
+    assert float(client.get("/api/v1/auctions/1").json()["current_price"]) == 150.0
+
+
+def test_failed_write_and_disabled_guard_keep_replica(client, db, replica, organizer_user, participant_user,
+                                                      participant_token, monkeypatch):
+    from app.core.config import settings
+    from app.db.replica import READ_PRIMARY_COOKIE
+
+    db.add(_auction(organizer_user.id))
+    db.commit()
+    _copy_users(replica, organizer_user, participant_user)
+    replica.add(_auction(organizer_user.id))
+    replica.commit()
+
+    headers = {"Authorization": f"Bearer {participant_token}"}
+    response = client.post("/api/v1/auctions/1/bids", json={"auction_id": 1, "amount": 101.00}, headers=headers)
+    assert response.status_code == 400
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+    monkeypatch.setattr(settings, "REPLICA_READ_YOUR_WRITES_SECONDS", 0)
+    response = client.post("/api/v1/auctions/1/bids", json={"auction_id": 1, "amount": 150.00}, headers=headers)
+    assert response.status_code == 201
+    assert float(client.get("/api/v1/auctions/1", headers=headers).json()["current_price"]) == 100.0
+
+
+def test_recent_writers_expire_and_stay_bounded():
+    import time
+    from app.db.replica import RecentWriters
+
+    writers = RecentWriters(max_entries=2)
+    writers.mark("a@test.com", 0.05)
+    writers.mark("b@test.com", 10)
+    writers.mark("c@test.com", 10)
+
+    assert not writers.is_recent("a@test.com")
+    assert writers.is_recent("b@test.com") and writers.is_recent("c@test.com")
+
+    writers.mark("d@test.com", 0.05)
+    time.sleep(0.06)
+    assert not writers.is_recent("d@test.com")
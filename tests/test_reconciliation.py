@@ -0,0 +1,148 @@
+"""Test streaming payment reconciliation"""
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+def _payments(db, organizer_user, participant_user, specs):
+    """
+    Create one closed auction and payment per (transaction_id, total, status).
+    """
+    from app.models.auction import Auction, AuctionStatus
+    from app.models.payment import PaymentStatus
+    from app.services.payment_service import payment_service
+
+    for transaction_id, total, status in specs:
+        auction = Auction(
+            title=f"Lot {transaction_id}",
+            starting_price=10.00,
+            current_price=total,
+            bid_step=1.00,
+            start_time=datetime.utcnow() - timedelta(hours=2),
+            end_time=datetime.utcnow() - timedelta(hours=1),
+            status=AuctionStatus.closed,
+            organizer_id=organizer_user.id,
+            winner_id=participant_user.id
+        )
+        db.add(auction)
+        db.flush()
+        payment = payment_service.create_payment_hold(auction.id, participant_user.id, Decimal(total))
+        payment.transaction_id = transaction_id
+        payment.status = PaymentStatus(status)
+        db.add(payment)
+    db.commit()
+
+
+SPECS = [
+    ("txn_a", "100.00", "paid"),
+    ("txn_b", "50.00", "held"),
+    ("txn_c", "75.00", "paid"),
+    ("txn_d", "20.00", "refunded"),
+]
+
+CSV_STATEMENT = "\n".join([
+    "transaction_id,amount,status",
+    "txn_e,10.00,captured",
+    "txn_c,75.00,refunded",
+    "txn_a,100.00,succeeded",
+    "txn_b,55.00,authorized",
+    "txn_a,100.00,succeeded",
+]) + "\n"
+
+
+def _by_type(lines):
+    mismatches = [json.loads(line) for line in lines if line.strip()]
+    return sorted((m["type"], m["transaction_id"]) for m in mismatches)
+
+
+EXPECTED = [
+    ("amount_differs", "txn_b"),
+    ("duplicate_in_statement", "txn_a"),
+    ("missing_in_db", "txn_e"),
+    ("missing_in_statement", "txn_d"),
+    ("status_differs", "txn_c"),
+]
+
+
+def test_reconcile_csv_statement(db, organizer_user, participant_user, tmp_path):
+    import io
+    from app.services import reconciliation
+
+    _payments(db, organizer_user, participant_user, SPECS)
+    path = tmp_path / "statement.csv"
+    path.write_text(CSV_STATEMENT)
+
+    output = io.StringIO()
+    summary = reconciliation.run(db, str(path), output)
+
+    assert _by_type(output.getvalue().splitlines()) == EXPECTED
+    assert summary["statement_records"] == 5
+    assert summary["payments"] == 4
+    assert summary["matched"] == 1
+
+    amount = next(json.loads(line) for line in output.getvalue().splitlines() if "amount_differs" in line)
+    assert amount["statement_amount"] == "55.00"
+    assert amount["payment_amount"] == "50.00"
+    assert amount["statement_line"] == 5
+
+
+def test_external_sort_spills_runs(tmp_path):
+    import random
+    from app.services import reconciliation
+
+    records = [(f"txn_{i:05d}", "1.00", "paid", i) for i in range(1000)]
+    shuffled = records[:]
+    random.Random(7).shuffle(shuffled)
+
+    assert list(reconciliation.external_sort(iter(shuffled), chunk_size=64)) == records
+    assert list(reconciliation.external_sort(iter(shuffled[:10]), chunk_size=64)) == sorted(shuffled[:10])
+
+
+def test_reconcile_ndjson_in_small_chunks(db, organizer_user, participant_user, tmp_path):
+    import io
+    from app.services import reconciliation
+
+    _payments(db, organizer_user, participant_user, SPECS)
+    lines = CSV_STATEMENT.splitlines()[1:]
+    path = tmp_path / "statement.ndjson"
+    path.write_text("".join(
+        json.dumps({"id": txn, "total": amount, "state": status}) + "\n"
+        for txn, amount, status in (line.split(",") for line in lines)
+    ))
+
+    output = io.StringIO()
+    reconciliation.run(db, str(path), output, chunk_size=2,
+                       fields={"transaction_id": "id", "amount": "total", "status": "state"})
+
+    assert _by_type(output.getvalue().splitlines()) == EXPECTED
+
+
+def test_presorted_statement_must_be_ordered(db, tmp_path):
+    import io
+    import pytest
+    from app.services import reconciliation
+
+    path = tmp_path / "statement.csv"
+    path.write_text("transaction_id,amount,status\ntxn_b,1.00,paid\ntxn_a,1.00,paid\n")
+
+    with pytest.raises(ValueError, match="line 3"):
+        reconciliation.run(db, str(path), io.StringIO(), presorted=True)
+
+
+def test_reconcile_command(db, organizer_user, participant_user, tmp_path, monkeypatch, capsys):
+    import reconcile_payments
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(reconcile_payments, "SessionLocal", TestingSessionLocal)
+    _payments(db, organizer_user, participant_user, SPECS[:1])
+    statement = tmp_path / "statement.csv"
+    output = tmp_path / "mismatches.ndjson"
+
+    statement.write_text("transaction_id,amount,status\ntxn_a,100.00,captured\n")
+    assert reconcile_payments.main([str(statement), "--output", str(output)]) == 0
+    assert output.read_text() == ""
+    assert json.loads(capsys.readouterr().out)["matched"] == 1
+
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).date().isoformat()
+    assert reconcile_payments.main([str(statement), "--output", str(output), "--since", tomorrow]) == 1
+    assert _by_type(output.read_text().splitlines()) == [("missing_in_db", "txn_a")]
@@ -0,0 +1,158 @@
+"""Test approximate analytics sketches"""
+from datetime import datetime
+import numpy as np
+
+
+def test_hyperloglog_accuracy():
+    from app.services.sketches import HyperLogLog
+
+    hll = HyperLogLog()
+    for user_id in range(100_000):
+        hll.add(user_id)
+
+    assert abs(hll.count() - 100_000) / 100_000 < 0.05
+
+
+def test_hyperloglog_small_counts_are_exact_enough():
+    from app.services.sketches import HyperLogLog
+
+    hll = HyperLogLog()
+    for user_id in [1, 2, 3, 2, 1]:
+        hll.add(user_id)
+
+    assert hll.count() == 3
+
+
+def test_hyperloglog_merge_is_union():
+    from app.services.sketches import HyperLogLog
+
+    left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for user_id in range(0, 30_000):
+        left.add(user_id)
+        union.add(user_id)
+    for user_id in range(20_000, 50_000):
+        right.add(user_id)
+        union.add(user_id)
+
+    merged = HyperLogLog.from_bytes(left.to_bytes())
+    merged.merge(right)
+
+    assert merged.registers == union.registers
+    assert abs(merged.count() - 50_000) / 50_000 < 0.05
+
+
+def test_quantile_sketch_relative_accuracy():
+    from app.services.sketches import QuantileSketch
+
+    gaps = np.random.default_rng(42).exponential(scale=30.0, size=50_000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for gap in gaps:
+        sketch.add(float(gap))
+
+    for q in (0.5, 0.9, 0.99):
+        exact = np.quantile(gaps, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) / exact <= 0.02
+
+
+def test_quantile_sketch_merge_and_roundtrip():
+    from app.services.sketches import QuantileSketch
+
+    values = np.random.default_rng(7).lognormal(mean=2.0, sigma=1.0, size=10_000)
+    left, right, whole = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(float(value))
+        whole.add(float(value))
+    left.add(0.0)
+    whole.add(0.0)
+
+    merged = QuantileSketch.from_dict(left.to_dict())
+    merged.merge(right)
+
+    assert merged.count == whole.count
+    for q in (0.0, 0.5, 0.99):
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+def test_sketch_accuracy_against_exact():
+    from app.services.sketches import HyperLogLog, QuantileSketch
+
+    rng = np.random.default_rng(1)
+    bidders = rng.integers(0, 200_000, size=200_000)
+    gaps = rng.exponential(scale=10.0, size=200_000)
+
+    exact_distinct = len(set(bidders.tolist()))
+    exact_p99 = float(np.quantile(gaps, 0.99, method="lower"))
+
+    hll, quantiles = HyperLogLog(), QuantileSketch()
+    for bidder, gap in zip(bidders.tolist(), gaps.tolist()):
+        hll.add(bidder)
+        quantiles.add(gap)
+
+    assert abs(hll.count() - exact_distinct) / exact_distinct < 0.05
+    assert abs(quantiles.quantile(0.99) - exact_p99) / exact_p99 <= 0.02
+    assert len(hll.to_bytes()) <= 4097
+    assert len(quantiles.bins) < 2000
+
+
+def test_bid_sketch_merged_from_staged_bids(client, db, organizer_user, participant_user, admin_user,
+                                            participant_token, admin_token, active_auction):
+    from app.models.sketch import BidSketch, PendingBidSketch
+    from app.services import sketches
+
+    auction = active_auction("Sketch Auction", category="art")
+
+    for amount, token in ((110, participant_token), (120, admin_token), (130, participant_token)):
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 201
+
+    assert db.query(BidSketch).count() == 0
+    assert db.query(PendingBidSketch).count() == 3
+
+    assert sketches.merge_pending(db, batch_size=2) == 2
+    assert sketches.merge_pending(db, batch_size=2) == 1
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {participant_token}"}
+    today = datetime.utcnow().date().isoformat()
+
+    for params in ({"auction_id": auction.id}, {"category": "art"}, {"start_date": today}, {}):
+        data = client.get("/api/v1/analytics/bid-sketch", params=params, headers=headers).json()
+        assert data["bid_count"] == 3
+        assert data["distinct_bidders"] == 2
+        assert data["bid_gap_seconds"]["p50"] is not None
+
+    activity = client.get(f"/api/v1/analytics/user/{participant_user.id}/activity", headers=headers).json()
+    assert activity["bid_gap_seconds"]["p50"] is not None
+    assert db.query(PendingBidSketch).count() == 0
+
+
+def test_bid_sketch_rebuild_matches_incremental(client, db, organizer_user, participant_user,
+                                                admin_user, participant_token, admin_token, active_auction):
+    from app.models.sketch import BidSketch
+    from app.services import sketches
+
+    auction = active_auction("Sketch Auction", category="art")
+    for amount, token in ((110, participant_token), (120, admin_token)):
+        client.post(
+            f"/api/v1/auctions/{auction.id}/bids",
+            json={"auction_id": auction.id, "amount": amount},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    sketches.merge_pending(db, batch_size=100)
+    db.commit()
+
+    def snapshot():
+        return {
+            (row.scope, row.key, row.shard): (row.distinct_hll, row.bid_count)
+            for row in db.query(BidSketch).all()
+        }
+
+    incremental = snapshot()
+    sketches.rebuild(db)
+    db.commit()
+
+    assert snapshot() == incremental
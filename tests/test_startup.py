@@ -0,0 +1,38 @@
+"""Test API cold-start footprint"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_importtime():
+    from profile_startup import parse_importtime
+
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   app.core",
+        "import time:      3000 |       3120 | app.main",
+    ])
+
+    entries = parse_importtime(stderr)
+
+    assert entries == [
+        {"module": "app.core", "depth": 1, "self_us": 120, "cumulative_us": 120},
+        {"module": "app.main", "depth": 0, "self_us": 3000, "cumulative_us": 3120},
+    ]
+
+
+def test_app_boot_does_not_import_heavy_modules():
+    from profile_startup import HEAVY_MODULES
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print(' '.join(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT
+    )
+    assert result.returncode == 0, result.stderr
+
+    loaded = set(result.stdout.split())
+    assert not loaded.intersection(HEAVY_MODULES)
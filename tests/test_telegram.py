@@ -0,0 +1,139 @@
+"""Test Telegram notification delivery"""
+import asyncio
+import time
+
+
+def _sender(telegram_api, **kwargs):
+    from app.services.telegram import TelegramSender
+    return TelegramSender(telegram_api.token, api_url=telegram_api.url, **kwargs)
+
+
+def test_sender_reuses_pooled_connections(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    messages = [TelegramMessage(f"chat-{i}", f"Message {i}", reference=i) for i in range(60)]
+    report = asyncio.run(_sender(telegram_api, concurrency=4, global_rate=0, chat_rate=0).dispatch(messages))
+
+    assert sorted(report["sent"]) == list(range(60))
+    assert len(telegram_api.messages) == 60
+    assert telegram_api.connections <= 4
+
+
+def test_sender_respects_per_chat_rate(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    messages = [TelegramMessage("chat-1", f"Message {i}", reference=i) for i in range(4)]
+    messages += [TelegramMessage("chat-2", "Other chat", reference=10)]
+    report = asyncio.run(_sender(telegram_api, chat_rate=2).dispatch(messages))
+
+    times = [at for chat_id, _, at in telegram_api.messages if chat_id == "chat-1"]
+    assert len(report["sent"]) == 5
+    assert times[-1] - times[0] >= 0.9
+
+
+def test_sender_respects_global_rate(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    messages = [TelegramMessage(f"chat-{i}", "Hi", reference=i) for i in range(25)]
+    report = asyncio.run(_sender(telegram_api, global_rate=10, chat_rate=0).dispatch(messages))
+
+    assert len(report["sent"]) == 25
+    assert report["seconds"] >= 1.4
+
+
+def test_sender_keeps_rate_limits_across_batches(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    sender = _sender(telegram_api, chat_rate=2)
+    for i in range(2):
+        asyncio.run(sender.dispatch([TelegramMessage("chat-1", f"Batch {i}", reference=(i, n)) for n in range(2)]))
+
+    times = [at for _, _, at in telegram_api.messages]
+    assert len(times) == 4
+    assert times[-1] - times[0] >= 0.9
+
+
+def test_sender_handles_group_chat_rate(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    sender = _sender(telegram_api, chat_rate=20 / 60)
+    report = asyncio.run(asyncio.wait_for(
+        sender.dispatch([TelegramMessage("group-1", "Hi", reference=1)]), timeout=2
+    ))
+
+    assert report["sent"] == [1]
+    assert len(telegram_api.messages) == 1
+
+
+def test_limiter_prunes_refilled_buckets():
+    from app.services.rate_limiter import TokenBucketLimiter
+
+    limiter = TokenBucketLimiter(1000, {"slow": 1})
+    asyncio.run(limiter.acquire("fast"))
+    asyncio.run(limiter.acquire("slow"))
+    time.sleep(0.01)
+    limiter.prune()
+
+    assert list(limiter._buckets) == ["slow"]
+
+
+def test_sender_retries_after_429(telegram_api):
+    from app.services.telegram import TelegramMessage
+
+    telegram_api.throttle_next = 1
+    report = asyncio.run(_sender(telegram_api).dispatch([TelegramMessage("chat-1", "Hi", reference=1)]))
+
+    assert report["sent"] == [1]
+    assert report["seconds"] >= 1
+
+
+def test_sender_reports_api_errors(telegram_api):
+    from app.services.telegram import TelegramSender, TelegramMessage
+
+    sender = TelegramSender("wrong-token", api_url=telegram_api.url)
+    report = asyncio.run(sender.dispatch([
+        TelegramMessage("chat-1", "Hi", reference=1),
+        TelegramMessage(None, "Hi", reference=2)
+    ]))
+
+    assert sorted(report["failed"]) == [1, 2]
+    assert report["errors"][1] == "404: Not Found"
+    assert report["errors"][2] == "User has no telegram_id"
+
+
+def test_outbid_alerts_routed_to_telegram(client, db, organizer_user, participant_user, admin_user,
+                                          participant_token, admin_token, telegram_api, smtp_sink,
+                                          monkeypatch, active_auction, place_bid):
+    from datetime import datetime, timedelta
+    from app.core.config import settings
+    from app.models.notification import Notification, NotificationChannel
+    from app.services import notification_tasks, outbid_coalescer
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(settings, "OUTBID_NOTIFICATION_CHANNEL", "telegram")
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", telegram_api.token)
+    monkeypatch.setattr(settings, "TELEGRAM_API_URL", telegram_api.url)
+    monkeypatch.setattr(settings, "SMTP_SERVER", smtp_sink.host)
+    monkeypatch.setattr(settings, "SMTP_PORT", smtp_sink.port)
+    monkeypatch.setattr(notification_tasks, "SessionLocal", TestingSessionLocal)
+
+    participant_user.telegram_id = "555"
+    db.commit()
+
+    auction = active_auction("Telegram Lot")
+    place_bid(auction.id, 110, participant_token)
+    place_bid(auction.id, 120, admin_token)
+    place_bid(auction.id, 130, participant_token)
+    place_bid(auction.id, 140, admin_token)
+
+    outbid_coalescer.flush(db, now=datetime.utcnow() + timedelta(minutes=5))
+    db.commit()
+
+    notification = db.query(Notification).one()
+    assert notification.channel == NotificationChannel.telegram
+
+    assert notification_tasks.deliver_notifications() == "Sent 1 notifications, 0 failed"
+    assert telegram_api.messages[0][0] == "555"
+    assert "Telegram Lot" in telegram_api.messages[0][1]
+    assert "$140" in telegram_api.messages[0][1]
+    assert smtp_sink.messages == []
@@ -0,0 +1,61 @@
+"""Test notification templates"""
+from types import SimpleNamespace
+
+
+def _auction(title="Vintage Watch"):
+    return SimpleNamespace(id=1, title=title, current_price=250, bid_step=10)
+
+
+def test_render_outbid_template():
+    from app.services.templates import render
+
+    html = render("outbid.html", auction=_auction(), new_bid_amount=150,
+                  user=SimpleNamespace(full_name="Jane Doe"))
+
+    assert "<h2>You've been outbid!</h2>" in html
+    assert "Hi Jane Doe," in html
+    assert "$150" in html
+    assert "$160" in html
+
+
+def test_render_autoescapes_user_content():
+    from app.services.templates import render
+
+    html = render("auction_ended.html", auction=_auction("<script>alert(1)</script>"))
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+
+
+def test_render_many_merges_shared_context():
+    from app.services.templates import render_many
+
+    users = [SimpleNamespace(full_name=f"User {i}") for i in range(3)]
+    bodies = render_many("won.html", {"auction": _auction()}, [{"user": user} for user in users])
+
+    assert len(bodies) == 3
+    for i, body in enumerate(bodies):
+        assert f"Hi User {i}," in body
+        assert "$250" in body
+
+
+def test_fan_out_compiles_each_template_once(monkeypatch):
+    from app.services.templates import template_env, render, render_many
+
+    loads = []
+    get_source = template_env.loader.get_source
+
+    def counting_get_source(environment, name):
+        loads.append(name)
+        return get_source(environment, name)
+
+    monkeypatch.setattr(template_env.loader, "get_source", counting_get_source)
+    template_env.cache.clear()
+
+    contexts = [{"user": SimpleNamespace(full_name=f"User {i}")} for i in range(5000)]
+    bodies = render_many("auction_ended.html", {"auction": _auction()}, contexts)
+    render("auction_ended.html", auction=_auction(), user=contexts[0]["user"])
+
+    assert len(bodies) == 5000
+    assert "Hi User 4999," in bodies[-1]
+    assert sorted(loads) == ["auction_ended.html", "base.html"]
@@ -0,0 +1,229 @@
+"""Test personal WebSocket delivery"""
+import asyncio
+
+
+class FakeSocket:
+    def __init__(self, broken=False):
+        self.sent = []
+        self.broken = broken
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.broken:
+            raise RuntimeError("socket closed")
+        self.sent.append(message)
+
+
+def test_manager_tracks_every_socket_per_user():
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    first, second, personal, other = FakeSocket(), FakeSocket(), FakeSocket(), FakeSocket()
+
+    async def scenario():
+        await manager.connect(first, auction_id=1, user_id=7)
+        await manager.connect(second, auction_id=1, user_id=7)
+        await manager.connect(personal, user_id=7)
+        await manager.connect(other, auction_id=1, user_id=8)
+
+        assert len(manager.user_connections[1][7]) == 2
+        assert await manager.send_to_user(7, {"type": "outbid"}) == 3
+
+        manager.disconnect(first, 1, 7)
+        assert await manager.send_to_user(7, {"type": "won"}) == 2
+
+        manager.disconnect(second, 1)
+        manager.disconnect(personal, user_id=7)
+        assert not manager.is_online(7)
+        assert await manager.send_to_user(7, {"type": "won"}) == 0
+        assert manager.is_online(8)
+
+    asyncio.run(scenario())
+
+    assert [message["type"] for message in personal.sent] == ["outbid", "won"]
+    assert {"type": "outbid"} not in other.sent
+
+
+def test_manager_drops_broken_sockets():
+    from app.services.websocket_manager import ConnectionManager
+
+    manager = ConnectionManager()
+    broken, healthy = FakeSocket(broken=True), FakeSocket()
+
+    async def scenario():
+        await manager.connect(broken, user_id=7)
+        await manager.connect(healthy, user_id=7)
+        assert await manager.send_to_user(7, {"type": "outbid"}) == 1
+        assert manager.user_sockets[7] == [healthy]
+
+    asyncio.run(scenario())
+
+
+def test_online_user_gets_outbid_over_websocket(client, db, organizer_user, participant_user, admin_user,
+                                                participant_token, admin_token, active_auction, place_bid):
+    from app.models.outbid import PendingOutbid
+
+    auction = active_auction("Live Lot")
+
+    with client.websocket_connect(f"/api/v1/ws/notifications?token={participant_token}") as ws:
+        assert ws.receive_json()["type"] == "connected"
+
+        place_bid(auction.id, 110, participant_token)
+        place_bid(auction.id, 120, admin_token)
+
+        event = ws.receive_json()
+        assert event["type"] == "outbid"
+        assert event["data"] == {
+            "auction_id": auction.id,
+            "title": "Live Lot",
+            "current_price": "120.00",
+            "next_minimum_bid": "121.00"
+        }
+
+        place_bid(auction.id, 130, participant_token)
+
+    held = db.query(PendingOutbid).all()
+    assert [(row.user_id, row.auction_id) for row in held] == [(admin_user.id, auction.id)]
+
+
+def test_online_winner_gets_won_over_websocket(client, db, organizer_user, participant_user,
+                                               organizer_token, participant_token, active_auction, place_bid):
+    from app.models.notification import Notification, NotificationChannel, NotificationType
+
+    auction = active_auction("Won Live")
+    place_bid(auction.id, 110, participant_token)
+
+    with client.websocket_connect(f"/api/v1/ws/notifications?token={participant_token}") as ws:
+        ws.receive_json()
+        response = client.post(
+            f"/api/v1/auctions/{auction.id}/close",
+            headers={"Authorization": f"Bearer {organizer_token}"}
+        )
+        assert response.status_code == 200
+
+        event = ws.receive_json()
+        assert event["type"] == "won"
+        assert event["data"]["auction_id"] == auction.id
+
+    rows = {(n.notification_type, n.channel, n.sent) for n in db.query(Notification).all()}
+    assert rows == {
+        (NotificationType.won, NotificationChannel.websocket, True),
+        (NotificationType.payment_required, NotificationChannel.email, False),
+    }
+
+
+def test_close_publishes_events_and_keeps_won_email_for_offline_winner(client, db, organizer_user,
+                                                                      participant_user, organizer_token,
+                                                                      participant_token, active_auction,
+                                                                      place_bid, monkeypatch):
+    from app.core.config import settings
+    from app.models.notification import Notification, NotificationChannel, NotificationType
+    from app.services import event_bus
+
+    published = []
+    monkeypatch.setattr(settings, "EVENTS_REDIS_URL", "redis://events")
+    monkeypatch.setattr(event_bus, "publish", published.extend)
+    auction = active_auction("Offline Winner")
+    place_bid(auction.id, 110, participant_token)
+
+    response = client.post(
+        f"/api/v1/auctions/{auction.id}/close",
+        headers={"Authorization": f"Bearer {organizer_token}"}
+    )
+    assert response.status_code == 200
+
+    assert [(message["target"], message["id"], message["event"]["type"]) for message in published] == [
+        ("auction", auction.id, "auction_closed"),
+        ("user", participant_user.id, "won"),
+    ]
+    won = db.query(Notification).filter(Notification.notification_type == NotificationType.won).one()
+    assert (won.channel, won.sent) == (NotificationChannel.email, False)
+
+
+def test_won_push_does_not_mark_an_email_already_sent(client, db, organizer_user, participant_user,
+                                                       active_auction):
+    from app.models.notification import Notification, NotificationChannel, NotificationType
+    from app.services import closing_fanout
+
+    auction = active_auction("Already Sent")
+    auction.winner_id = participant_user.id
+    closing_fanout.notification_service.queue_bulk(db, NotificationType.won, auction, [participant_user])
+    db.commit()
+    assert closing_fanout.record_won_push(auction.id, participant_user.id) is True
+
+    db.query(Notification).update({Notification.channel: NotificationChannel.email})
+    db.commit()
+    assert closing_fanout.record_won_push(auction.id, participant_user.id) is False
+
+    won = db.query(Notification).one()
+    assert (won.channel, won.sent) == (NotificationChannel.email, True)
+
+
+def test_notifications_socket_requires_token(client):
+    from starlette.websockets import WebSocketDisconnect
+    import pytest
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/api/v1/ws/notifications") as ws:
+            ws.receive_json()
+
+    assert exc.value.code == 4001
+
+
+def test_expiry_task_publishes_socket_events(db, organizer_user, participant_user, monkeypatch,
+                                             active_auction):
+    from datetime import datetime, timedelta
+    from app.models.bid import Bid
+    from app.services import auction_tasks, event_bus
+    from tests.conftest import TestingSessionLocal
+
+    published = []
+    monkeypatch.setattr(auction_tasks, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(event_bus, "publish", published.extend)
+    auction = active_auction("Expired Live")
+    auction.end_time = datetime.utcnow() - timedelta(minutes=1)
+    db.add(Bid(auction_id=auction.id, user_id=participant_user.id, amount=110))
+    db.commit()
+
+    auction_tasks.close_expired_auctions()
+
+    assert [(message["target"], message["id"], message["event"]["type"]) for message in published] == [
+        ("auction", auction.id, "auction_closed"),
+        ("user", participant_user.id, "won"),
+    ]
+
+
+def test_published_events_reach_local_sockets(monkeypatch):
+    from app.services import event_bus
+    from app.services.websocket_manager import ConnectionManager
+
+    local = ConnectionManager()
+    monkeypatch.setattr(event_bus, "manager", local)
+    room, personal = FakeSocket(), FakeSocket()
+
+    async def scenario():
+        await local.connect(room, auction_id=1)
+        await local.connect(personal, user_id=7)
+        await event_bus.forward(event_bus.auction_message(1, {"type": "auction_closed"}))
+        await event_bus.forward(event_bus.user_message(7, {"type": "won"}))
+        await event_bus.forward(event_bus.user_message(8, {"type": "won"}))
+
+    asyncio.run(scenario())
+
+    assert {"type": "auction_closed"} in room.sent
+    assert personal.sent == [{"type": "won"}]
+
+
+def test_publish_failure_is_not_raised(monkeypatch):
+    from app.core.config import settings
+    from app.services import event_bus
+
+    monkeypatch.setattr(settings, "EVENTS_REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(settings, "EVENTS_REDIS_TIMEOUT", 0.5)
+
+    assert event_bus.publish([event_bus.user_message(7, {"type": "won"})]) == 0
+
+    monkeypatch.setattr(settings, "EVENTS_REDIS_URL", "")
+    assert event_bus.publish([event_bus.user_message(7, {"type": "won"})]) == 0